@@ -0,0 +1,97 @@
+import json
+from contextlib import aclosing
+from datetime import datetime, timedelta, timezone
+from typing import AsyncGenerator, AsyncIterator
+
+from fastapi import HTTPException, status
+
+from app.schemas.pagination import Cursor
+from app.schemas.task import TaskChangeSchema
+from app.services.changes import ChangeFeed, SubscriptionClosed
+from app.services.task import TaskService
+
+
+def resume_token(token: str | None) -> str | None:
+    """``token`` checked to be the resume token of a change."""
+    if token is None:
+        return None
+    try:
+        cursor = Cursor.decode(token)
+        if cursor.sort != "updated_at":
+            raise ValueError("Cursor of a task list, not of a change.")
+        datetime.fromisoformat(cursor.value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid resume token.",
+        )
+    return token
+
+
+async def change_events(
+    service: TaskService,
+    feed: ChangeFeed,
+    since: str | None,
+    heartbeat: float,
+    overlap: float = 0,
+) -> AsyncIterator[TaskChangeSchema | None]:
+    """
+    Changes after ``since``, read back from the database, then live ones.
+
+    Subscribing comes first so that nothing committed during the catch-up
+    is missed. The catch-up replays the last ``overlap`` seconds before
+    ``since`` for transactions that committed behind it, so clients may
+    see a change again after resuming. Live changes already read back are
+    dropped: ``updated_at`` is bumped by every write, so together with the
+    id it names one version of a task, and it is what notifications carry.
+    ``None`` is yielded after ``heartbeat`` seconds without changes. The
+    stream ends with ``SubscriptionClosed`` when the subscriber fell behind
+    or the feed lost its connection; clients resume from the last token
+    they handled.
+    """
+    async with feed.subscribe() as subscription:
+        # Only changes started this close to subscribing can be notified too.
+        horizon = datetime.now(timezone.utc) - timedelta(seconds=overlap)
+        seen = set()
+        if since is not None:
+            async for change in service.changes_since(since, overlap_seconds=overlap):
+                if change.updated_at >= horizon:
+                    seen.add((change.id, change.updated_at))
+                yield change
+        while True:
+            change = await subscription.next(timeout=heartbeat)
+            if change is not None and (change.id, change.updated_at) in seen:
+                seen.discard((change.id, change.updated_at))
+                continue
+            yield change
+
+
+def sse_event(data: str, event: str | None = None, id: str | None = None) -> bytes:
+    lines = []
+    if event is not None:
+        lines.append(f"event: {event}")
+    if id is not None:
+        lines.append(f"id: {id}")
+    lines.extend(f"data: {line}" for line in data.splitlines())
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def sse_stream(
+    events: AsyncGenerator[TaskChangeSchema | None, None],
+) -> AsyncIterator[bytes]:
+    """
+    Server-sent events: one ``message`` per change, its resume token as id.
+
+    ``EventSource`` sends the last id back as ``Last-Event-ID`` when it
+    reconnects. Heartbeats are comments, keeping idle proxies from closing
+    the connection.
+    """
+    async with aclosing(events):
+        try:
+            async for change in events:
+                if change is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    yield sse_event(change.model_dump_json(), id=change.token)
+        except SubscriptionClosed as exc:
+            yield sse_event(json.dumps({"reason": exc.reason}), event="closed")
@@ -0,0 +1,180 @@
+import importlib.util
+import logging
+import zlib
+from typing import Callable, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class GzipCompressor:
+    content_encoding = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        # A window of 16 + 15 bits writes the gzip header and trailer.
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        if more_body:
+            return data + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data + self.compressor.flush()
+
+
+class BrotliCompressor:
+    content_encoding = "br"
+
+    def __init__(self, quality: int = 4) -> None:
+        import brotli
+
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        if more_body:
+            return data + self.compressor.flush()
+        return data + self.compressor.finish()
+
+
+class ZstdCompressor:
+    content_encoding = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        import zstandard
+
+        self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        self.flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        if more_body:
+            return data + self.compressor.flush(self.flush_block)
+        return data + self.compressor.flush()
+
+
+Compressor = GzipCompressor | BrotliCompressor | ZstdCompressor
+
+# Responses that must reach the client unbuffered, as they are written.
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+
+# Module each encoding needs, if any.
+_REQUIREMENTS = {"br": "brotli", "zstd": "zstandard", "gzip": None}
+
+
+def available_encodings(preferred: Sequence[str]) -> list[str]:
+    """``preferred`` without the encodings that are unknown or not installed."""
+    encodings = []
+    for name in preferred:
+        if name not in _REQUIREMENTS:
+            logger.warning("Unknown content encoding %r is ignored", name)
+        elif (
+            _REQUIREMENTS[name]
+            and importlib.util.find_spec(_REQUIREMENTS[name]) is None
+        ):
+            logger.warning(
+                "Content encoding %r needs the %r package", name, _REQUIREMENTS[name]
+            )
+        else:
+            encodings.append(name)
+    return encodings
+
+
+def accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            if params and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best encoding the client accepts.
+
+    ``encodings`` are tried in order of preference. Responses smaller than
+    ``minimum_size``, already encoded or of an excluded type (event
+    streams) are sent as they are. Streaming responses are compressed
+    chunk by chunk, each flushed so that the client can decode it as soon
+    as it arrives.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ("gzip",),
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.minimum_size = minimum_size
+        self.compressors: dict[str, Callable[[], Compressor]] = {
+            "br": lambda: BrotliCompressor(quality=brotli_quality),
+            "zstd": lambda: ZstdCompressor(level=zstd_level),
+            "gzip": lambda: GzipCompressor(level=gzip_level),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        encoding = next((name for name in self.encodings if name in accepted), None)
+        start: Message | None = None
+        # Decided with the first body chunk; None sends the body as it is.
+        compressor: Compressor | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                # Held back until the first chunk tells how to send the body.
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start.setdefault("headers", []))
+                if self._compressible(headers, body, more_body):
+                    headers.add_vary_header("Accept-Encoding")
+                    if encoding is not None:
+                        compressor = self.compressors[encoding]()
+                        headers["Content-Encoding"] = compressor.content_encoding
+                        del headers["Content-Length"]
+            if compressor is not None:
+                body = compressor.compress(body, more_body=more_body)
+                message = {**message, "body": body}
+            if start is not None:
+                # The length is only known for a body sent in one chunk.
+                if compressor is not None and not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+        if start is not None:
+            await send(start)
+
+    def _compressible(self, headers: MutableHeaders, body: bytes, more: bool) -> bool:
+        return not (
+            "content-encoding" in headers
+            or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            or (len(body) < self.minimum_size and not more)
+        )
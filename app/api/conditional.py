@@ -0,0 +1,98 @@
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable
+from uuid import UUID
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return f'"{digest.hexdigest()}"'
+
+
+def task_etag(task_id: UUID, version: int | None) -> str:
+    """
+    Strong ETag of a single task: ``"<id>.<version>"``.
+
+    ``version`` is bumped by every UPDATE, so the tag changes with each write
+    and can be turned back into a version for ``If-Match`` preconditions.
+    """
+    return f'"{task_id}.{version}"'
+
+
+def if_match_versions(request: Request, task_uuid: str) -> list[int] | None:
+    """
+    Versions accepted by the request's ``If-Match`` header.
+
+    Returns ``None`` when the update is unconditional (no header or ``*``).
+    Tags that cannot match this task (weak, foreign or malformed) fail fast
+    with 412, as RFC 9110 requires strong comparison here.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        task_id, _, version = tag.strip().strip('"').rpartition(".")
+        try:
+            if UUID(task_id) == UUID(task_uuid) and not tag.strip().startswith("W/"):
+                versions.append(int(version))
+        except ValueError:
+            continue
+    if not versions:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Precondition failed.",
+        )
+    return versions
+
+
+def list_etag(versions: Iterable[tuple[UUID, datetime | None]], *extra: object) -> str:
+    """
+    Hash of the ``(id, updated_at)`` pairs of a page.
+
+    Any insert, delete or update that changes what the page contains changes
+    the tag; ``extra`` carries request parameters that shape the page.
+    """
+    return make_etag(*extra, *(part for version in versions for part in version))
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """
+    Evaluate ``If-None-Match`` and, when it is absent, ``If-Modified-Since``.
+
+    ETags are compared weakly, as RFC 9110 requires for ``If-None-Match``.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {
+            tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+        }
+        return etag.removeprefix("W/") in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
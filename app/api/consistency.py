@@ -0,0 +1,51 @@
+import time
+from http.cookies import SimpleCookie
+
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PRIMARY_COOKIE = "read-primary-until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def reads_from_primary(connection: HTTPConnection) -> bool:
+    """Whether the client wrote recently enough that a replica may lag behind."""
+    try:
+        return float(connection.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    """
+    Marks clients that just wrote so that their reads stick to the primary.
+
+    Every successful unsafe request gets a short-lived cookie holding the
+    time until which ``reads_from_primary`` is true for that client.
+    """
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = SimpleCookie()
+                cookie[PRIMARY_COOKIE] = f"{time.time() + self.window:.3f}"
+                cookie[PRIMARY_COOKIE]["max-age"] = int(self.window) + 1
+                cookie[PRIMARY_COOKIE]["path"] = "/"
+                cookie[PRIMARY_COOKIE]["httponly"] = True
+                cookie[PRIMARY_COOKIE]["samesite"] = "lax"
+                header = cookie[PRIMARY_COOKIE].OutputString().encode("latin-1")
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", header),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,251 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.base import CacheBackend
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = b"idempotent-replayed"
+UNSAFE_METHODS = frozenset({"POST", "PATCH", "DELETE"})
+MAX_KEY_LENGTH = 255
+
+
+def _digest(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+    def dump(self) -> bytes:
+        return json.dumps(
+            {
+                "fingerprint": self.fingerprint,
+                "status_code": self.status_code,
+                "headers": [
+                    [k.decode("latin-1"), v.decode("latin-1")] for k, v in self.headers
+                ],
+                "body": base64.b64encode(self.body).decode(),
+            }
+        ).encode()
+
+    @classmethod
+    def load(cls, data: bytes) -> "StoredResponse":
+        value = json.loads(data)
+        return cls(
+            fingerprint=value["fingerprint"],
+            status_code=value["status_code"],
+            headers=[
+                (k.encode("latin-1"), v.encode("latin-1")) for k, v in value["headers"]
+            ],
+            body=base64.b64decode(value["body"]),
+        )
+
+
+class IdempotencyStore:
+    """
+    Responses of completed requests by idempotency key, kept for ``ttl``.
+
+    A key is reserved with ``CacheBackend.add`` while its first request
+    runs. Duplicates arriving meanwhile in this process wait for it to
+    finish; those in other workers poll the cache. Either way they replay
+    its response, or answer 409 once ``wait_seconds`` have passed.
+    """
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        ttl: float,
+        wait_seconds: float = 10,
+        lock_ttl: float = 60,
+        poll_interval: float = 0.05,
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.wait_seconds = wait_seconds
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self._in_flight: dict[str, asyncio.Event] = {}
+
+    async def begin(self, key: str, fingerprint: str) -> StoredResponse | None:
+        """
+        The stored response to replay for ``key``, or ``None`` once reserved.
+
+        After ``None`` the caller runs the request and must call ``finish``.
+        """
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            data = await self.cache.get(key)
+            if data is not None:
+                stored = StoredResponse.load(data)
+                if stored.fingerprint != fingerprint:
+                    raise IdempotencyError(
+                        status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        "Idempotency-Key was already used for a different request.",
+                    )
+                return stored
+            remaining = deadline - time.monotonic()
+            pending = self._in_flight.get(key)
+            if pending is not None and remaining > 0:
+                try:
+                    await asyncio.wait_for(pending.wait(), timeout=remaining)
+                except TimeoutError:
+                    pass
+                continue
+            if await self.cache.add(f"{key}:lock", b"1", ttl=self.lock_ttl):
+                self._in_flight[key] = asyncio.Event()
+                return None
+            if remaining <= 0:
+                raise IdempotencyError(
+                    status.HTTP_409_CONFLICT,
+                    "A request with this Idempotency-Key is still in progress.",
+                )
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+    async def finish(self, key: str, response: StoredResponse | None) -> None:
+        """
+        Store ``response`` (``None`` if it should not be replayed) and release
+        ``key``.
+        """
+        try:
+            if response is not None:
+                await self.cache.set(key, response.dump(), ttl=self.ttl)
+            await self.cache.delete(f"{key}:lock")
+        finally:
+            self._in_flight.pop(key).set()
+
+
+class IdempotencyMiddleware:
+    """
+    Replays the response of an unsafe request retried with the same key.
+
+    Requests carrying an ``Idempotency-Key`` header are fingerprinted by
+    method, path, query string and body; bodies over ``max_body_size`` bytes
+    are refused with 413 rather than buffered. The first successful (2xx)
+    response per key is stored and sent again, marked
+    ``Idempotent-Replayed``, for retries within the store's TTL, without
+    running the endpoint. Error responses are not stored, so the request
+    can be retried. The store is taken from the request's dishka container.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int = 10 * 1024 * 1024):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = dict(scope.get("headers", [])).get(IDEMPOTENCY_HEADER)
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in UNSAFE_METHODS
+            or key is None
+        ):
+            await self.app(scope, receive, send)
+            return
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {
+                    "detail": "Idempotency-Key must be 1 to "
+                    f"{MAX_KEY_LENGTH} characters."
+                },
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+            await response(scope, receive, send)
+            return
+
+        messages, body, size = [], [], 0
+        while size <= self.max_body_size:
+            message = await receive()
+            messages.append(message)
+            body.append(message.get("body", b""))
+            size += len(body[-1])
+            if message["type"] != "http.request" or not message.get("more_body"):
+                break
+        if size > self.max_body_size:
+            response = JSONResponse(
+                {
+                    "detail": "Request body is too large for an Idempotency-Key "
+                    f"(over {self.max_body_size} bytes)."
+                },
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+            await response(scope, receive, send)
+            return
+        store = await scope["state"]["dishka_container"].get(IdempotencyStore)
+        fingerprint = _digest(
+            scope["method"].encode(),
+            scope["path"].encode(),
+            scope.get("query_string", b""),
+            b"".join(body),
+        )
+        cache_key = f"idempotency:{_digest(key)}"
+
+        try:
+            stored = await store.begin(cache_key, fingerprint)
+        except IdempotencyError as exc:
+            response = JSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            await response(scope, receive, send)
+            return
+        if stored is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": stored.status_code,
+                    "headers": [*stored.headers, (REPLAYED_HEADER, b"true")],
+                }
+            )
+            await send({"type": "http.response.body", "body": stored.body})
+            return
+
+        async def replay_receive() -> Message:
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        start: Message = {}
+        sent: list[bytes] = []
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                sent.append(message.get("body", b""))
+            await send(message)
+
+        response = None
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            if start and 200 <= start["status"] < 300:
+                response = StoredResponse(
+                    fingerprint=fingerprint,
+                    status_code=start["status"],
+                    headers=[
+                        (name, value)
+                        for name, value in start.get("headers", [])
+                        if name.lower() != b"set-cookie"
+                    ],
+                    body=b"".join(sent),
+                )
+        finally:
+            await store.finish(cache_key, response)
@@ -0,0 +1,291 @@
+import os
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from dataclasses import asdict
+from typing import Sequence
+
+from dishka.integrations.fastapi import FromDishka, inject
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.cache.base import CacheBackend
+from app.config.database import database
+from app.config.instrumentation import (
+    RequestTimings,
+    check_request_queries,
+    track_request,
+)
+from app.config.pool import CHECKOUT_BUCKETS
+from app.services.single_flight import SingleFlight
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Prometheus histogram kept in process, one series per label values."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float],
+        labels: Sequence[str] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        counts, total = self._series.setdefault(
+            label_values, ([0] * (len(self.buckets) + 1), [0.0])
+        )
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self, **extra: str) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        for values, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _labels(self.labels, values, **extra, le=bound)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labels, values, **extra)
+            lines.append(f"{self.name}_sum{labels} {total[0]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+def _metric(
+    name: str, kind: str, documentation: str, *samples: tuple[str, float]
+) -> list[str]:
+    """Help and type lines, then one line per ``(labels, value)`` sample."""
+    return [
+        f"# HELP {name} {documentation}",
+        f"# TYPE {name} {kind}",
+        *(f"{name}{labels} {value}" for labels, value in samples),
+    ]
+
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Wall time of HTTP requests.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+)
+DB_SECONDS = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per request.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request.",
+    QUERY_BUCKETS,
+    ("method", "route"),
+)
+POOL_WAIT_SECONDS = Histogram(
+    "http_request_pool_wait_seconds",
+    "Time spent waiting for pooled connections per request.",
+    CHECKOUT_BUCKETS,
+    ("method", "route"),
+)
+SERIALIZATION_SECONDS = Histogram(
+    "http_request_serialization_seconds",
+    "Time spent encoding response bodies per request.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+)
+HISTOGRAMS = (
+    REQUEST_SECONDS,
+    DB_SECONDS,
+    DB_QUERIES,
+    POOL_WAIT_SECONDS,
+    SERIALIZATION_SECONDS,
+)
+
+
+def server_timing(timings: RequestTimings, total: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={timings.db_seconds * 1000:.2f};desc="{timings.queries} queries"',
+            f"pool;dur={timings.pool_wait_seconds * 1000:.2f}",
+            f"serialize;dur={timings.serialization_seconds * 1000:.2f}",
+            f"app;dur={total * 1000:.2f}",
+        ]
+    )
+
+
+class TimingMiddleware:
+    """
+    Times each request and where it spent that time.
+
+    Statements, pool checkouts and response encoding add to the request's
+    ``RequestTimings`` as they happen. With ``server_timing`` the figures
+    known when the response starts are sent in a ``Server-Timing`` header;
+    once the response is complete, they are recorded in the histograms
+    served at ``/metrics``, labelled by route template, and checked
+    against the statement budget. With a ``tracer``
+    the request also gets a server span, parent of the repository spans.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, tracer=None):
+        self.app = app
+        self.server_timing = server_timing
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    header = server_timing(timings, time.perf_counter() - start)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode("latin-1")),
+                    ]
+            await send(message)
+
+        span = (
+            self.tracer.start_as_current_span(scope["method"], kind=_server_kind())
+            if self.tracer
+            else nullcontext()
+        )
+        with track_request() as timings, span as current_span:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                method = scope["method"]
+                REQUEST_SECONDS.observe(
+                    time.perf_counter() - start, method, route, str(status_code)
+                )
+                DB_SECONDS.observe(timings.db_seconds, method, route)
+                DB_QUERIES.observe(timings.queries, method, route)
+                POOL_WAIT_SECONDS.observe(timings.pool_wait_seconds, method, route)
+                SERIALIZATION_SECONDS.observe(
+                    timings.serialization_seconds, method, route
+                )
+                check_request_queries(f"{method} {route}", timings)
+                if current_span is not None:
+                    current_span.update_name(f"{method} {route}")
+                    current_span.set_attributes(
+                        {
+                            "http.route": route,
+                            "http.response.status_code": status_code,
+                            "db.queries": timings.queries,
+                        }
+                    )
+
+
+def _server_kind():
+    from opentelemetry.trace import SpanKind
+
+    return SpanKind.SERVER
+
+
+def render_metrics(cache: CacheBackend, single_flight: SingleFlight) -> str:
+    """
+    Metrics of this worker process, every series labelled with its ``pid``.
+
+    Each worker keeps its own figures and a scrape reaches one of them, so
+    the label keeps workers' series apart instead of letting them overwrite
+    one another; sum over ``pid`` for the whole server. Pool metrics are
+    labelled by ``engine``: the primary and each replica.
+    """
+    pid = str(os.getpid())
+    lines = [line for histogram in HISTOGRAMS for line in histogram.render(pid=pid)]
+    pools = [
+        (_labels(("engine",), (engine,), pid=pid), engine, pool)
+        for engine, pool in database.pool_statuses().items()
+    ]
+    for name, documentation in (
+        ("size", "Configured number of persistent connections."),
+        ("checked_out", "Connections currently in use."),
+        ("overflow", "Connections open beyond the pool size."),
+    ):
+        lines += _metric(
+            f"db_pool_{name}",
+            "gauge",
+            documentation,
+            *((labels, pool[name]) for labels, _, pool in pools),
+        )
+    lines += _metric(
+        "db_pool_timeouts_total",
+        "counter",
+        "Checkouts that hit the pool timeout.",
+        *((labels, pool["timeouts"]) for labels, _, pool in pools),
+    )
+    lines += [
+        "# HELP db_pool_checkout_seconds Time waited for pooled connections.",
+        "# TYPE db_pool_checkout_seconds histogram",
+    ]
+    for labels, engine, pool in pools:
+        for bound, count in pool["wait_seconds_buckets"].items():
+            bucket = _labels(("engine",), (engine,), pid=pid, le=bound)
+            lines.append(f"db_pool_checkout_seconds_bucket{bucket} {count}")
+        lines += [
+            f"db_pool_checkout_seconds_sum{labels} {pool['wait_seconds_total']}",
+            f"db_pool_checkout_seconds_count{labels} {pool['checkouts']}",
+        ]
+    process = _labels((), (), pid=pid)
+    for name, value in asdict(cache.stats).items():
+        lines += _metric(
+            f"cache_{name}_total", "counter", f"Cache {name}.", (process, value)
+        )
+    for name, documentation in (
+        ("calls", "Calls of coalesced read methods."),
+        ("executions", "Calls that ran their query."),
+        ("shared", "Calls served by a concurrent call's query."),
+    ):
+        lines += _metric(
+            f"single_flight_{name}_total",
+            "counter",
+            documentation,
+            *(
+                (_labels(("method",), (method,), pid=pid), getattr(stats, name))
+                for method, stats in sorted(single_flight.stats.items())
+            ),
+        )
+    return "\n".join(lines) + "\n"
+
+
+router = APIRouter(tags=["System"])
+
+
+@router.get(path="/metrics", include_in_schema=False)
+@inject
+async def get_metrics(
+    cache: FromDishka[CacheBackend], single_flight: FromDishka[SingleFlight]
+):
+    return PlainTextResponse(
+        render_metrics(cache, single_flight), media_type="text/plain; version=0.0.4"
+    )
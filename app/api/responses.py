@@ -0,0 +1,88 @@
+from contextlib import aclosing
+from functools import cache
+from typing import Any, AsyncIterator, Mapping
+
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter
+
+from app.config.instrumentation import measure_serialization
+
+
+@cache
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def json_response(
+    content: BaseModel,
+    status_code: int = status.HTTP_200_OK,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    Encode ``content`` to JSON bytes in one pass and send them as they are.
+
+    Returning a model instead makes FastAPI validate it again against
+    ``response_model`` and encode it through ``jsonable_encoder`` and
+    ``json.dumps``. Rows read from the database may be plain dicts inside
+    ``content`` (built with ``model_construct``): they are trusted, so they
+    skip validation and are serialized by value type.
+    """
+    with measure_serialization():
+        body = _adapter(type(content)).dump_json(content, warnings=False)
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+async def prefetched(items: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """
+    ``items`` with their first element already awaited.
+
+    Errors raised before anything is produced, such as an invalid cursor,
+    then surface here as a normal error response instead of cutting a
+    streamed 200 short after its first bytes.
+    """
+    try:
+        first = [await anext(items)]
+    except StopAsyncIteration:
+        first = []
+
+    async def resume() -> AsyncIterator[Any]:
+        async with aclosing(items):
+            for item in first:
+                yield item
+            async for item in items:
+                yield item
+
+    return resume()
+
+
+async def stream_list(
+    items: AsyncIterator[list[Any]],
+    item_model: type[BaseModel],
+    pagination: BaseModel,
+) -> AsyncIterator[bytes]:
+    """
+    Encode ``ApiResponse[ListPaginationResponse[item_model]]`` incrementally.
+
+    Items are encoded chunk by chunk as they arrive and ``pagination`` is
+    written after them, once the producer has filled it in. The bytes are
+    the same as ``json_response`` would send for the whole page.
+    """
+    adapter = _adapter(list[item_model])
+    yield b'{"data":{"items":['
+    separator = b""
+    async for chunk in items:
+        if chunk:
+            with measure_serialization():
+                encoded = adapter.dump_json(chunk, warnings=False)[1:-1]
+            yield separator + encoded
+            separator = b","
+    yield (
+        b'],"pagination":'
+        + pagination.model_dump_json().encode()
+        + b'},"meta":{},"errors":[]}'
+    )
@@ -1,13 +1,279 @@
-from fastapi import APIRouter, status
-from app.schemas.task import TaskResponseSchema, TaskRequestSchema
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    Body,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from app.schemas.task import (
+    TaskBulkUpdateSchema,
+    TaskListQuerySchema,
+    TaskResponseSchema,
+    TaskRequestSchema,
+    TaskSyncResponse,
+)
 from dishka.integrations.fastapi import inject, FromDishka
+from app.api.conditional import (
+    http_date,
+    if_match_versions,
+    is_not_modified,
+    list_etag,
+    not_modified,
+    task_etag,
+)
+from app.api.changes import change_events, resume_token, sse_stream
+from app.api.responses import json_response, prefetched, stream_list
+from app.config.settings import settings
+from app.services.changes import ChangeFeed, SubscriptionClosed
 from app.services.task import TaskService  # noqa
 from app.schemas.base import ApiResponse
+from app.schemas.bulk import BULK_MAX_ITEMS, BulkItemResult
 from app.schemas.pagination import ListPaginationResponse, PaginationResponse
+from app.schemas.transfer import FileFormat, ImportConflictPolicy, ImportResult
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
+@router.post(
+    path="/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Bulk task creation.",
+    response_model=ApiResponse[list[BulkItemResult[TaskResponseSchema]]],
+)
+@inject
+async def bulk_create(
+    service: FromDishka["TaskService"],
+    data: list[TaskRequestSchema] = Body(min_length=1, max_length=BULK_MAX_ITEMS),
+):
+    response = await service.bulk_create_tasks(schemas=data)
+    return ApiResponse(data=response)
+
+
+@router.patch(
+    path="/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Bulk task update.",
+    response_model=ApiResponse[list[BulkItemResult[TaskResponseSchema]]],
+)
+@inject
+async def bulk_update(
+    service: FromDishka["TaskService"],
+    data: list[TaskBulkUpdateSchema] = Body(min_length=1, max_length=BULK_MAX_ITEMS),
+):
+    response = await service.bulk_update_tasks(schemas=data)
+    return ApiResponse(data=response)
+
+
+@router.delete(
+    path="/bulk",
+    status_code=status.HTTP_200_OK,
+    summary="Bulk task deletion.",
+    response_model=ApiResponse[list[BulkItemResult[TaskResponseSchema]]],
+)
+@inject
+async def bulk_delete(
+    service: FromDishka["TaskService"],
+    data: list[UUID] = Body(min_length=1, max_length=BULK_MAX_ITEMS),
+):
+    response = await service.bulk_delete_tasks(task_uuids=data)
+    return ApiResponse(data=response)
+
+
+@router.post(
+    path="/import",
+    status_code=status.HTTP_200_OK,
+    summary="Bulk task import from a CSV or NDJSON file.",
+    response_model=ApiResponse[ImportResult],
+)
+@inject
+async def import_tasks(
+    service: FromDishka["TaskService"],
+    file: UploadFile = File(...),
+    format: FileFormat = Query(default=FileFormat.CSV),
+    on_conflict: ImportConflictPolicy = Query(default=ImportConflictPolicy.SKIP),
+    chunk_size: int = Query(default=10000, ge=100, le=100000),
+):
+    response = await service.import_tasks(
+        file=file.file,
+        file_format=format,
+        policy=on_conflict,
+        chunk_size=chunk_size,
+    )
+    return ApiResponse(data=response)
+
+
+@router.get(
+    path="/export",
+    status_code=status.HTTP_200_OK,
+    summary="Stream all tasks as NDJSON or CSV.",
+    response_class=StreamingResponse,
+)
+@inject
+async def export(
+    service: FromDishka["TaskService"],
+    format: FileFormat = Query(default=FileFormat.NDJSON),
+    chunk_size: int = Query(default=1000, ge=1, le=10000),
+):
+    return StreamingResponse(
+        content=service.export_tasks(export_format=format, chunk_size=chunk_size),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
+
+
+@router.get(
+    path="/search",
+    status_code=status.HTTP_200_OK,
+    summary="Ranked full-text search over task name and description.",
+    response_model=ApiResponse[ListPaginationResponse[TaskResponseSchema]],
+)
+@inject
+async def search(
+    service: FromDishka["TaskService"],
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    fuzzy: bool = Query(default=False, description="Trigram match on name."),
+):
+    items, next_cursor = await service.search_tasks(
+        query=q, limit=limit, cursor=cursor, fuzzy=fuzzy
+    )
+    return ApiResponse(
+        data=ListPaginationResponse(
+            items=items,
+            pagination=PaginationResponse(limit=limit, next_cursor=next_cursor),
+        ),
+    )
+
+
+@router.get(
+    path="/sync",
+    status_code=status.HTTP_200_OK,
+    summary="Tasks created, updated or deleted since a sync token.",
+    response_model=ApiResponse[TaskSyncResponse],
+)
+@inject
+async def sync(
+    service: FromDishka["TaskService"],
+    since: str | None = Query(
+        default=None,
+        description="`next_token` of the previous sync, or a change's resume "
+        "token; omit for a full sync.",
+    ),
+    limit: int = Query(default=500, ge=1, le=1000),
+):
+    items, deleted, next_token, has_more = await service.sync_tasks(
+        since=resume_token(since),
+        limit=limit,
+        settle_seconds=settings.sync_settle_seconds,
+    )
+    return json_response(
+        ApiResponse.model_construct(
+            data=TaskSyncResponse.model_construct(
+                items=items,
+                deleted=deleted,
+                next_token=next_token,
+                has_more=has_more,
+            ),
+            meta={},
+            errors=[],
+        )
+    )
+
+
+@router.get(
+    path="/changes",
+    status_code=status.HTTP_200_OK,
+    summary="Stream task changes as server-sent events.",
+    response_class=StreamingResponse,
+)
+@inject
+async def changes(
+    service: FromDishka["TaskService"],
+    feed: FromDishka[ChangeFeed],
+    since: str | None = Query(
+        default=None,
+        description="Resume token (event id) of the last change handled.",
+    ),
+    last_event_id: str | None = Header(default=None),
+):
+    token = resume_token(since or last_event_id)
+    await feed.listen()
+    return StreamingResponse(
+        sse_stream(
+            change_events(
+                service,
+                feed,
+                token,
+                settings.change_feed_heartbeat_seconds,
+                settings.sync_settle_seconds,
+            )
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/changes")
+@inject
+async def changes_websocket(
+    websocket: WebSocket,
+    feed: FromDishka[ChangeFeed],
+    since: str | None = None,
+):
+    try:
+        token = resume_token(since)
+    except HTTPException as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=exc.detail)
+        return
+    await feed.listen()
+    await websocket.accept()
+    # Websockets only get a session container; a request scope is entered
+    # for the service, the websocket standing in for the request.
+    async with websocket.state.dishka_container(
+        context={Request: websocket}
+    ) as container:
+        service = await container.get(TaskService)
+        events = change_events(
+            service,
+            feed,
+            token,
+            settings.change_feed_heartbeat_seconds,
+            settings.sync_settle_seconds,
+        )
+        try:
+            async for change in events:
+                if change is None:
+                    await websocket.send_json({"event": "keep-alive"})
+                else:
+                    await websocket.send_json(
+                        {
+                            "event": "change",
+                            "id": change.token,
+                            "data": change.model_dump(mode="json"),
+                        }
+                    )
+        except SubscriptionClosed as exc:
+            await websocket.close(
+                code=status.WS_1013_TRY_AGAIN_LATER, reason=exc.reason
+            )
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await events.aclose()
+
+
 @router.get(
     path="/{task_uuid}",
     status_code=status.HTTP_200_OK,
@@ -15,9 +281,18 @@ router = APIRouter(prefix="/tasks", tags=["Tasks"])
     response_model=ApiResponse[TaskResponseSchema],
 )
 @inject
-async def get(task_uuid: str, service: FromDishka["TaskService"]):
-    response = await service.get_task_by_id(task_uuid=task_uuid)
-    return ApiResponse(data=response)
+async def get(
+    task_uuid: str,
+    request: Request,
+    service: FromDishka["TaskService"],
+):
+    task = await service.get_task_by_id(task_uuid=task_uuid)
+    headers = {"ETag": task_etag(task.id, task.version)}
+    if task.updated_at is not None:
+        headers["Last-Modified"] = http_date(task.updated_at)
+    if is_not_modified(request, headers["ETag"], task.updated_at):
+        return not_modified(headers)
+    return json_response(ApiResponse(data=task), headers=headers)
 
 
 @router.post(
@@ -28,8 +303,11 @@ async def get(task_uuid: str, service: FromDishka["TaskService"]):
 )
 @inject
 async def create(data: TaskRequestSchema, service: FromDishka["TaskService"]):
-    response = await service.create_task(schema=data)
-    return ApiResponse(data=response)
+    task = await service.create_task(schema=data)
+    return json_response(
+        ApiResponse(data=TaskResponseSchema.model_validate(task)),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @router.get(
@@ -40,16 +318,64 @@ async def create(data: TaskRequestSchema, service: FromDishka["TaskService"]):
 )
 @inject
 async def get_list(
-    offset: int,
-    limit: int,
+    request: Request,
     service: FromDishka["TaskService"],
+    query: Annotated[TaskListQuerySchema, Query()],
 ):
-    response = await service.get_task_list(offset=offset, limit=limit)
-    return ApiResponse(
-        data=ListPaginationResponse(
-            items=response,
-            pagination=PaginationResponse(offset=offset, limit=limit),
+    # A streamed list is sent before its last rows are read, so it has no
+    # ETag to validate against and must not be cached either.
+    if query.limit >= settings.list_stream_min_limit:
+        pagination = PaginationResponse(
+            offset=None if query.cursor else query.offset,
+            limit=query.limit,
+            total_mode=query.include_total,
+        )
+        items = await prefetched(
+            service.stream_task_list(
+                limit=query.limit,
+                pagination=pagination,
+                offset=query.offset,
+                cursor=query.cursor,
+                filters=query.filters,
+                total_mode=query.include_total,
+            )
+        )
+        return StreamingResponse(
+            stream_list(items, TaskResponseSchema, pagination),
+            media_type="application/json",
+            headers={"Cache-Control": "no-store"},
+        )
+    items, next_cursor, total = await service.get_task_list(
+        limit=query.limit,
+        offset=query.offset,
+        cursor=query.cursor,
+        filters=query.filters,
+        total_mode=query.include_total,
+    )
+    etag = list_etag(
+        ((item["id"], item["updated_at"]) for item in items),
+        query.model_dump_json(),
+        next_cursor,
+        total,
+    )
+    if is_not_modified(request, etag):
+        return not_modified({"ETag": etag})
+    return json_response(
+        ApiResponse.model_construct(
+            data=ListPaginationResponse.model_construct(
+                items=items,
+                pagination=PaginationResponse(
+                    offset=None if query.cursor else query.offset,
+                    limit=query.limit,
+                    next_cursor=next_cursor,
+                    total=total,
+                    total_mode=query.include_total,
+                ),
+            ),
+            meta={},
+            errors=[],
         ),
+        headers={"ETag": etag},
     )
 
 
@@ -63,6 +389,18 @@ async def delete(task_uuid: str, service: FromDishka["TaskService"]):
     return await service.delete_task(task_uuid=task_uuid)
 
 
+@router.post(
+    path="/{task_uuid}/restore",
+    status_code=status.HTTP_200_OK,
+    summary="Restore a deleted task not purged yet.",
+    response_model=ApiResponse[TaskResponseSchema],
+)
+@inject
+async def restore(task_uuid: str, service: FromDishka["TaskService"]):
+    task = await service.restore_task(task_uuid=task_uuid)
+    return json_response(ApiResponse(data=TaskResponseSchema.model_validate(task)))
+
+
 @router.patch(
     path="/{task_uuid}",
     status_code=status.HTTP_200_OK,
@@ -72,6 +410,14 @@ async def delete(task_uuid: str, service: FromDishka["TaskService"]):
 async def update(
     task_uuid: str,
     data: TaskRequestSchema,
+    request: Request,
+    response: Response,
     service: FromDishka["TaskService"],
 ):
-    return await service.update_task(task_uuid=task_uuid, schema=data)
+    task = await service.update_task(
+        task_uuid=task_uuid,
+        schema=data,
+        versions=if_match_versions(request, task_uuid),
+    )
+    response.headers["ETag"] = task_etag(task.id, task.version)
+    return task
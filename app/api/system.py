@@ -0,0 +1,17 @@
+from fastapi import APIRouter, status
+
+from app.config.database import database
+from app.schemas.base import ApiResponse
+from app.schemas.system import PoolStatusSchema
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get(
+    path="/pool",
+    status_code=status.HTTP_200_OK,
+    summary="Connection pool metrics of this worker",
+    response_model=ApiResponse[PoolStatusSchema],
+)
+async def get_pool_status():
+    return ApiResponse(data=PoolStatusSchema(**database.pool_status()))
@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class CacheBackend(Protocol):
+    stats: CacheStats
+
+    async def get(self, key: str) -> bytes | None: ...
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+    async def add(self, key: str, value: bytes, ttl: float | None = None) -> bool: ...
+    async def delete(self, *keys: str) -> None: ...
+    async def clear(self) -> None: ...
+
+
+class NullCache(CacheBackend):
+    """Backend used when caching is disabled: every lookup is a miss."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> bytes | None:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        return None
+
+    async def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        return None
+
+    async def clear(self) -> None:
+        return None
@@ -0,0 +1,59 @@
+import time
+from collections import OrderedDict
+
+from .base import CacheBackend, CacheStats
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process cache with a per-entry TTL and LRU eviction past ``max_entries``.
+
+    Entries live in the worker process, so each worker keeps its own copy.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        """Set ``key`` only if it holds no live entry; whether it was set."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return False
+        await self.set(key, value, ttl=ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
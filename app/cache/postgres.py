@@ -0,0 +1,139 @@
+import logging
+from contextlib import AbstractAsyncContextManager
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.models.cache import CacheEntry
+
+from .base import CacheBackend, CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresCache(CacheBackend):
+    """
+    Cache stored in the ``cache_entries`` table, shared by all workers.
+
+    Meant for small, rarely written entries that must be seen by every
+    worker when Redis is not configured, such as idempotency keys. Each
+    call is its own short transaction on a session from ``session_factory``.
+    Expired rows are read as missing and removed a few at a time by
+    ``add``. Database errors are logged and treated as misses, as in
+    ``RedisCache``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+        ttl: float,
+        prefix: str = "task-manager:",
+        prune_batch: int = 100,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.prefix = prefix
+        self.prune_batch = prune_batch
+        self.stats = CacheStats()
+
+    def _expires_at(self, ttl: float | None):
+        return func.now() + timedelta(seconds=self.ttl if ttl is None else ttl)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            async with self.session_factory() as session:
+                value = await session.scalar(
+                    select(CacheEntry.value).where(
+                        CacheEntry.key == self.prefix + key,
+                        CacheEntry.expires_at > func.now(),
+                    )
+                )
+        except Exception:
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            value = None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        query = insert(CacheEntry).values(
+            key=self.prefix + key, value=value, expires_at=self._expires_at(ttl)
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[CacheEntry.key],
+            set_={
+                "value": query.excluded.value,
+                "expires_at": query.excluded.expires_at,
+            },
+        )
+        try:
+            async with self.session_factory() as session:
+                await session.execute(query)
+                await session.commit()
+        except Exception:
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+
+    async def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        """Set ``key`` unless it holds a live entry; taking over expired ones."""
+        query = insert(CacheEntry).values(
+            key=self.prefix + key, value=value, expires_at=self._expires_at(ttl)
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[CacheEntry.key],
+            set_={
+                "value": query.excluded.value,
+                "expires_at": query.excluded.expires_at,
+            },
+            where=CacheEntry.expires_at <= func.now(),
+        ).returning(CacheEntry.key)
+        expired = (
+            select(CacheEntry.key)
+            .where(CacheEntry.expires_at <= func.now())
+            .limit(self.prune_batch)
+            .with_for_update(skip_locked=True)
+        )
+        try:
+            async with self.session_factory() as session:
+                added = await session.scalar(query)
+                await session.execute(
+                    delete(CacheEntry).where(
+                        CacheEntry.key.in_(expired.scalar_subquery())
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("Cache add failed for %s", key, exc_info=True)
+            return True
+        return added is not None
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    delete(CacheEntry).where(
+                        CacheEntry.key.in_([self.prefix + key for key in keys])
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("Cache delete failed for %s", keys, exc_info=True)
+
+    async def clear(self) -> None:
+        try:
+            async with self.session_factory() as session:
+                await session.execute(
+                    delete(CacheEntry).where(
+                        CacheEntry.key.startswith(self.prefix, autoescape=True)
+                    )
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("Cache clear failed", exc_info=True)
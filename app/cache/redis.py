@@ -0,0 +1,68 @@
+import logging
+from typing import Any
+
+from .base import CacheBackend, CacheStats
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache stored in Redis (or any server speaking its protocol), shared by all workers.
+
+    ``client`` is a ``redis.asyncio.Redis``-compatible object. Connection
+    errors are logged and treated as misses so an unavailable cache never
+    fails a request. Evictions happen server-side and are not counted here.
+    """
+
+    def __init__(self, client: Any, ttl: float, prefix: str = "task-manager:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception:
+            logger.warning("Cache get failed for %s", key, exc_info=True)
+            value = None
+        if value is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        try:
+            ttl = self.ttl if ttl is None else ttl
+            await self.client.set(self.prefix + key, value, px=int(ttl * 1000))
+        except Exception:
+            logger.warning("Cache set failed for %s", key, exc_info=True)
+
+    async def add(self, key: str, value: bytes, ttl: float | None = None) -> bool:
+        try:
+            ttl = self.ttl if ttl is None else ttl
+            added = await self.client.set(
+                self.prefix + key, value, px=int(ttl * 1000), nx=True
+            )
+        except Exception:
+            logger.warning("Cache add failed for %s", key, exc_info=True)
+            return True
+        return bool(added)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except Exception:
+            logger.warning("Cache delete failed for %s", keys, exc_info=True)
+
+    async def clear(self) -> None:
+        try:
+            keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+            if keys:
+                await self.client.delete(*keys)
+        except Exception:
+            logger.warning("Cache clear failed", exc_info=True)
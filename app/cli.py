@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+
+from app.config.database import database
+from app.config.server import server_options
+from app.config.settings import settings
+from app.repositories.task import TaskRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.schemas.transfer import FileFormat, ImportConflictPolicy
+from app.services.task import TaskService
+
+
+async def import_tasks(args: argparse.Namespace) -> None:
+    async with database.get_session() as session:
+        service = TaskService(
+            repository=TaskRepository(session=session),
+            unit_of_work=UnitOfWork(session=session),
+        )
+        with open(args.path, "rb") as file:
+            result = await service.import_tasks(
+                file=file,
+                file_format=args.format,
+                policy=args.on_conflict,
+                chunk_size=args.chunk_size,
+            )
+    print(result.model_dump_json(indent=2))
+
+
+async def purge_deleted(args: argparse.Namespace) -> None:
+    while True:
+        async with database.get_session() as session:
+            service = TaskService(
+                repository=TaskRepository(session=session),
+                unit_of_work=UnitOfWork(session=session),
+            )
+            purged = await service.purge_deleted_tasks(
+                retention_seconds=args.retention_seconds,
+                batch_size=args.batch_size,
+                pause_seconds=args.pause_seconds,
+                max_batches=args.max_batches,
+            )
+        print(f"Purged {purged} deleted tasks.", flush=True)
+        if not args.interval_seconds:
+            return
+        await asyncio.sleep(args.interval_seconds)
+
+
+def serve(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    uvicorn.run(**server_options(settings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser(
+        "import-tasks", help="Load tasks from a CSV or NDJSON file with COPY."
+    )
+    importer.add_argument("path")
+    importer.add_argument(
+        "--format",
+        type=FileFormat,
+        default=FileFormat.CSV,
+        choices=list(FileFormat),
+        metavar="{" + ",".join(f.value for f in FileFormat) + "}",
+    )
+    importer.add_argument(
+        "--on-conflict",
+        type=ImportConflictPolicy,
+        default=ImportConflictPolicy.SKIP,
+        choices=list(ImportConflictPolicy),
+        metavar="{" + ",".join(p.value for p in ImportConflictPolicy) + "}",
+    )
+    importer.add_argument("--chunk-size", type=int, default=10000)
+    importer.set_defaults(handler=import_tasks)
+
+    purger = commands.add_parser(
+        "purge-deleted",
+        help="Remove soft-deleted tasks past their retention, in small batches.",
+    )
+    purger.add_argument(
+        "--retention-seconds", type=float, default=settings.purge_retention_seconds
+    )
+    purger.add_argument("--batch-size", type=int, default=settings.purge_batch_size)
+    purger.add_argument(
+        "--pause-seconds", type=float, default=settings.purge_pause_seconds
+    )
+    purger.add_argument(
+        "--max-batches", type=int, default=None, help="Per run; default unbounded."
+    )
+    purger.add_argument(
+        "--interval-seconds",
+        type=float,
+        default=settings.purge_interval_seconds,
+        help="Run again after this long; 0 runs once.",
+    )
+    purger.set_defaults(handler=purge_deleted)
+
+    server = commands.add_parser(
+        "serve", help="Run the API server in the configured SERVER_MODE."
+    )
+    server.set_defaults(handler=serve)
+
+    args = parser.parse_args()
+    if asyncio.iscoroutinefunction(args.handler):
+        asyncio.run(args.handler(args))
+    else:
+        args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
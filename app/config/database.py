@@ -1,53 +1,192 @@
+import itertools
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Literal, Sequence
+from uuid import uuid4
 
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    async_sessionmaker,
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
-from .settings import settings
+from .instrumentation import instrument_engine
+from .pool import InstrumentedPool
+from .settings import CHANGE_FEED_CONNECTIONS, Settings, settings
 
 
-class Database:
-    def __init__(self, url: str):
-        self._async_engine = create_async_engine(
-            url=url,
-            pool_pre_ping=True,
-            echo=True,
+def engine_options(config: Settings) -> dict[str, Any]:
+    """
+    Pool and driver options for ``create_async_engine``.
+
+    With ``db_pgbouncer`` asyncpg's prepared statement caches are disabled
+    and statements get unique names, since a transaction-mode PgBouncer may
+    run consecutive statements on different server connections.
+
+    With ``db_max_connections`` the budget is split evenly between the
+    worker processes, and each pool, overflow included, is capped at its
+    share less the change feed's LISTEN connection, so that all workers
+    together stay within it. The budget is per server: every replica
+    engine gets the same pool, and so the same share of that replica's
+    own budget.
+    """
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": config.db_statement_cache_size,
+    }
+    if config.db_pgbouncer:
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    pool_size, max_overflow = config.db_pool_size, config.db_max_overflow
+    if config.db_max_connections:
+        per_worker = (
+            config.db_max_connections // config.workers
+            - CHANGE_FEED_CONNECTIONS
         )
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return {
+        "poolclass": InstrumentedPool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "echo": config.db_echo,
+        "connect_args": connect_args,
+    }
+
+
+class Database:
+    def __init__(
+        self,
+        url: str,
+        replica_urls: Sequence[str] = (),
+        balancing: Literal["round_robin", "least_connections"] = "round_robin",
+        **options: Any,
+    ):
+        self._async_engine = create_async_engine(url=url, **options)
         self._async_session = async_sessionmaker(
             bind=self._async_engine,
             expire_on_commit=False,
             autocommit=False
         )
+        self._replica_engines = [
+            create_async_engine(url=replica_url, **options)
+            for replica_url in replica_urls
+        ]
+        self._replica_sessions = [
+            async_sessionmaker(bind=engine, expire_on_commit=False, autocommit=False)
+            for engine in self._replica_engines
+        ]
+        for engine in self.engines:
+            instrument_engine(engine)
+        self._balancing = balancing
+        self._turn = itertools.count()
         self.Base = declarative_base()
 
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return [self._async_engine, *self._replica_engines]
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self._replica_engines)
+
+    def _pick_replica(self) -> int:
+        if self._balancing == "least_connections":
+            return min(
+                range(len(self._replica_engines)),
+                key=lambda index: self._replica_engines[index].pool.checkedout(),
+            )
+        return next(self._turn) % len(self._replica_engines)
+
     @asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """
+        Session for one unit of work.
+
+        Nothing is committed here: writers commit through ``UnitOfWork``, and
+        closing the session rolls back whatever is left, including the
+        transaction of a failed request.
+        """
         session: AsyncSession = self._async_session()
         try:
             yield session
-        except SQLAlchemyError:
-            await session.rollback()
-            raise
         finally:
-            await session.commit()
             await session.close()
 
     @asynccontextmanager
-    async def get_test_session(self) -> AsyncGenerator[AsyncSession, Any]:
-        session: AsyncSession = self._async_session()
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """
+        Session on one of the replicas, picked by the configured balancing.
+
+        Nothing is committed: closing the session ends its read-only
+        transaction. Without replicas this is a primary session.
+        """
+        if not self.has_replicas:
+            async with self.get_session() as session:
+                yield session
+            return
+        session: AsyncSession = self._replica_sessions[self._pick_replica()]()
         try:
-            async with session:
-                await session.begin_nested()
-                try:
-                    yield session
-                finally:
-                    if session.in_transaction():
-                        await session.rollback()
+            yield session
         finally:
             await session.close()
 
+    @asynccontextmanager
+    async def get_test_session(self) -> AsyncGenerator[AsyncSession, Any]:
+        """Session whose commits only release savepoints of an outer transaction."""
+        async with self._async_engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(
+                bind=connection,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            )
+            try:
+                yield session
+            finally:
+                await session.close()
+                await transaction.rollback()
+
+    def pool_status(self) -> dict[str, Any]:
+        """Live state of the primary's connection pool of this process."""
+        return self._pool_status(self._async_engine)
+
+    def pool_statuses(self) -> dict[str, dict[str, Any]]:
+        """Live state of every pool of this process, by engine name."""
+        names = ["primary"] + [
+            f"replica{index}" for index in range(len(self._replica_engines))
+        ]
+        return {
+            name: self._pool_status(engine)
+            for name, engine in zip(names, self.engines)
+        }
 
+    @staticmethod
+    def _pool_status(engine: AsyncEngine) -> dict[str, Any]:
+        pool = engine.pool
+        stats = pool.stats
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_seconds_total": stats.wait_seconds,
+            "wait_seconds_max": stats.max_wait_seconds,
+            "wait_seconds_buckets": stats.histogram(),
+        }
 
 
-database = Database(url=settings.db_url)
+database = Database(
+    url=settings.db_url,
+    replica_urls=settings.replica_urls,
+    balancing=settings.db_replica_balancing,
+    **engine_options(settings),
+)
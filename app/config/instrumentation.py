@@ -0,0 +1,267 @@
+import functools
+import importlib.util
+import inspect
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+T = TypeVar("T", bound=type)
+
+
+@dataclass
+class RequestTimings:
+    """Where the time of one request went, filled in as it runs."""
+
+    db_seconds: float = 0.0
+    queries: int = 0
+    pool_wait_seconds: float = 0.0
+    serialization_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+
+_timings: ContextVar[RequestTimings | None] = ContextVar("timings", default=None)
+
+
+def current_timings() -> RequestTimings | None:
+    return _timings.get()
+
+
+@contextmanager
+def track_request() -> Iterator[RequestTimings]:
+    timings = RequestTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+def record_pool_wait(seconds: float) -> None:
+    timings = _timings.get()
+    if timings is not None:
+        timings.pool_wait_seconds += seconds
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _timings.get()
+        if timings is not None:
+            timings.serialization_seconds += time.perf_counter() - start
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record_statement(conn, statement: str) -> float:
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    timings = _timings.get()
+    if timings is not None:
+        timings.queries += 1
+        timings.db_seconds += seconds
+        if settings.db_repeated_query_threshold:
+            timings.statements[statement] += 1
+    return seconds
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    seconds = _record_statement(conn, statement)
+    if settings.db_slow_query_ms and seconds * 1000 >= settings.db_slow_query_ms:
+        _log_slow_query(conn, statement, parameters, context, many, seconds)
+
+
+def _handle_error(context) -> None:
+    connection = context.connection
+    if connection is not None and connection.info.get("query_start"):
+        _record_statement(connection, context.statement)
+
+
+def _log_slow_query(conn, statement, parameters, context, many, seconds) -> None:
+    message = ["Slow query (%.1f ms): %s"]
+    args: list = [seconds * 1000, statement]
+    if settings.db_slow_query_parameters:
+        message.append("Parameters: %r")
+        args.append(parameters)
+    threshold = settings.db_explain_slow_query_ms
+    if (
+        threshold
+        and seconds * 1000 >= threshold
+        and not many
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and not (
+            context is not None and context.execution_options.get("stream_results")
+        )
+    ):
+        plan = _explain(conn, statement, parameters)
+        if plan is not None:
+            message.append("%s")
+            args.append(plan)
+    slow_query_logger.warning("\n".join(message), *args)
+
+
+def _explain(conn, statement, parameters) -> str | None:
+    """
+    ``EXPLAIN (ANALYZE, BUFFERS)`` of a statement, run again on its connection.
+
+    Only read-only statements get here, since ANALYZE executes them. The
+    plan runs inside a savepoint on a raw cursor, so that a failure leaves
+    the request's transaction as it was and no events fire for it.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT explain_slow_query")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(str(row[0]) for row in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+            cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+        return plan
+    except Exception:
+        logger.warning("Could not explain slow query", exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Add the time and count of every statement to the running request."""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def check_request_queries(name: str, timings: RequestTimings) -> None:
+    """Warn about a request over the statement budget or repeating a statement."""
+    budget = settings.db_query_budget
+    if budget and timings.queries > budget:
+        logger.warning(
+            "%s ran %d statements, over the budget of %d",
+            name,
+            timings.queries,
+            budget,
+        )
+    threshold = settings.db_repeated_query_threshold
+    for statement, count in timings.statements.items():
+        if threshold and count >= threshold:
+            logger.warning(
+                "%s ran the same statement %d times, likely N+1: %s",
+                name,
+                count,
+                statement,
+            )
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(limit: int, *engines: AsyncEngine) -> Iterator[list[str]]:
+    """
+    Fail when the block sends more than ``limit`` statements to ``engines``.
+
+    Yields the list of statements seen so far; meant for tests, where
+    requests run one at a time.
+    """
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, many):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+    if len(statements) > limit:
+        raise QueryBudgetExceeded(
+            f"{len(statements)} statements, over the budget of {limit}:\n"
+            + "\n".join(statements)
+        )
+
+
+def tracing_available() -> bool:
+    return (
+        settings.otel_enabled and importlib.util.find_spec("opentelemetry") is not None
+    )
+
+
+def setup_tracing(service_name: str) -> None:
+    """
+    Export spans over OTLP/HTTP unless a tracer provider is already set.
+
+    The exporter is configured by the standard ``OTEL_EXPORTER_OTLP_*``
+    variables. Without the optional "tracing" extra spans go nowhere.
+    """
+    from opentelemetry import trace
+
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        return
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("Exporting spans needs the 'tracing' extra")
+        return
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+
+
+def _traced(method):
+    from opentelemetry import trace
+
+    tracer = trace.get_tracer(__name__)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        timings = _timings.get()
+        queries = timings.queries if timings else 0
+        name = f"{type(self).__name__}.{method.__name__}"
+        with tracer.start_as_current_span(name) as span:
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                if timings is not None:
+                    span.set_attribute("db.queries", timings.queries - queries)
+
+    return wrapper
+
+
+def traced(cls: T) -> T:
+    """
+    Wrap the public coroutine methods ``cls`` defines in OpenTelemetry spans.
+
+    The class is left untouched unless ``OTEL_ENABLED`` is set and
+    OpenTelemetry is installed. Async generators (streams) are not wrapped.
+    """
+    if not tracing_available():
+        return cls
+    for attribute, method in list(vars(cls).items()):
+        if not attribute.startswith("_") and inspect.iscoroutinefunction(method):
+            setattr(cls, attribute, _traced(method))
+    return cls
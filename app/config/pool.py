@@ -0,0 +1,63 @@
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .instrumentation import record_pool_wait
+
+# Upper bounds, in seconds, of the checkout latency histogram buckets.
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(CHECKOUT_BUCKETS) + 1)
+    )
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        self.buckets[bisect_left(CHECKOUT_BUCKETS, seconds)] += 1
+
+    def histogram(self) -> dict[str, int]:
+        """Cumulative bucket counts keyed by upper bound, Prometheus style."""
+        bounds = [str(bound) for bound in CHECKOUT_BUCKETS] + ["+Inf"]
+        counts, total = {}, 0
+        for bound, count in zip(bounds, self.buckets):
+            total += count
+            counts[bound] = total
+        return counts
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited.
+
+    The time covers waiting for a free connection and, when the pool grows
+    into its overflow, opening a new one. Checkouts that give up after
+    ``pool_timeout`` are counted separately.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        waited = time.perf_counter() - start
+        self.stats.observe(waited)
+        record_pool_wait(waited)
+        return connection
@@ -0,0 +1,40 @@
+from typing import Any
+
+from .settings import Settings
+
+APP = "app.main:create_production_app"
+
+
+def server_options(config: Settings) -> dict[str, Any]:
+    """
+    Keyword arguments of ``uvicorn.run`` for the configured server mode.
+
+    Development runs a single reloading process. Production runs
+    ``config.workers`` processes on uvloop with the httptools parser, with
+    the configured keep-alive, listen backlog and graceful shutdown. An in
+    process cache is refused with several workers.
+    """
+    options: dict[str, Any] = {
+        "app": APP,
+        "factory": True,
+        "host": config.app_host,
+        "port": int(config.app_port),
+        "log_level": config.log_level.lower(),
+    }
+    if config.server_mode == "development":
+        return {**options, "reload": True}
+    if config.cache == "memory" and config.workers > 1:
+        raise ValueError(
+            "CACHE_BACKEND=memory is per process and would serve stale tasks "
+            f"with {config.workers} workers; use redis or none."
+        )
+    return {
+        **options,
+        "workers": config.workers,
+        "loop": "uvloop",
+        "http": "httptools",
+        "timeout_keep_alive": config.web_keep_alive_seconds,
+        "backlog": config.web_backlog,
+        "timeout_graceful_shutdown": config.web_graceful_shutdown_seconds,
+        "proxy_headers": True,
+    }
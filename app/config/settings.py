@@ -1,5 +1,19 @@
+import os
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, model_validator
+from typing import Literal
+
+
+# Connections each worker holds outside its pool: the change feed's LISTEN.
+CHANGE_FEED_CONNECTIONS = 1
+
+
+def _usable_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
 
 
 class Settings(BaseSettings):
@@ -25,13 +39,144 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
     db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
     db_pool_timeout: int = Field(default=30, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(default=False, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(default=100, alias="DB_STATEMENT_CACHE_SIZE")
+    db_pgbouncer: bool = Field(default=False, alias="DB_PGBOUNCER")
+    db_echo: bool = Field(default=False, alias="DB_ECHO")
     db_url: str = Field(default="", alias="DATABASE_URL")
+    db_max_connections: int = Field(default=0, alias="DB_MAX_CONNECTIONS")
+
+    # Read replicas
+    db_replica_urls: str = Field(default="", alias="DATABASE_REPLICA_URLS")
+    db_replica_balancing: Literal["round_robin", "least_connections"] = Field(
+        default="round_robin", alias="DB_REPLICA_BALANCING"
+    )
+    db_read_your_writes_seconds: float = Field(
+        default=5, alias="DB_READ_YOUR_WRITES_SECONDS"
+    )
+
+    # Cache settings
+    cache_backend: Literal["none", "memory", "redis"] | None = Field(
+        default=None, alias="CACHE_BACKEND"
+    )
+    cache_ttl_seconds: float = Field(default=30, alias="CACHE_TTL_SECONDS")
+    cache_max_entries: int = Field(default=10000, alias="CACHE_MAX_ENTRIES")
+    count_cache_ttl_seconds: float = Field(default=60, alias="COUNT_CACHE_TTL_SECONDS")
+    redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
+    single_flight_enabled: bool = Field(default=True, alias="SINGLE_FLIGHT_ENABLED")
+    idempotency_ttl_seconds: float = Field(
+        default=86400, alias="IDEMPOTENCY_TTL_SECONDS"
+    )
+    idempotency_wait_seconds: float = Field(
+        default=10, alias="IDEMPOTENCY_WAIT_SECONDS"
+    )
+    idempotency_max_body_bytes: int = Field(
+        default=10 * 1024 * 1024, alias="IDEMPOTENCY_MAX_BODY_BYTES"
+    )
+
+    # Change feed
+    change_feed_db_url: str = Field(default="", alias="CHANGE_FEED_DATABASE_URL")
+    change_feed_max_pending: int = Field(default=1000, alias="CHANGE_FEED_MAX_PENDING")
+    change_feed_heartbeat_seconds: float = Field(
+        default=15, alias="CHANGE_FEED_HEARTBEAT_SECONDS"
+    )
+    sync_settle_seconds: float = Field(default=5, alias="SYNC_SETTLE_SECONDS")
+
+    # Purge of soft-deleted tasks
+    purge_retention_seconds: float = Field(
+        default=7 * 24 * 3600, alias="PURGE_RETENTION_SECONDS"
+    )
+    purge_batch_size: int = Field(default=1000, alias="PURGE_BATCH_SIZE")
+    purge_pause_seconds: float = Field(default=0.5, alias="PURGE_PAUSE_SECONDS")
+    purge_interval_seconds: float = Field(default=300, alias="PURGE_INTERVAL_SECONDS")
+
+    # Response settings
+    compression_encodings: str = Field(
+        default="br,zstd,gzip", alias="COMPRESSION_ENCODINGS"
+    )
+    compression_minimum_size: int = Field(
+        default=1024, alias="COMPRESSION_MINIMUM_SIZE"
+    )
+    gzip_level: int = Field(default=6, alias="GZIP_LEVEL")
+    brotli_quality: int = Field(default=4, alias="BROTLI_QUALITY")
+    zstd_level: int = Field(default=3, alias="ZSTD_LEVEL")
+    list_stream_min_limit: int = Field(default=500, alias="LIST_STREAM_MIN_LIMIT")
+
+    # Instrumentation
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    server_timing: bool = Field(default=True, alias="SERVER_TIMING")
+    otel_enabled: bool = Field(default=False, alias="OTEL_ENABLED")
+    db_slow_query_ms: float = Field(default=500, alias="DB_SLOW_QUERY_MS")
+    db_slow_query_parameters: bool = Field(
+        default=True, alias="DB_SLOW_QUERY_PARAMETERS"
+    )
+    db_explain_slow_query_ms: float = Field(default=0, alias="DB_EXPLAIN_SLOW_QUERY_MS")
+    db_query_budget: int = Field(default=25, alias="DB_QUERY_BUDGET")
+    db_repeated_query_threshold: int = Field(
+        default=10, alias="DB_REPEATED_QUERY_THRESHOLD"
+    )
 
     # Application settings
+    app_host: str = Field(default="0.0.0.0", alias="APP_HOST")
     app_port: str = Field(default="8000", alias="APP_PORT")
 
+    # Server settings
+    server_mode: Literal["development", "production"] = Field(
+        default="development", alias="SERVER_MODE"
+    )
+    web_workers: int = Field(default=0, alias="WEB_WORKERS")
+    web_keep_alive_seconds: int = Field(default=5, alias="WEB_KEEP_ALIVE_SECONDS")
+    web_backlog: int = Field(default=2048, alias="WEB_BACKLOG")
+    web_graceful_shutdown_seconds: int = Field(
+        default=30, alias="WEB_GRACEFUL_SHUTDOWN_SECONDS"
+    )
+
     # Logging
     log_level: str = Field(default="INFO")
 
+    @model_validator(mode="after")
+    def _check_connection_budget(self) -> "Settings":
+        if self.db_max_connections:
+            needed = self.workers * (1 + CHANGE_FEED_CONNECTIONS)
+            if self.db_max_connections < needed:
+                raise ValueError(
+                    f"DB_MAX_CONNECTIONS={self.db_max_connections} is below "
+                    f"{needed}: each of the {self.workers} workers needs a "
+                    "pooled connection and one for the change feed."
+                )
+        return self
+
+    @property
+    def compression(self) -> list[str]:
+        return [
+            name.strip().lower()
+            for name in self.compression_encodings.split(",")
+            if name.strip()
+        ]
+
+    @property
+    def workers(self) -> int:
+        """Worker processes: ``web_workers``, or one per usable CPU in production."""
+        if self.server_mode == "development":
+            return 1
+        return self.web_workers or _usable_cpus()
+
+    @property
+    def cache(self) -> str:
+        """
+        Response cache backend: ``cache_backend``, or by default in process
+        with a single worker and none with several. A process-local cache is
+        only invalidated by writes handled in its own worker, so other
+        workers would serve stale bodies and ETags.
+        """
+        if self.cache_backend is not None:
+            return self.cache_backend
+        return "memory" if self.workers == 1 else "none"
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.db_replica_urls.split(",") if url.strip()]
+
 
 settings = Settings()
@@ -1,12 +1,16 @@
 from dishka import make_async_container
+from dishka.integrations.fastapi import FastapiProvider
 from app.providers import (
+    CacheProvider,
     SessionProvider,
     TaskRepositoryProvider,
     TaskServiceProvider,
 )
 
 container = make_async_container(
+    FastapiProvider(),
     SessionProvider(),
+    CacheProvider(),
     TaskRepositoryProvider(),
     TaskServiceProvider(),
 )
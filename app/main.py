@@ -1,8 +1,14 @@
 from fastapi import FastAPI
 from app.config.settings import settings
+from app.api.compression import CompressionMiddleware
+from app.api.consistency import ReadYourWritesMiddleware
+from app.api.idempotency import IdempotencyMiddleware
+from app.api.metrics import TimingMiddleware, router as metrics_router
 from app.api.router import router
+from app.api.system import router as system_router
 
 from dishka.integrations.fastapi import setup_dishka
+from app.config.instrumentation import setup_tracing, tracing_available
 from app.container import container
 
 
@@ -17,6 +23,34 @@ def create_app():
         root_path="/api",
     )
     app.include_router(router=router)
+    app.include_router(router=system_router)
+    if settings.metrics_enabled:
+        app.include_router(router=metrics_router)
+    app.add_middleware(
+        IdempotencyMiddleware, max_body_size=settings.idempotency_max_body_bytes
+    )
+    tracer = None
+    if tracing_available():
+        from opentelemetry import trace
+
+        setup_tracing(settings.project_name)
+        tracer = trace.get_tracer(__name__)
+    app.add_middleware(
+        TimingMiddleware, server_timing=settings.server_timing, tracer=tracer
+    )
+    if settings.compression:
+        app.add_middleware(
+            CompressionMiddleware,
+            encodings=settings.compression,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.gzip_level,
+            brotli_quality=settings.brotli_quality,
+            zstd_level=settings.zstd_level,
+        )
+    if settings.replica_urls:
+        app.add_middleware(
+            ReadYourWritesMiddleware, window=settings.db_read_your_writes_seconds
+        )
     return app
 
 
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import mapped_column, Mapped
 from uuid import UUID, uuid4
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Integer, literal_column
 from app.config.database import database
 from datetime import datetime
 from sqlalchemy.sql import func
@@ -25,3 +25,21 @@ class BaseModel(database.Base):
         nullable=False,
         onupdate=func.now(),
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        server_default="1",
+        nullable=False,
+        onupdate=literal_column("version") + 1,
+    )
+
+
+class SoftDeleteMixin:
+    """
+    Rows are marked deleted by setting ``deleted_at``, hidden from every
+    repository read, and hard-deleted later, in batches, by the purge.
+    """
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.config.database import database
+
+
+class CacheEntry(database.Base):
+    """Entry of ``PostgresCache``, live until ``expires_at``."""
+
+    __tablename__ = "cache_entries"
+    __table_args__ = (Index("ix_cache_entries_expires_at", "expires_at"),)
+
+    key: Mapped[str] = mapped_column(String(length=512), primary_key=True)
+    value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
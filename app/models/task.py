@@ -1,8 +1,17 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Text, Enum as SQLEnum
+from sqlalchemy import Computed, DateTime, Index, String, Text, Enum as SQLEnum, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.sql import func
+from datetime import datetime
 from enum import Enum
+from uuid import UUID
 
-from .base import BaseModel
+from app.config.database import database
+from .base import BaseModel, SoftDeleteMixin
+
+
+SEARCH_CONFIG = "english"
+LIVE = text("deleted_at IS NULL")
 
 
 class StatusType(str, Enum):
@@ -11,12 +20,73 @@ class StatusType(str, Enum):
     COMPLETED = "Completed"
 
 
-class Task(BaseModel):
+class Task(SoftDeleteMixin, BaseModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_name_unique", "name", unique=True, postgresql_where=LIVE),
+        Index("ix_tasks_created_at_id", "created_at", "id", postgresql_where=LIVE),
+        Index("ix_tasks_updated_at_id", "updated_at", "id", postgresql_where=LIVE),
+        Index(
+            "ix_tasks_status_created_at_id",
+            "status",
+            "created_at",
+            "id",
+            postgresql_where=LIVE,
+        ),
+        Index(
+            "ix_tasks_active_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text(
+                "status IN ('CREATED', 'IN_PROGRESS') AND deleted_at IS NULL"
+            ),
+        ),
+        Index(
+            "ix_tasks_name_pattern",
+            "name",
+            postgresql_ops={"name": "varchar_pattern_ops"},
+            postgresql_where=LIVE,
+        ),
+        Index(
+            "ix_tasks_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=LIVE,
+        ),
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
 
-    name: Mapped[str] = mapped_column(String(length=255), unique=True)
+    name: Mapped[str] = mapped_column(String(length=255))
     description: Mapped[str] = mapped_column(Text)
     status: Mapped[StatusType] = mapped_column(
         SQLEnum(StatusType),
         default=StatusType.CREATED,
     )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+            "coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
+
+class TaskTombstone(database.Base):
+    """Id of a deleted task, written by the ``tasks_record_tombstone`` trigger."""
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (Index("ix_task_tombstones_deleted_at_id", "deleted_at", "id"),)
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -1,11 +1,26 @@
-from typing import AsyncGenerator
+from typing import AsyncGenerator, NewType
 
 from dishka import Scope, provide, Provider
+from fastapi import Request
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.consistency import reads_from_primary
+from app.api.idempotency import IdempotencyStore
+from app.cache.base import CacheBackend, NullCache
+from app.cache.memory import MemoryCache
+from app.cache.postgres import PostgresCache
+from app.cache.redis import RedisCache
 from app.repositories.task import TaskRepository
+from app.repositories.unit_of_work import UnitOfWork
+from app.services.changes import ChangeFeed
+from app.services.single_flight import SingleFlight
 from app.services.task import TaskService
 
 from app.config.database import database
+from app.config.settings import settings
+
+ReadSession = NewType("ReadSession", AsyncSession)
+ReadTaskRepository = NewType("ReadTaskRepository", TaskRepository)
 
 
 class SessionProvider(Provider):
@@ -14,17 +29,124 @@ class SessionProvider(Provider):
         async with database.get_session() as session:
             yield session
 
+    @provide(scope=Scope.REQUEST)
+    async def provide_read_session(
+        self, request: Request, session: AsyncSession
+    ) -> AsyncGenerator[ReadSession, None]:
+        if not database.has_replicas or reads_from_primary(request):
+            yield session
+            return
+        async with database.get_read_session() as read_session:
+            yield read_session
+
+
+class CacheProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def provide_cache(self) -> AsyncGenerator[CacheBackend, None]:
+        if settings.cache == "redis":
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(settings.redis_url)
+            yield RedisCache(client=client, ttl=settings.cache_ttl_seconds)
+            await client.aclose()
+        elif settings.cache == "memory":
+            yield MemoryCache(
+                ttl=settings.cache_ttl_seconds,
+                max_entries=settings.cache_max_entries,
+            )
+        else:
+            yield NullCache()
+
+    @provide(scope=Scope.APP)
+    async def provide_idempotency_store(
+        self,
+    ) -> AsyncGenerator[IdempotencyStore, None]:
+        """
+        Store kept apart from the response cache, which may be disabled or
+        cleared wholesale. Retries may reach any worker, so with several
+        workers keys live in Redis when it is configured, else in Postgres;
+        a single worker keeps them in process.
+        """
+        options = {
+            "ttl": settings.idempotency_ttl_seconds,
+            "wait_seconds": settings.idempotency_wait_seconds,
+        }
+        if settings.cache == "redis":
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(settings.redis_url)
+            cache = RedisCache(
+                client=client,
+                ttl=settings.idempotency_ttl_seconds,
+                prefix="task-manager-idempotency:",
+            )
+            yield IdempotencyStore(cache=cache, **options)
+            await client.aclose()
+        elif settings.workers > 1:
+            cache = PostgresCache(
+                session_factory=database.get_session,
+                ttl=settings.idempotency_ttl_seconds,
+                prefix="task-manager-idempotency:",
+            )
+            yield IdempotencyStore(cache=cache, **options)
+        else:
+            cache = MemoryCache(
+                ttl=settings.idempotency_ttl_seconds,
+                max_entries=settings.cache_max_entries,
+            )
+            yield IdempotencyStore(cache=cache, **options)
+
 
 class TaskRepositoryProvider(Provider):
     @provide(scope=Scope.REQUEST)
     async def provide_repository(self, session: AsyncSession) -> TaskRepository:
         return TaskRepository(session=session)
 
+    @provide(scope=Scope.REQUEST)
+    async def provide_unit_of_work(
+        self, session: AsyncSession, read_session: ReadSession
+    ) -> UnitOfWork:
+        return UnitOfWork(session=session, read_session=read_session)
+
+    @provide(scope=Scope.REQUEST)
+    async def provide_read_repository(self, session: ReadSession) -> ReadTaskRepository:
+        return TaskRepository(session=session)
+
 
 class TaskServiceProvider(Provider):
+    @provide(scope=Scope.APP)
+    async def provide_single_flight(self) -> SingleFlight:
+        return SingleFlight()
+
+    @provide(scope=Scope.APP)
+    async def provide_change_feed(self) -> AsyncGenerator[ChangeFeed, None]:
+        url = make_url(settings.change_feed_db_url or settings.db_url)
+        feed = ChangeFeed(
+            dsn=url.set(drivername="postgresql").render_as_string(hide_password=False),
+            max_pending=settings.change_feed_max_pending,
+        )
+        yield feed
+        await feed.close()
+
     @provide(scope=Scope.REQUEST)
-    async def provide_service(self, repository: TaskRepository) -> TaskService:
-        return TaskService(repository=repository)
+    async def provide_service(
+        self,
+        request: Request,
+        repository: TaskRepository,
+        reader: ReadTaskRepository,
+        unit_of_work: UnitOfWork,
+        cache: CacheBackend,
+        single_flight: SingleFlight,
+    ) -> TaskService:
+        return TaskService(
+            repository=repository,
+            reader=reader,
+            unit_of_work=unit_of_work,
+            cache=cache,
+            count_ttl=settings.count_cache_ttl_seconds,
+            single_flight=single_flight if settings.single_flight_enabled else None,
+            read_your_writes=reads_from_primary(request),
+        )
 
 
 class MockSessionProvider(Provider):
@@ -32,3 +154,7 @@ class MockSessionProvider(Provider):
     async def provide_session(self) -> AsyncGenerator[AsyncSession, None]:
         async with database.get_test_session() as session:
             yield session
+
+    @provide(scope=Scope.REQUEST)
+    async def provide_read_session(self, session: AsyncSession) -> ReadSession:
+        return session
@@ -1,12 +1,35 @@
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import TypeVar, Type, Protocol, Sequence
+from typing import Any, AsyncIterator, Mapping, TypeVar, Type, Protocol, Sequence
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
 
 
-from app.models.base import BaseModel
+from app.config.instrumentation import traced
+from app.models.base import BaseModel, SoftDeleteMixin
+from app.schemas.bulk import BulkItemResult, BulkItemStatus
+from app.schemas.pagination import Cursor
+from app.schemas.transfer import ImportConflictPolicy, ImportResult, ImportRowError
 from pydantic import BaseModel as Schema
-from sqlalchemy import select, update, delete, insert
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    insert,
+    tuple_,
+    values,
+    column,
+    cast,
+    exists,
+    any_,
+    bindparam,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
@@ -15,72 +38,737 @@ class BaseRepositoryProtocol(Protocol):
     async def create(self, schema: Schema) -> Type[ModelType]: ...
     async def get_by_uuid(self, uuid: str) -> Type[ModelType]: ...
     async def get_list(self, offset: int, limit: int) -> Sequence[Type[ModelType]]: ...
-    async def update(self, uuid: str, schema: Schema) -> Type[ModelType]: ...
+    async def get_page(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: Schema | None = None,
+        count: bool = False,
+        columns: Sequence[str] | None = None,
+    ) -> tuple[Sequence[Type[ModelType] | dict[str, Any]], str | None, int | None]: ...
+    def stream_page(
+        self,
+        limit: int,
+        columns: Sequence[str],
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: Schema | None = None,
+        count: bool = False,
+        chunk_size: int = 200,
+    ) -> AsyncIterator[Sequence[Any]]: ...
+    def page_cursor(self, row: Any, filters: Schema | None = None) -> str: ...
+    async def count(self, filters: Schema | None = None) -> int: ...
+    async def estimate_count(self, filters: Schema | None = None) -> int: ...
+    async def update(
+        self, uuid: str, schema: Schema, versions: Sequence[int] | None = None
+    ) -> Type[ModelType]: ...
     async def delete(self, uuid: str) -> None: ...
+    async def restore(self, uuid: str) -> Type[ModelType]: ...
+    async def purge_deleted(self, deleted_before: datetime, limit: int) -> int: ...
+    def stream_rows(
+        self, chunk_size: int
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]: ...
+    async def bulk_create(self, schemas: Sequence[Schema]) -> list[BulkItemResult]: ...
+    async def bulk_update(self, schemas: Sequence[Schema]) -> list[BulkItemResult]: ...
+    async def bulk_delete(self, uuids: Sequence[UUID]) -> list[BulkItemResult]: ...
+    async def copy_import(
+        self,
+        chunks: AsyncIterator[Sequence[tuple[int, Schema]]],
+        policy: ImportConflictPolicy,
+        max_reported: int = 1000,
+    ) -> ImportResult: ...
 
 
+@traced
 class BaseRepository(BaseRepositoryProtocol):
     def __init__(self, session: AsyncSession, model: Type[ModelType]):
         self.session = session
         self.model = model
 
+    @property
+    def soft_delete(self) -> bool:
+        return issubclass(self.model, SoftDeleteMixin)
+
+    def _live(self, query):
+        """``query`` without soft-deleted rows, matching the partial indexes."""
+        if self.soft_delete:
+            query = query.where(self.model.deleted_at.is_(None))
+        return query
+
     async def create(self, schema: Schema) -> Type[ModelType]:
-        instance = self.model(**schema.model_dump())
+        """Insert one row and load it back in the same ``INSERT ... RETURNING``."""
+        query = insert(self.model).values(**schema.model_dump()).returning(self.model)
         try:
-            async with self.session as session:
-                session.add(instance=instance)
-                await session.commit()
-                await session.refresh(instance=instance)
-                return instance
+            return await self.session.scalar(query)
         except IntegrityError:
-            await session.rollback()
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Duplicate entry.",
             )
 
     async def get_by_uuid(self, uuid: str) -> Type[ModelType] | None:
-        async with self.session as session:
+        try:
+            query = self._live(select(self.model).where(self.model.id == uuid))
+            result = await self.session.execute(query)
+            return result.scalar_one()
+        except SQLAlchemyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid UUID.",
+            )
+
+    async def get_list(self, offset: int, limit: int) -> Sequence[Type[ModelType]]:
+        query = (
+            self._live(select(self.model))
+            .order_by(self.model.created_at, self.model.id)
+            .offset(offset=offset)
+            .limit(limit=limit)
+        )
+        result = await self.session.scalars(query)
+        return result.all()
+
+    async def get_page(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: Schema | None = None,
+        count: bool = False,
+        columns: Sequence[str] | None = None,
+    ) -> tuple[Sequence[Type[ModelType] | dict[str, Any]], str | None, int | None]:
+        """
+        Return one page in ``(<sort column>, id)`` order, the cursor of the next one
+        and, with ``count``, the number of rows matching ``filters``.
+
+        With ``columns`` only those columns are selected and rows come back as
+        plain dicts, skipping ORM instance construction and the identity map.
+
+        With ``cursor`` the page starts right after the encoded row (keyset
+        pagination); otherwise ``offset`` is applied. One extra row is fetched
+        to know whether a next page exists. The total is computed by the same
+        statement: a ``count(*) OVER ()`` window with offsets, a scalar
+        subquery with cursors (where the window would only see later rows).
+        """
+        query = self._page_query(
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            filters=filters,
+            count=count,
+            columns=columns,
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        if columns is None:
+            items = [row[0] for row in rows]
+        else:
+            items = [dict(zip(columns, row)) for row in rows]
+        total = None
+        if count:
+            if rows:
+                total = rows[0].total
+            elif cursor is None and offset == 0:
+                total = 0
+            else:
+                total = await self.count(filters=filters)
+        if len(items) <= limit:
+            return items, None, total
+        last = rows[limit - 1]
+        return (
+            items[:limit],
+            self.page_cursor(last[0] if columns is None else last, filters),
+            total,
+        )
+
+    async def stream_page(
+        self,
+        limit: int,
+        columns: Sequence[str],
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: Schema | None = None,
+        count: bool = False,
+        chunk_size: int = 200,
+    ) -> AsyncIterator[Sequence[Any]]:
+        """
+        Same page as ``get_page`` with ``columns``, read through a server-side
+        cursor and yielded as rows ``chunk_size`` at a time, including the
+        extra row and, with ``count``, the ``total`` column.
+        """
+        query = self._page_query(
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            filters=filters,
+            count=count,
+            columns=columns,
+        )
+        result = await self.session.stream(
+            query.execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+    def page_cursor(self, row: Any, filters: Schema | None = None) -> str:
+        """Cursor of the page that starts right after ``row``."""
+        sort = getattr(filters, "sort", None)
+        sort_name = sort.column if sort is not None else "created_at"
+        return Cursor.after(
+            sort=sort_name, value=getattr(row, sort_name), id=row.id
+        ).encode()
+
+    def _page_query(
+        self,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        filters: Schema | None,
+        count: bool,
+        columns: Sequence[str] | None,
+    ):
+        sort = getattr(filters, "sort", None)
+        sort_name = sort.column if sort is not None else "created_at"
+        descending = sort.descending if sort is not None else False
+        sort_column = getattr(self.model, sort_name)
+        order = (sort_column, self.model.id)
+        selected = (
+            [self.model]
+            if columns is None
+            else [getattr(self.model, name) for name in columns]
+        )
+        query = self._live(select(*selected)).order_by(
+            *(column.desc() if descending else column for column in order)
+        )
+        if filters is not None:
+            query = self._apply_filters(query=query, filters=filters)
+        if count:
+            total = (
+                func.count().over()
+                if cursor is None
+                else self._count_query(filters=filters).scalar_subquery()
+            )
+            query = query.add_columns(total.label("total"))
+        if cursor is not None:
             try:
-                query = select(self.model).where(self.model.id == uuid)
-                result = await session.execute(query)
-                return result.scalar_one()
-            except SQLAlchemyError:
+                after = Cursor.decode(cursor)
+                if after.sort != sort_name:
+                    raise ValueError("Cursor belongs to another sort order.")
+                value = self._parse_cursor_value(sort_column, after.value)
+            except ValueError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid UUID.",
+                    detail="Invalid cursor.",
                 )
+            position = tuple_(*order)
+            boundary = tuple_(value, after.id)
+            query = query.where(
+                position < boundary if descending else position > boundary
+            )
+        else:
+            query = query.offset(offset=offset)
+        return query.limit(limit=limit + 1)
 
-    async def get_list(self, offset: int, limit: int) -> Sequence[Type[ModelType]]:
-        async with self.session as session:
-            query = select(self.model).offset(offset=offset).limit(limit=limit)
-            result = await session.scalars(query)
-            return result.all()
+    def _count_query(self, filters: Schema | None = None):
+        query = self._live(select(func.count()).select_from(self.model))
+        if filters is not None:
+            query = self._apply_filters(query=query, filters=filters)
+        return query
 
-    async def update(self, uuid: str, schema: Schema) -> Type[ModelType] | None:
-        try:
-            async with self.session as session:
-                query = (
-                    update(self.model)
-                    .where(self.model.id == uuid)
-                    .values(**schema.model_dump())
-                ).returning(self.model)
-                result = await session.execute(query)
-                return result.scalar_one()
+    async def count(self, filters: Schema | None = None) -> int:
+        """Exact number of rows matching ``filters``."""
+        return await self.session.scalar(self._count_query(filters=filters))
+
+    async def estimate_count(self, filters: Schema | None = None) -> int:
+        """
+        Planner estimate of the number of rows matching ``filters``.
 
+        Without filters this is ``pg_class.reltuples``, kept up to date by
+        autovacuum; with filters it is the row estimate of the top plan node
+        of ``EXPLAIN``. Neither reads the table. Falls back to an exact count
+        on a table that was never analyzed. ``reltuples`` counts soft-deleted
+        rows too, so with soft delete the plan estimate is always used.
+        """
+        active = (
+            filters.model_dump(exclude={"sort"}, exclude_none=True)
+            if filters is not None
+            else {}
+        )
+        if not self.soft_delete and not any(value != [] for value in active.values()):
+            estimate = await self.session.scalar(
+                select(column("reltuples"))
+                .select_from(text("pg_class"))
+                .where(
+                    column("oid")
+                    == literal_column(f"'{self.model.__tablename__}'::regclass")
+                )
+            )
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+            return await self.session.scalar(self._count_query())
+        connection = await self.session.connection()
+        query = self._live(select(self.model.id))
+        if filters is not None:
+            query = self._apply_filters(query=query, filters=filters)
+        query = query.compile(
+            dialect=connection.dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {query}")
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _apply_filters(self, query, filters: Schema):
+        """
+        Compile a filter schema into sargable predicates by field-name convention.
+
+        ``<column>_prefix`` becomes ``LIKE 'value%'``, ``<x>_after`` and
+        ``<x>_before`` become a half-open range on ``<x>_at``, lists become
+        ``IN`` and anything else an equality. Lists are rendered as literals so
+        that partial indexes can be matched by the planner.
+        """
+        values = filters.model_dump(exclude={"sort"}, exclude_none=True)
+        for field, value in values.items():
+            if field.endswith("_prefix"):
+                column = getattr(self.model, field.removesuffix("_prefix"))
+                escaped = value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+                query = query.where(column.like(escaped + "%", escape="/"))
+            elif field.endswith("_after"):
+                column = getattr(self.model, field.removesuffix("_after") + "_at")
+                query = query.where(column >= value)
+            elif field.endswith("_before"):
+                column = getattr(self.model, field.removesuffix("_before") + "_at")
+                query = query.where(column < value)
+            elif isinstance(value, list):
+                if value:
+                    column = getattr(self.model, field)
+                    query = query.where(
+                        column.in_(
+                            bindparam(
+                                field,
+                                value=value,
+                                expanding=True,
+                                literal_execute=True,
+                            )
+                        )
+                    )
+            else:
+                query = query.where(getattr(self.model, field) == value)
+        return query
+
+    @staticmethod
+    def _parse_cursor_value(column, value: str):
+        if column.type.python_type is datetime:
+            return datetime.fromisoformat(value)
+        return value
+
+    async def stream_rows(
+        self, chunk_size: int
+    ) -> AsyncIterator[Sequence[Mapping[str, Any]]]:
+        """
+        Yield the whole table in ``(created_at, id)`` order, ``chunk_size``
+        rows at a time.
+
+        Rows are read through a server-side cursor as plain column mappings, so
+        memory stays bounded by one chunk regardless of the table size.
+        """
+        columns = [c for c in self.model.__table__.columns if c.computed is None]
+        query = (
+            self._live(select(*columns))
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        async for rows in result.mappings().partitions(chunk_size):
+            yield rows
+
+    async def update(
+        self, uuid: str, schema: Schema, versions: Sequence[int] | None = None
+    ) -> Type[ModelType] | None:
+        """
+        Update one row; with ``versions`` only if its current version is one of them.
+
+        The version check is part of the ``UPDATE`` itself, so concurrent
+        writers never overwrite each other and no row lock is held between
+        read and write. A failed check costs one extra lookup to tell a
+        stale version (412) from a missing row.
+        """
+        query = self._live(
+            update(self.model)
+            .where(self.model.id == uuid)
+            .values(**schema.model_dump())
+        ).returning(self.model)
+        if versions is not None:
+            query = query.where(self.model.version.in_(versions))
+        try:
+            result = await self.session.execute(query)
+            instance = result.scalar_one_or_none()
+            found = instance is not None
+            if not found and versions is not None:
+                found = await self.session.scalar(
+                    select(self._live(exists().where(self.model.id == uuid)))
+                )
         except SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid UUID.",
             )
+        if instance is None and found:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Precondition failed.",
+            )
+        if instance is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid UUID.",
+            )
+        return instance
 
     async def delete(self, uuid: str) -> None:
+        """Delete one row: mark it deleted with soft delete, else remove it."""
         try:
-            async with self.session as session:
-                query = delete(self.model).where(self.model.id == uuid)
-                await session.execute(query)
+            await self.session.execute(self._delete_query(self.model.id == uuid))
         except SQLAlchemyError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid UUID.",
             )
+
+    async def restore(self, uuid: str) -> Type[ModelType]:
+        """Undo the soft delete of a row not purged yet."""
+        if not self.soft_delete:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Deleted rows are not kept.",
+            )
+        query = (
+            update(self.model)
+            .where(self.model.id == uuid, self.model.deleted_at.is_not(None))
+            .values(deleted_at=None)
+            .returning(self.model)
+        )
+        try:
+            instance = (await self.session.execute(query)).scalar_one_or_none()
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Duplicate entry.",
+            )
+        except SQLAlchemyError:
+            instance = None
+        if instance is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid UUID.",
+            )
+        return instance
+
+    async def purge_deleted(self, deleted_before: datetime, limit: int) -> int:
+        """
+        Hard-delete at most ``limit`` rows soft-deleted before ``deleted_before``.
+
+        Oldest first, through the partial index on ``deleted_at``; rows locked
+        by another transaction are skipped rather than waited for, so one
+        batch holds few locks for a short time.
+        """
+        batch = (
+            select(self.model.id)
+            .where(self.model.deleted_at < deleted_before)
+            .order_by(self.model.deleted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def _delete_query(self, *conditions):
+        if self.soft_delete:
+            return self._live(
+                update(self.model).where(*conditions).values(deleted_at=func.now())
+            )
+        return delete(self.model).where(*conditions)
+
+    async def bulk_create(self, schemas: Sequence[Schema]) -> list[BulkItemResult]:
+        """
+        Insert all rows with a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING``.
+
+        Ids are generated up front, so rows skipped because of a unique
+        constraint are told apart from inserted ones without another query.
+        """
+        rows = [{"id": uuid4(), **schema.model_dump()} for schema in schemas]
+        if not rows:
+            return []
+        query = (
+            pg_insert(self.model)
+            .values(rows)
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        result = await self.session.scalars(query)
+        created = {instance.id: instance for instance in result.all()}
+        return [
+            BulkItemResult(
+                index=index,
+                status=BulkItemStatus.CREATED,
+                id=row["id"],
+                data=created[row["id"]],
+            )
+            if row["id"] in created
+            else BulkItemResult(
+                index=index,
+                status=BulkItemStatus.CONFLICT,
+                error="Duplicate entry.",
+            )
+            for index, row in enumerate(rows)
+        ]
+
+    async def bulk_update(self, schemas: Sequence[Schema]) -> list[BulkItemResult]:
+        """
+        Apply all changes with a single ``UPDATE ... FROM (VALUES ...) RETURNING``.
+
+        Items whose new value would collide with another row on a unique
+        column are filtered out inside the statement and reported as
+        conflicts instead of aborting the whole batch.
+        """
+        results: dict[int, BulkItemResult] = {}
+        pending: dict[UUID, tuple[int, dict]] = {}
+        table = self.model.__table__
+        unique_columns = self._unique_columns()
+        seen = {c.key: set() for c in unique_columns}
+        for index, schema in enumerate(schemas):
+            row = schema.model_dump()
+            duplicate = row["id"] in pending or any(
+                row.get(c.key) in seen[c.key] for c in unique_columns
+            )
+            if duplicate:
+                results[index] = BulkItemResult(
+                    index=index,
+                    status=BulkItemStatus.CONFLICT,
+                    id=row["id"],
+                    error="Duplicate entry in batch.",
+                )
+                continue
+            for c in unique_columns:
+                seen[c.key].add(row.get(c.key))
+            pending[row["id"]] = (index, row)
+        if pending:
+            keys = list(next(iter(pending.values()))[1])
+            source = values(
+                *(column(key, table.c[key].type) for key in keys),
+                name="source",
+            ).data([tuple(row[key] for key in keys) for _, row in pending.values()])
+            clash = self.model.__table__.alias("clash")
+            query = (
+                self._live(update(self.model))
+                .where(self.model.id == cast(source.c.id, table.c.id.type))
+                .values(
+                    {
+                        key: cast(source.c[key], table.c[key].type)
+                        for key in keys
+                        if key != "id"
+                    }
+                )
+                .returning(self.model)
+                .execution_options(synchronize_session=False)
+            )
+            for c in unique_columns:
+                conflict = exists().where(
+                    clash.c[c.key] == cast(source.c[c.key], c.type),
+                    clash.c.id != self.model.id,
+                )
+                if self.soft_delete:
+                    conflict = conflict.where(clash.c.deleted_at.is_(None))
+                query = query.where(~conflict)
+            result = await self.session.scalars(query)
+            updated = {instance.id: instance for instance in result.all()}
+            missing = [uuid for uuid in pending if uuid not in updated]
+            existing = set()
+            if missing:
+                existing = set(
+                    await self.session.scalars(
+                        self._live(select(self.model.id)).where(
+                            self.model.id == any_(self._uuid_array(missing))
+                        )
+                    )
+                )
+            for uuid, (index, _) in pending.items():
+                if uuid in updated:
+                    results[index] = BulkItemResult(
+                        index=index,
+                        status=BulkItemStatus.UPDATED,
+                        id=uuid,
+                        data=updated[uuid],
+                    )
+                elif uuid in existing:
+                    results[index] = BulkItemResult(
+                        index=index,
+                        status=BulkItemStatus.CONFLICT,
+                        id=uuid,
+                        error="Duplicate entry.",
+                    )
+                else:
+                    results[index] = BulkItemResult(
+                        index=index,
+                        status=BulkItemStatus.NOT_FOUND,
+                        id=uuid,
+                        error="Not found.",
+                    )
+        return [results[index] for index in sorted(results)]
+
+    async def bulk_delete(self, uuids: Sequence[UUID]) -> list[BulkItemResult]:
+        """
+        Delete all rows with a single ``DELETE ... WHERE id = ANY(...) RETURNING``,
+        or ``UPDATE`` marking them deleted with soft delete.
+        """
+        if not uuids:
+            return []
+        query = self._delete_query(
+            self.model.id == any_(self._uuid_array(uuids))
+        ).returning(self.model.id)
+        deleted = set(await self.session.scalars(query))
+        return [
+            BulkItemResult(index=index, status=BulkItemStatus.DELETED, id=uuid)
+            if uuid in deleted
+            else BulkItemResult(
+                index=index,
+                status=BulkItemStatus.NOT_FOUND,
+                id=uuid,
+                error="Not found.",
+            )
+            for index, uuid in enumerate(uuids)
+        ]
+
+    async def copy_import(
+        self,
+        chunks: AsyncIterator[Sequence[tuple[int, Schema]]],
+        policy: ImportConflictPolicy,
+        max_reported: int = 1000,
+    ) -> ImportResult:
+        """
+        Load ``(row, schema)`` chunks with ``COPY`` into a staging table, then merge.
+
+        The staging table lives for the transaction only. The merge is a single
+        ``INSERT ... SELECT DISTINCT ON (key) ... ON CONFLICT (key)`` on the
+        first unique column, so duplicates inside the file collapse to one row:
+        the first one is kept, or the last one with the overwrite policy.
+        """
+        table = self.model.__table__
+        key = self._unique_columns()[0].name
+        defaults = {
+            c.name: c.default.arg
+            for c in table.columns
+            if c.default is not None and c.default.is_scalar
+        }
+        result = ImportResult()
+        connection = await self.session.connection()
+        quote = connection.dialect.identifier_preparer.quote
+        target, staging = quote(table.name), quote(f"{table.name}_import")
+        live, conflict_target = "", f"({quote(key)})"
+        if self.soft_delete:
+            # The unique index on the key only covers rows not deleted.
+            live = " AND deleted_at IS NULL"
+            conflict_target += " WHERE deleted_at IS NULL"
+        processors = {
+            c.name: c.type.bind_processor(connection.dialect) for c in table.columns
+        }
+        await connection.execute(
+            text(
+                f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS, "
+                "import_row bigint NOT NULL) ON COMMIT DROP"
+            )
+        )
+        raw = (await connection.get_raw_connection()).driver_connection
+        columns: list[str] = []
+        staged = 0
+        async for chunk in chunks:
+            records = []
+            for row, schema in chunk:
+                data = {"id": uuid4(), **schema.model_dump()}
+                for name, value in data.items():
+                    if value is None and name in defaults:
+                        data[name] = defaults[name]
+                    if processors.get(name) is not None:
+                        data[name] = processors[name](data[name])
+                if not columns:
+                    columns = list(data)
+                records.append((row, *(data[name] for name in columns)))
+            await raw.copy_records_to_table(
+                f"{table.name}_import",
+                records=records,
+                columns=["import_row", *columns],
+            )
+            staged += len(records)
+        if not staged:
+            return result
+
+        await connection.execute(text(f"ANALYZE {staging}"))
+        if policy is ImportConflictPolicy.REPORT:
+            conflicts = await connection.execute(
+                text(
+                    f"SELECT import_row, {quote(key)} FROM ("
+                    f"SELECT import_row, {quote(key)}, row_number() OVER "
+                    f"(PARTITION BY {quote(key)} ORDER BY import_row) AS position "
+                    f"FROM {staging}) AS staged "
+                    f"WHERE position > 1 OR EXISTS (SELECT 1 FROM {target} "
+                    f"WHERE {target}.{quote(key)} = staged.{quote(key)}{live}) "
+                    "ORDER BY import_row LIMIT :max_reported"
+                ),
+                {"max_reported": max_reported},
+            )
+            result.conflicts = [
+                ImportRowError(row=row, name=name, error="Duplicate entry.")
+                for row, name in conflicts
+            ]
+
+        names = ", ".join(quote(name) for name in columns)
+        if policy is ImportConflictPolicy.OVERWRITE:
+            order = "import_row DESC"
+            assignments = ", ".join(
+                f"{quote(name)} = EXCLUDED.{quote(name)}"
+                for name in columns
+                if name not in ("id", key)
+            )
+            on_conflict = (
+                f"DO UPDATE SET {assignments}, updated_at = now(), "
+                f"version = {target}.version + 1"
+            )
+        else:
+            order = "import_row"
+            on_conflict = "DO NOTHING"
+        merged = await connection.execute(
+            text(
+                f"WITH merged AS (INSERT INTO {target} ({names}) "
+                f"SELECT DISTINCT ON ({quote(key)}) {names} FROM {staging} "
+                f"ORDER BY {quote(key)}, {order} "
+                f"ON CONFLICT {conflict_target} {on_conflict} "
+                "RETURNING (xmax = 0) AS inserted) "
+                "SELECT count(*) FILTER (WHERE inserted), "
+                "count(*) FILTER (WHERE NOT inserted) FROM merged"
+            )
+        )
+        result.inserted, result.updated = merged.one()
+        result.skipped = staged - result.inserted - result.updated
+        return result
+
+    def _unique_columns(self) -> list:
+        """Columns unique on their own, by constraint or (partial) unique index."""
+        table = self.model.__table__
+        columns = [c for c in table.columns if c.unique and not c.primary_key]
+        for index in table.indexes:
+            if index.unique and len(index.columns) == 1:
+                (indexed,) = index.columns
+                if not indexed.primary_key and indexed not in columns:
+                    columns.append(indexed)
+        return columns
+
+    def _uuid_array(self, uuids: Sequence[UUID]):
+        return bindparam(
+            "uuids", value=list(uuids), type_=ARRAY(self.model.__table__.c.id.type)
+        )
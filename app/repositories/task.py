@@ -1,10 +1,104 @@
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import Float, func, literal, literal_column, select, tuple_
+from sqlalchemy.exc import ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.task import Task
+from app.config.instrumentation import traced
+from app.models.task import SEARCH_CONFIG, Task, TaskTombstone
+from app.schemas.pagination import Cursor
 from .base import BaseRepository
 
 
+@traced
 class TaskRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
         super().__init__(session=session, model=Task)
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        fuzzy: bool = False,
+    ) -> tuple[Sequence[Task], str | None]:
+        """
+        Return tasks matching ``query``, best first, keyset-paginated on
+        ``(score, id)``.
+
+        Full-text mode matches ``websearch_to_tsquery`` against the GIN-indexed
+        ``search_vector`` (name weighted above description); fuzzy mode ranks
+        by ``pg_trgm`` similarity on ``name`` and needs ``ix_tasks_name_trgm``.
+        """
+        if fuzzy:
+            sort = "similarity"
+            score = func.similarity(Task.name, query)
+            condition = Task.name.bool_op("%")(query)
+        else:
+            sort = "rank"
+            tsquery = func.websearch_to_tsquery(
+                literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query
+            )
+            score = func.ts_rank_cd(Task.search_vector, tsquery)
+            condition = Task.search_vector.bool_op("@@")(tsquery)
+        statement = (
+            self._live(select(Task, score.label("score")))
+            .where(condition)
+            .order_by(score.desc(), Task.id.desc())
+        )
+        if cursor is not None:
+            try:
+                after = Cursor.decode(cursor)
+                if after.sort != sort:
+                    raise ValueError("Cursor belongs to another search mode.")
+                value = float(after.value)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor.",
+                )
+            statement = statement.where(
+                tuple_(score, Task.id) < tuple_(literal(value, Float), after.id)
+            )
+        try:
+            result = await self.session.execute(statement.limit(limit + 1))
+            rows = result.all()
+        except ProgrammingError:
+            if not fuzzy:
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Fuzzy search is not available.",
+            )
+        items = [task for task, _ in rows[:limit]]
+        if len(rows) <= limit:
+            return items, None
+        last, last_score = rows[limit - 1]
+        return items, Cursor.after(sort=sort, value=last_score, id=last.id).encode()
+
+    async def get_tombstones(
+        self,
+        limit: int,
+        after: Cursor | None = None,
+        before: datetime | None = None,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Deleted task ids in ``(deleted_at, id)`` order, after the position of
+        ``after`` and deleted before ``before``, and whether more follow.
+        """
+        statement = select(TaskTombstone.id, TaskTombstone.deleted_at).order_by(
+            TaskTombstone.deleted_at, TaskTombstone.id
+        )
+        if after is not None:
+            statement = statement.where(
+                tuple_(TaskTombstone.deleted_at, TaskTombstone.id)
+                > tuple_(datetime.fromisoformat(after.value), after.id)
+            )
+        if before is not None:
+            statement = statement.where(TaskTombstone.deleted_at < before)
+        result = await self.session.execute(statement.limit(limit + 1))
+        rows = [dict(row) for row in result.mappings()]
+        return rows[:limit], len(rows) > limit
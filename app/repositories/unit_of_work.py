@@ -0,0 +1,35 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """
+    The single transaction of a request.
+
+    Repositories sharing the session only execute statements; the service
+    commits once, after the whole operation succeeded and before the
+    response is sent. Requests that only read never commit: their
+    transaction is rolled back when the session is released.
+
+    Sessions check a connection out of the pool on their first statement
+    only; ``release`` hands it back as soon as the work is over rather than
+    when the request ends, so slow clients and non-database work inside a
+    handler do not hold a pool slot.
+    """
+
+    def __init__(self, session: AsyncSession, read_session: AsyncSession | None = None):
+        self.session = session
+        self.read_session = read_session
+
+    async def commit(self) -> None:
+        if self.session.in_transaction():
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        if self.session.in_transaction():
+            await self.session.rollback()
+
+    async def release(self) -> None:
+        """Close the sessions; loaded objects stay usable, detached."""
+        await self.session.close()
+        if self.read_session is not None and self.read_session is not self.session:
+            await self.read_session.close()
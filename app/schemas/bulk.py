@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+TItem = TypeVar("TItem")
+
+BULK_MAX_ITEMS = 1000
+
+
+class BulkItemStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CONFLICT = "conflict"
+    NOT_FOUND = "not_found"
+
+
+class BulkItemResult(BaseModel, Generic[TItem]):
+    index: int = Field(..., description="Position of the item in the request.")
+    status: BulkItemStatus = Field(..., description="Outcome for this item.")
+    id: UUID | None = Field(default=None, description="Affected task id.")
+    data: TItem | None = Field(default=None, description="Resulting task.")
+    error: str | None = Field(default=None, description="Why the item failed.")
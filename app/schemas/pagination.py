@@ -1,12 +1,55 @@
-from pydantic import BaseModel
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
 from typing import TypeVar, Generic, Sequence
 
 TListItem = TypeVar("TListItem")
 
 
+class Cursor(BaseModel):
+    """Position of the last returned row in ``(<sort column>, id)`` order."""
+
+    sort: str = "created_at"
+    value: str
+    id: UUID
+
+    @classmethod
+    def after(cls, sort: str, value: object, id: UUID) -> "Cursor":
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return cls(sort=sort, value=str(value), id=id)
+
+    def encode(self) -> str:
+        payload = self.model_dump_json().encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        try:
+            payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            return cls.model_validate(json.loads(payload))
+        except (ValueError, ValidationError) as exc:
+            raise ValueError("Invalid cursor.") from exc
+
+
+class TotalMode(str, Enum):
+    """How ``pagination.total`` is computed when requested."""
+
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    CACHED = "cached"
+
+
 class PaginationResponse(BaseModel):
-    offset: int
+    offset: int | None = None
     limit: int
+    next_cursor: str | None = None
+    total: int | None = None
+    total_mode: TotalMode | None = None
 
 
 class ListPaginationResponse(BaseModel, Generic[TListItem]):
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+
+
+class PoolStatusSchema(BaseModel):
+    size: int = Field(..., description="Configured number of persistent connections.")
+    checked_in: int = Field(..., description="Idle connections in the pool.")
+    checked_out: int = Field(..., description="Connections currently in use.")
+    overflow: int = Field(..., description="Connections open beyond `size`.")
+    max_overflow: int
+    checkouts: int = Field(..., description="Successful checkouts so far.")
+    timeouts: int = Field(..., description="Checkouts that hit the pool timeout.")
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_seconds_buckets: dict[str, int] = Field(
+        ..., description="Cumulative checkout latency histogram by upper bound."
+    )
@@ -3,6 +3,8 @@ from enum import Enum
 from uuid import UUID
 from datetime import datetime
 
+from app.schemas.pagination import Cursor, TotalMode
+
 
 class TaskStatus(str, Enum):
     CREATED = "Created"
@@ -27,6 +29,58 @@ class TaskRequestSchema(TaskBaseSchema):
     )
 
 
+class TaskSortKey(str, Enum):
+    CREATED_AT = "created_at"
+    CREATED_AT_DESC = "-created_at"
+    UPDATED_AT = "updated_at"
+    UPDATED_AT_DESC = "-updated_at"
+    NAME = "name"
+    NAME_DESC = "-name"
+
+    @property
+    def column(self) -> str:
+        return self.value.removeprefix("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+class TaskListFilterSchema(BaseModel):
+    status: list[TaskStatus] = Field(default_factory=list, description="Any of.")
+    created_after: datetime | None = Field(default=None, description="Inclusive.")
+    created_before: datetime | None = Field(default=None, description="Exclusive.")
+    updated_after: datetime | None = Field(default=None, description="Inclusive.")
+    updated_before: datetime | None = Field(default=None, description="Exclusive.")
+    name_prefix: str | None = Field(
+        default=None, description="Task name prefix", min_length=1, max_length=255
+    )
+    sort: TaskSortKey = Field(default=TaskSortKey.CREATED_AT, description="Sort key.")
+
+
+class TaskListQuerySchema(TaskListFilterSchema):
+    limit: int = Field(..., ge=1, le=1000)
+    offset: int = Field(default=0, ge=0)
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor from `pagination.next_cursor`; overrides offset.",
+    )
+    include_total: TotalMode | None = Field(
+        default=None,
+        description="Return `pagination.total`: exact, planner estimate or cached.",
+    )
+
+    @property
+    def filters(self) -> TaskListFilterSchema:
+        return TaskListFilterSchema.model_validate(
+            self.model_dump(include=set(TaskListFilterSchema.model_fields))
+        )
+
+
+class TaskBulkUpdateSchema(TaskRequestSchema):
+    id: UUID = Field(..., description="Id of the task to update.")
+
+
 class TaskUpdateSchema(TaskBaseSchema):
     name: str | None = Field(..., description="Task name")
     description: str | None = Field(..., description="Task description")
@@ -36,6 +90,12 @@ class TaskUpdateSchema(TaskBaseSchema):
 class TaskResponseSchema(TaskBaseSchema):
     id: UUID = Field(..., description="Task id.")
     created_at: datetime = Field(..., description="Task creation date.")
+    updated_at: datetime | None = Field(
+        default=None, description="Task last modification date."
+    )
+    version: int | None = Field(
+        default=None, description="Row version, bumped on every update."
+    )
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
@@ -45,3 +105,42 @@ class TaskResponseSchema(TaskBaseSchema):
             "status": "Created",
         },
     )
+
+
+class TaskChangeOperation(str, Enum):
+    INSERT = "INSERT"
+    UPDATE = "UPDATE"
+    DELETE = "DELETE"
+
+
+class TaskChangeSchema(BaseModel):
+    id: UUID = Field(..., description="Task id.")
+    op: TaskChangeOperation = Field(..., description="Kind of change.")
+    updated_at: datetime = Field(
+        ..., description="Task modification date, or deletion date."
+    )
+
+    @property
+    def token(self) -> str:
+        """Resume token: changes after this one in ``(updated_at, id)`` order."""
+        return Cursor.after(
+            sort="updated_at", value=self.updated_at, id=self.id
+        ).encode()
+
+
+class TaskTombstoneSchema(BaseModel):
+    id: UUID = Field(..., description="Id of the deleted task.")
+    deleted_at: datetime = Field(..., description="Task deletion date.")
+
+
+class TaskSyncResponse(BaseModel):
+    items: list[TaskResponseSchema] = Field(
+        ..., description="Tasks created or updated since the token."
+    )
+    deleted: list[TaskTombstoneSchema] = Field(
+        ..., description="Tasks deleted since the token."
+    )
+    next_token: str | None = Field(
+        ..., description="Token of the next sync; unchanged when nothing changed."
+    )
+    has_more: bool = Field(..., description="More changes are ready right away.")
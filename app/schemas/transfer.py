@@ -0,0 +1,42 @@
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class FileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is FileFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+class ImportConflictPolicy(str, Enum):
+    SKIP = "skip"
+    OVERWRITE = "overwrite"
+    REPORT = "report"
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(..., description="1-based data row number in the file.")
+    name: str | None = Field(default=None, description="Task name, if readable.")
+    error: str = Field(..., description="Why the row was not imported.")
+
+
+class ImportResult(BaseModel):
+    received: int = Field(default=0, description="Data rows read from the file.")
+    invalid: int = Field(default=0, description="Rows rejected by validation.")
+    inserted: int = Field(default=0, description="New tasks created.")
+    updated: int = Field(default=0, description="Existing tasks overwritten.")
+    skipped: int = Field(default=0, description="Rows skipped on name conflict.")
+    errors: list[ImportRowError] = Field(
+        default_factory=list,
+        description="Validation errors (truncated).",
+    )
+    conflicts: list[ImportRowError] = Field(
+        default_factory=list,
+        description="Conflicting rows, filled with the report policy (truncated).",
+    )
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import asyncpg
+from pydantic import ValidationError
+
+from app.schemas.task import TaskChangeSchema
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+
+
+class SubscriptionClosed(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Subscription:
+    """
+    Changes for one subscriber, buffered up to ``max_pending``.
+
+    A subscriber that falls that far behind is closed rather than slowing
+    down the others or growing without bound; it resumes from the token of
+    the last change it handled.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self.closed: str | None = None
+        self._pending: deque[TaskChangeSchema] = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, change: TaskChangeSchema) -> None:
+        if self.closed is not None:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.close("overflow")
+            return
+        self._pending.append(change)
+        self._ready.set()
+
+    def close(self, reason: str) -> None:
+        if self.closed is None:
+            self.closed = reason
+            self._ready.set()
+
+    async def next(self, timeout: float | None = None) -> TaskChangeSchema | None:
+        """
+        The next change, ``None`` if none came within ``timeout``.
+
+        Changes received before the subscription was closed are handed out
+        first; ``SubscriptionClosed`` is raised after them.
+        """
+        if not self._pending and self.closed is None:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except TimeoutError:
+                return None
+        if self._pending:
+            return self._pending.popleft()
+        raise SubscriptionClosed(self.closed)
+
+
+class ChangeFeed:
+    """
+    Task changes notified by the ``tasks`` trigger, fanned out in process.
+
+    One dedicated connection per worker ``LISTEN``s on ``task_changes``; it
+    is opened by the first subscriber and kept for the next ones. It is not
+    taken from the pool, and must reach Postgres directly: a transaction
+    mode PgBouncer does not deliver notifications. When it is lost every
+    subscription is closed, and the next subscriber connects again.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        max_pending: int = 1000,
+        connect: Callable[[str], Awaitable[Any]] = asyncpg.connect,
+    ):
+        self.dsn = dsn
+        self.max_pending = max_pending
+        self._connect = connect
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._subscriptions: set[Subscription] = set()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    async def listen(self) -> None:
+        """Open the listening connection unless it is open already."""
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            connection = await self._connect(self.dsn)
+            await connection.add_listener(CHANNEL, self._notify)
+            connection.add_termination_listener(self._terminated)
+            self._connection = connection
+
+    def _notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            change = TaskChangeSchema.model_validate_json(payload)
+        except ValidationError:
+            logger.warning("Ignoring malformed task change: %s", payload)
+            return
+        for subscription in list(self._subscriptions):
+            subscription.push(change)
+
+    def _terminated(self, connection: Any) -> None:
+        if self._connection is not connection:
+            return
+        self._connection = None
+        logger.warning("Change feed connection lost, closing subscriptions.")
+        for subscription in list(self._subscriptions):
+            subscription.close("disconnected")
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[Subscription]:
+        """Subscription to changes committed from now on."""
+        await self.listen()
+        subscription = Subscription(max_pending=self.max_pending)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    async def close(self) -> None:
+        for subscription in list(self._subscriptions):
+            subscription.close("shutdown")
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Mapping, Sequence
+from uuid import UUID
+
+from app.schemas.transfer import FileFormat
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ndjson_chunk(rows: Sequence[Mapping[str, Any]]) -> bytes:
+    lines = (
+        json.dumps({key: _plain(value) for key, value in row.items()}) for row in rows
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _csv_chunk(rows: Sequence[Mapping[str, Any]], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(rows[0].keys())
+    writer.writerows([_plain(value) for value in row.values()] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def encode_rows(
+    chunks: AsyncIterator[Sequence[Mapping[str, Any]]],
+    export_format: FileFormat,
+) -> AsyncIterator[bytes]:
+    """Turn chunks of row mappings into NDJSON or CSV bytes, one write per chunk."""
+    first = True
+    async for rows in chunks:
+        if not rows:
+            continue
+        if export_format is FileFormat.CSV:
+            yield _csv_chunk(rows, header=first)
+        else:
+            yield _ndjson_chunk(rows)
+        first = False
@@ -0,0 +1,94 @@
+import asyncio
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Iterator
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.schemas.task import TaskRequestSchema
+from app.schemas.transfer import FileFormat, ImportRowError
+
+MAX_REPORTED_ERRORS = 1000
+
+_chunk_adapter = TypeAdapter(list[TaskRequestSchema])
+
+
+def _read_records(file: BinaryIO, file_format: FileFormat) -> Iterator[Any]:
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if file_format is FileFormat.CSV:
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as exc:
+            yield exc
+
+
+def _describe(error: ValidationError | ValueError) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+            for item in error.errors()
+        )
+    return f"Malformed record: {error}"
+
+
+def _validate_chunk(
+    records: list[Any], first_row: int, errors: list[ImportRowError]
+) -> tuple[list[tuple[int, TaskRequestSchema]], int]:
+    """Validate a chunk in one pass, falling back to per-row only when it fails."""
+    if not any(isinstance(record, ValueError) for record in records):
+        try:
+            schemas = _chunk_adapter.validate_python(records)
+            return list(enumerate(schemas, start=first_row)), 0
+        except ValidationError:
+            pass
+    valid, invalid = [], 0
+    for row, record in enumerate(records, start=first_row):
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            valid.append((row, TaskRequestSchema.model_validate(record)))
+        except ValueError as exc:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                name = record.get("name") if isinstance(record, dict) else None
+                errors.append(ImportRowError(row=row, name=name, error=_describe(exc)))
+    return valid, invalid
+
+
+class TaskFileReader:
+    """
+    Reads a CSV or NDJSON task file in validated chunks.
+
+    The file is consumed lazily, one chunk at a time, in a worker thread so
+    that parsing never blocks the event loop. Counters and a truncated list
+    of row errors are available once iteration is over.
+    """
+
+    def __init__(self, file: BinaryIO, file_format: FileFormat, chunk_size: int):
+        self._records = _read_records(file=file, file_format=file_format)
+        self.chunk_size = chunk_size
+        self.received = 0
+        self.invalid = 0
+        self.errors: list[ImportRowError] = []
+
+    async def chunks(self) -> AsyncIterator[list[tuple[int, TaskRequestSchema]]]:
+        while True:
+            records = await asyncio.to_thread(
+                lambda: list(islice(self._records, self.chunk_size))
+            )
+            if not records:
+                return
+            valid, invalid = _validate_chunk(
+                records=records, first_row=self.received + 1, errors=self.errors
+            )
+            self.received += len(records)
+            self.invalid += invalid
+            if valid:
+                yield valid
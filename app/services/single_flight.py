@@ -0,0 +1,65 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def shared(self) -> int:
+        """Calls served by another call's execution."""
+        return self.calls - self.executions
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    runs await its outcome, result or exception, instead of running their
+    own. If the running caller is cancelled, one of the waiting callers runs
+    the function again. Nothing is kept once the call is over: this only
+    shares work between calls in flight in this process, it is not a cache.
+    """
+
+    def __init__(self):
+        self.stats: defaultdict[str, SingleFlightStats] = defaultdict(SingleFlightStats)
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    async def do(
+        self, name: str, key: Hashable, function: Callable[[], Awaitable[T]]
+    ) -> T:
+        """``function()``, or the result of the running call for ``(name, key)``."""
+        stats = self.stats[name]
+        stats.calls += 1
+        key = (name, key)
+        while (future := self._calls.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        stats.executions += 1
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved: nobody may be waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
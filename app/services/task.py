@@ -1,13 +1,121 @@
-from typing import Sequence
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, BinaryIO, Sequence
+from uuid import UUID
 
+from app.cache.base import CacheBackend, NullCache
 from app.repositories.base import BaseRepository
-from app.schemas.task import TaskRequestSchema
+from app.repositories.unit_of_work import UnitOfWork
+from app.schemas.bulk import BulkItemResult
+from app.schemas.pagination import Cursor, PaginationResponse, TotalMode
+from app.schemas.task import (
+    TaskBulkUpdateSchema,
+    TaskChangeOperation,
+    TaskChangeSchema,
+    TaskListFilterSchema,
+    TaskRequestSchema,
+    TaskResponseSchema,
+    TaskSortKey,
+)
+from app.schemas.transfer import FileFormat, ImportConflictPolicy, ImportResult
+from app.services.export import encode_rows
+from app.services.importer import MAX_REPORTED_ERRORS, TaskFileReader
+from app.services.single_flight import SingleFlight
 from app.models.task import Task
 
 
+def _cache_key(task_uuid: str | UUID) -> str | None:
+    try:
+        return f"task:{UUID(str(task_uuid))}"
+    except ValueError:
+        return None
+
+
+_LIST_COLUMNS = tuple(TaskResponseSchema.model_fields)
+
+
+def _count_key(filters: TaskListFilterSchema | None) -> str:
+    payload = filters.model_dump_json(exclude={"sort"}) if filters else ""
+    return f"count:{hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()}"
+
+
 class TaskService:
-    def __init__(self, repository: BaseRepository):
+    def __init__(
+        self,
+        repository: BaseRepository,
+        cache: CacheBackend | None = None,
+        count_ttl: float | None = None,
+        reader: BaseRepository | None = None,
+        unit_of_work: UnitOfWork | None = None,
+        single_flight: SingleFlight | None = None,
+        read_your_writes: bool = False,
+    ):
         self.repository = repository
+        self.unit_of_work = unit_of_work
+        self.single_flight = single_flight
+        self.read_your_writes = read_your_writes
+        self.cache = cache if cache is not None else NullCache()
+        self.count_ttl = count_ttl
+        self._reader = reader
+        self._wrote = False
+
+    @property
+    def reader(self) -> BaseRepository:
+        """
+        Repository for read-only methods: a replica unless this service has
+        already written, in which case reads stay on the primary to see it.
+        """
+        if self._wrote or self._reader is None:
+            return self.repository
+        return self._reader
+
+    @property
+    def writer(self) -> BaseRepository:
+        """Repository for writes; pins later reads of this service to the primary."""
+        self._wrote = True
+        return self.repository
+
+    @property
+    def _reads_primary(self) -> bool:
+        """Whether ``reader`` reads from the primary rather than a replica."""
+        return getattr(self.reader, "session", None) is getattr(
+            self.repository, "session", None
+        )
+
+    async def _shared_read(self, name: str, key: tuple, read):
+        """
+        ``read()``, shared with concurrent identical reads of other requests.
+
+        Reads from a replica are only shared with callers that may read from
+        one too; a caller pinned to the primary shares primary reads only.
+        A service that has written reads alone, as it may see its own
+        uncommitted changes, and so does one serving a client that wrote
+        recently (``read_your_writes``): a read in flight may have started
+        before that write committed.
+        """
+        if self.single_flight is None or self._wrote or self.read_your_writes:
+            return await read()
+        return await self.single_flight.do(name, (self._reads_primary, *key), read)
+
+    @asynccontextmanager
+    async def _work(self, commit: bool = False) -> AsyncIterator[None]:
+        """
+        Database work of one service call: committed on success when
+        ``commit`` is set, and always released to the pool on exit.
+        """
+        try:
+            yield
+            if commit and self.unit_of_work is not None:
+                await self.unit_of_work.commit()
+        finally:
+            if self.unit_of_work is not None:
+                await self.unit_of_work.release()
+
+    async def _invalidate(self, *task_uuids: str | UUID) -> None:
+        keys = [key for key in map(_cache_key, task_uuids) if key is not None]
+        await self.cache.delete(*keys)
 
     async def create_task(self, schema: TaskRequestSchema) -> Task:
         """
@@ -17,16 +125,358 @@ class TaskService:
                  - "status"
             :return: <class 'app.models.task.Task'>
         """
-        return await self.repository.create(schema=schema)
+        async with self._work(commit=True):
+            task = await self.writer.create(schema=schema)
+        await self._invalidate(task.id)
+        return task
+
+    async def get_task_by_id(self, task_uuid: str) -> TaskResponseSchema:
+        """
+        Read-through lookup: served from the cache when possible, otherwise
+        loaded from the database and cached for ``cache_ttl_seconds``. Only
+        rows read from the primary are cached: a lagging replica could put a
+        version back that a write has just invalidated.
+        """
+        key = _cache_key(task_uuid)
+        if key is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return TaskResponseSchema.model_validate_json(cached)
+
+        async def load() -> TaskResponseSchema:
+            async with self._work():
+                on_primary = self._reads_primary
+                task = await self.reader.get_by_uuid(uuid=task_uuid)
+            schema = TaskResponseSchema.model_validate(task)
+            if key is not None and on_primary:
+                await self.cache.set(key, schema.model_dump_json().encode())
+            return schema
+
+        return await self._shared_read("get_task_by_id", (task_uuid,), load)
+
+    async def get_task_list(
+        self,
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: TaskListFilterSchema | None = None,
+        total_mode: TotalMode | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None, int | None]:
+        """
+        Items are plain dicts of the ``TaskResponseSchema`` columns.
+
+        ``total_mode`` selects how the total is obtained: ``exact`` counts in
+        the page query itself, ``estimate`` asks the planner and ``cached``
+        keeps exact per-filter counts for ``count_ttl`` seconds.
+        """
+
+        async def load() -> tuple[list[dict[str, Any]], str | None, int | None]:
+            async with self._work():
+                items, next_cursor, total = await self.reader.get_page(
+                    limit=limit,
+                    offset=offset,
+                    cursor=cursor,
+                    filters=filters,
+                    count=total_mode is TotalMode.EXACT,
+                    columns=_LIST_COLUMNS,
+                )
+                if total_mode is TotalMode.ESTIMATE:
+                    total = await self.reader.estimate_count(filters=filters)
+                elif total_mode is TotalMode.CACHED:
+                    total = await self._cached_count(filters=filters)
+            return items, next_cursor, total
+
+        key = (
+            limit,
+            offset,
+            cursor,
+            filters.model_dump_json() if filters else None,
+            total_mode,
+        )
+        return await self._shared_read("get_task_list", key, load)
+
+    async def stream_task_list(
+        self,
+        limit: int,
+        pagination: PaginationResponse,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: TaskListFilterSchema | None = None,
+        total_mode: TotalMode | None = None,
+        chunk_size: int = 200,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Same page as ``get_task_list``, yielded in chunks of plain dicts.
+
+        ``pagination.next_cursor`` and the ``exact`` total are only known
+        once the items are exhausted; they are filled in then, so the
+        caller writes ``pagination`` after the items.
+        """
+        async with self._work():
+            if total_mode is TotalMode.ESTIMATE:
+                pagination.total = await self.reader.estimate_count(filters=filters)
+            elif total_mode is TotalMode.CACHED:
+                pagination.total = await self._cached_count(filters=filters)
+            count = total_mode is TotalMode.EXACT
+            sent, last, more = 0, None, False
+            async for rows in self.reader.stream_page(
+                limit=limit,
+                columns=_LIST_COLUMNS,
+                offset=offset,
+                cursor=cursor,
+                filters=filters,
+                count=count,
+                chunk_size=chunk_size,
+            ):
+                if count and pagination.total is None:
+                    pagination.total = rows[0].total
+                page = rows[: limit - sent]
+                more = more or len(page) < len(rows)
+                if page:
+                    sent += len(page)
+                    last = page[-1]
+                    yield [dict(zip(_LIST_COLUMNS, row)) for row in page]
+            if more:
+                pagination.next_cursor = self.reader.page_cursor(last, filters)
+            if count and pagination.total is None:
+                pagination.total = (
+                    0
+                    if cursor is None and offset == 0
+                    else await self.reader.count(filters=filters)
+                )
 
-    async def get_task_by_id(self, task_uuid: str) -> Task | None:
-        return await self.repository.get_by_uuid(uuid=task_uuid)
+    async def sync_tasks(
+        self,
+        since: str | None,
+        limit: int,
+        settle_seconds: float = 0,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], str | None, bool]:
+        """
+        Tasks modified and deleted after the change ``since`` points at, at
+        most ``limit`` of them together, the token to sync from next and
+        whether more changes are ready.
+
+        Both are read in ``(updated_at | deleted_at, id)`` order through
+        their indexes and merged, so a sync costs as much as the delta.
+        Changes of the last ``settle_seconds`` are left for the next sync:
+        ``updated_at`` is the start time of its transaction, and a longer
+        transaction still running could commit rows behind the token.
+        Without ``since`` every task is returned, and no deletions.
+        """
+        before = None
+        if settle_seconds:
+            before = datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)
+        filters = TaskListFilterSchema(
+            sort=TaskSortKey.UPDATED_AT, updated_before=before
+        )
+        deleted, more_deleted = [], False
+        async with self._work():
+            items, next_cursor, _ = await self.reader.get_page(
+                limit=limit, cursor=since, filters=filters, columns=_LIST_COLUMNS
+            )
+            if since is not None:
+                deleted, more_deleted = await self.reader.get_tombstones(
+                    limit=limit, after=Cursor.decode(since), before=before
+                )
+        changes = sorted(
+            [(item["updated_at"], item["id"], item, True) for item in items]
+            + [(row["deleted_at"], row["id"], row, False) for row in deleted],
+            key=lambda change: change[:2],
+        )
+        has_more = len(changes) > limit or next_cursor is not None or more_deleted
+        changes = changes[:limit]
+        if not changes:
+            return [], [], since, has_more
+        updated_at, last_id, *_ = changes[-1]
+        token = Cursor.after(sort="updated_at", value=updated_at, id=last_id).encode()
+        return (
+            [row for *_, row, exists in changes if exists],
+            [row for *_, row, exists in changes if not exists],
+            token,
+            has_more,
+        )
+
+    async def changes_since(
+        self, token: str, chunk_size: int = 500, overlap_seconds: float = 0
+    ) -> AsyncIterator[TaskChangeSchema]:
+        """
+        Changes after the change ``token`` points at, in ``(updated_at, id)``
+        order, read ``chunk_size`` at a time.
+
+        Reading starts ``overlap_seconds`` behind the token: a transaction
+        that was still running when the token was handed out commits its
+        rows with an ``updated_at`` behind it. Changes in that window may
+        be delivered again. Rows only tell inserts (version 1) from
+        updates; deletions come from the tombstones.
+        """
+        if overlap_seconds:
+            cursor = Cursor.decode(token)
+            token = Cursor.after(
+                sort=cursor.sort,
+                value=datetime.fromisoformat(cursor.value)
+                - timedelta(seconds=overlap_seconds),
+                id=UUID(int=0),
+            ).encode()
+        has_more = True
+        while has_more:
+            items, deleted, token, has_more = await self.sync_tasks(
+                since=token, limit=chunk_size
+            )
+            changes = [
+                TaskChangeSchema(
+                    id=item["id"],
+                    op=TaskChangeOperation.INSERT
+                    if item["version"] == 1
+                    else TaskChangeOperation.UPDATE,
+                    updated_at=item["updated_at"],
+                )
+                for item in items
+            ] + [
+                TaskChangeSchema(
+                    id=row["id"],
+                    op=TaskChangeOperation.DELETE,
+                    updated_at=row["deleted_at"],
+                )
+                for row in deleted
+            ]
+            for change in sorted(changes, key=lambda c: (c.updated_at, c.id)):
+                yield change
 
-    async def get_task_list(self, offset: int, limit: int) -> Sequence[Task]:
-        return await self.repository.get_list(offset=offset, limit=limit)
+    async def _cached_count(self, filters: TaskListFilterSchema | None) -> int:
+        key = _count_key(filters)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return int(cached)
+        total = await self.reader.count(filters=filters)
+        await self.cache.set(key, str(total).encode(), ttl=self.count_ttl)
+        return total
+
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        cursor: str | None = None,
+        fuzzy: bool = False,
+    ) -> tuple[Sequence[Task], str | None]:
+
+        async def load() -> tuple[Sequence[Task], str | None]:
+            async with self._work():
+                return await self.reader.search(
+                    query=query, limit=limit, cursor=cursor, fuzzy=fuzzy
+                )
+
+        return await self._shared_read(
+            "search_tasks", (query, limit, cursor, fuzzy), load
+        )
+
+    async def export_tasks(
+        self, export_format: FileFormat, chunk_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        async with self._work():
+            async for chunk in encode_rows(
+                chunks=self.reader.stream_rows(chunk_size=chunk_size),
+                export_format=export_format,
+            ):
+                yield chunk
+
+    async def import_tasks(
+        self,
+        file: BinaryIO,
+        file_format: FileFormat,
+        policy: ImportConflictPolicy,
+        chunk_size: int = 10000,
+    ) -> ImportResult:
+        reader = TaskFileReader(
+            file=file, file_format=file_format, chunk_size=chunk_size
+        )
+        async with self._work(commit=True):
+            result = await self.writer.copy_import(
+                chunks=reader.chunks(),
+                policy=policy,
+                max_reported=MAX_REPORTED_ERRORS,
+            )
+        if result.updated:
+            await self.cache.clear()
+        result.received = reader.received
+        result.invalid = reader.invalid
+        result.errors = reader.errors
+        return result
 
     async def delete_task(self, task_uuid: str) -> None:
-        return await self.repository.delete(uuid=task_uuid)
+        async with self._work(commit=True):
+            await self.writer.delete(uuid=task_uuid)
+        await self._invalidate(task_uuid)
+
+    async def restore_task(self, task_uuid: str) -> Task:
+        async with self._work(commit=True):
+            task = await self.writer.restore(uuid=task_uuid)
+        await self._invalidate(task_uuid)
+        return task
+
+    async def purge_deleted_tasks(
+        self,
+        retention_seconds: float,
+        batch_size: int = 1000,
+        pause_seconds: float = 0,
+        max_batches: int | None = None,
+    ) -> int:
+        """
+        Hard-delete tasks soft-deleted more than ``retention_seconds`` ago.
+
+        Each batch of at most ``batch_size`` rows is its own short
+        transaction, followed by ``pause_seconds`` of sleep, so that locks
+        stay brief and replicas and autovacuum keep up with the dead rows.
+        Stops after a partial batch or ``max_batches``; returns the number
+        of tasks purged.
+        """
+        deleted_before = datetime.now(timezone.utc) - timedelta(
+            seconds=retention_seconds
+        )
+        purged = batches = 0
+        while max_batches is None or batches < max_batches:
+            async with self._work(commit=True):
+                count = await self.writer.purge_deleted(
+                    deleted_before=deleted_before, limit=batch_size
+                )
+            purged += count
+            batches += 1
+            if count < batch_size:
+                break
+            await asyncio.sleep(pause_seconds)
+        return purged
+
+    async def update_task(
+        self,
+        task_uuid: str,
+        schema: TaskRequestSchema,
+        versions: Sequence[int] | None = None,
+    ) -> Task:
+        async with self._work(commit=True):
+            task = await self.writer.update(
+                uuid=task_uuid, schema=schema, versions=versions
+            )
+        await self._invalidate(task_uuid)
+        return task
+
+    async def bulk_create_tasks(
+        self, schemas: Sequence[TaskRequestSchema]
+    ) -> list[BulkItemResult]:
+        async with self._work(commit=True):
+            results = await self.writer.bulk_create(schemas=schemas)
+        return results
+
+    async def bulk_update_tasks(
+        self, schemas: Sequence[TaskBulkUpdateSchema]
+    ) -> list[BulkItemResult]:
+        async with self._work(commit=True):
+            results = await self.writer.bulk_update(schemas=schemas)
+        await self._invalidate(*(schema.id for schema in schemas))
+        return results
 
-    async def update_task(self, task_uuid: str, schema: TaskRequestSchema) -> Task:
-        return await self.repository.update(uuid=task_uuid, schema=schema)
+    async def bulk_delete_tasks(
+        self, task_uuids: Sequence[UUID]
+    ) -> list[BulkItemResult]:
+        async with self._work(commit=True):
+            results = await self.writer.bulk_delete(uuids=task_uuids)
+        await self._invalidate(*task_uuids)
+        return results
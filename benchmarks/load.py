@@ -0,0 +1,331 @@
+"""
+Throughput and latency of the task API under concurrent load.
+
+Seeds ``--tasks`` tasks through the bulk endpoint, then runs one phase per
+operation (create, get, list, update, delete), each sending ``--requests``
+requests from ``--concurrency`` workers. Every phase reports requests per
+second, p50/p95/p99 latency and the database round trips per request.
+
+By default the app runs in process behind an ASGI transport and talks to
+the database in ``DATABASE_URL``, e.g. the Postgres container of
+``docker-compose up -d postgres``; round trips are counted from engine
+events. With ``--url`` a running server is loaded over HTTP instead and
+round trips are not reported.
+
+    python -m benchmarks.load --tasks 1000 --requests 2000 --concurrency 32
+    python -m benchmarks.load --save benchmarks/baseline.json
+    python -m benchmarks.load --baseline benchmarks/baseline.json
+
+With ``--baseline`` the run exits with status 1 when a phase got slower or
+heavier on the database than the saved one allows.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncContextManager, AsyncIterator, Awaitable, Callable
+from uuid import uuid4
+
+import httpx
+
+PHASES = ("create", "get", "list", "update", "delete")
+BULK_CHUNK = 500
+
+
+@dataclass
+class PhaseResult:
+    requests: int
+    errors: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    round_trips: float | None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def summarize(
+    latencies: list[float], errors: int, elapsed: float, round_trips: int | None
+) -> PhaseResult:
+    count = len(latencies)
+    return PhaseResult(
+        requests=count,
+        errors=errors,
+        rps=round(count / elapsed, 1) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 2),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 2),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 2),
+        round_trips=(
+            round(round_trips / count, 2) if round_trips is not None and count else None
+        ),
+    )
+
+
+def compare(
+    results: dict[str, PhaseResult], baseline: dict, tolerance: float
+) -> list[str]:
+    """
+    Regressions of ``results`` against a saved run.
+
+    A phase regresses when its throughput drops or its p95 latency grows by
+    more than ``tolerance``, or when it needs more round trips per request.
+    """
+    regressions = []
+    for phase, result in results.items():
+        saved = baseline.get("phases", {}).get(phase)
+        if saved is None:
+            continue
+        if result.rps < saved["rps"] * (1 - tolerance):
+            regressions.append(f"{phase}: {result.rps} req/s < {saved['rps']} req/s")
+        if result.p95_ms > saved["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{phase}: p95 {result.p95_ms} ms > {saved['p95_ms']} ms"
+            )
+        if (
+            result.round_trips is not None
+            and saved.get("round_trips") is not None
+            and result.round_trips > saved["round_trips"]
+        ):
+            regressions.append(
+                f"{phase}: {result.round_trips} round trips"
+                f" > {saved['round_trips']} per request"
+            )
+    return regressions
+
+
+class RoundTripCounter:
+    """Counts statements and transaction ends sent by the app's engines."""
+
+    def __init__(self, engines) -> None:
+        from sqlalchemy import event
+
+        self.count = 0
+        for engine in engines:
+            for name in ("before_cursor_execute", "commit", "rollback"):
+                event.listen(engine.sync_engine, name, self._increment)
+
+    def _increment(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+@asynccontextmanager
+async def in_process_client() -> AsyncIterator[
+    tuple[httpx.AsyncClient, RoundTripCounter]
+]:
+    from app.config.database import database
+    from app.container import container
+    from app.main import create_production_app
+
+    counter = RoundTripCounter(database.engines)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_production_app()),
+        base_url="http://benchmark",
+    ) as client:
+        yield client, counter
+    await container.close()
+
+
+@asynccontextmanager
+async def http_client(
+    url: str, concurrency: int
+) -> AsyncIterator[tuple[httpx.AsyncClient, None]]:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        yield client, None
+
+
+def task_payload(prefix: str, number: int) -> dict:
+    return {
+        "name": f"{prefix} {number}",
+        "description": "Pick up the parcel at the depot and deliver it.",
+        "status": "Created",
+    }
+
+
+async def seed(client: httpx.AsyncClient, prefix: str, count: int) -> list[str]:
+    """Ids of the tasks created; items the bulk endpoint rejected are left out."""
+    ids = []
+    for start in range(0, count, BULK_CHUNK):
+        payload = [
+            task_payload(prefix, number)
+            for number in range(start, min(start + BULK_CHUNK, count))
+        ]
+        response = await client.post("/api/tasks/bulk", json=payload)
+        response.raise_for_status()
+        ids.extend(
+            item["id"] for item in response.json()["data"] if item["id"] is not None
+        )
+    return ids
+
+
+async def run_phase(
+    send: Callable[[int], Awaitable[httpx.Response]],
+    requests: int,
+    concurrency: int,
+    counter: RoundTripCounter | None,
+) -> PhaseResult:
+    latencies: list[float] = []
+    errors = 0
+    numbers = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for number in numbers:
+            start = time.perf_counter()
+            try:
+                response = await send(number)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    before = counter.count if counter else 0
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    round_trips = counter.count - before if counter else None
+    return summarize(latencies, errors, elapsed, round_trips)
+
+
+async def run(
+    args: argparse.Namespace,
+    client_factory: AsyncContextManager | None = None,
+) -> dict[str, PhaseResult]:
+    """
+    Every phase of ``args.phases`` against a fresh set of tasks.
+
+    Task names are unique per run and per phase, so that creates and
+    updates never hit the unique name of a task from this or a former run.
+    ``client_factory`` defaults to the client ``args`` ask for.
+    """
+    if client_factory is None:
+        client_factory = (
+            http_client(args.url, args.concurrency) if args.url else in_process_client()
+        )
+    run_id = uuid4().hex[:8]
+    async with client_factory as (client, counter):
+        seeded = await seed(client, f"Benchmark {run_id} seed", args.tasks)
+        if not seeded:
+            raise RuntimeError("No task could be seeded.")
+        created: list[str] = []
+
+        async def create(number: int) -> httpx.Response:
+            response = await client.post(
+                "/api/tasks/", json=task_payload(f"Benchmark {run_id} create", number)
+            )
+            if response.status_code == 201:
+                created.append(response.json()["data"]["id"])
+            return response
+
+        async def get(number: int) -> httpx.Response:
+            return await client.get(f"/api/tasks/{random.choice(seeded)}")
+
+        async def get_list(number: int) -> httpx.Response:
+            offset = random.randrange(max(len(seeded) - args.page_size, 1))
+            return await client.get(
+                "/api/tasks", params={"limit": args.page_size, "offset": offset}
+            )
+
+        async def update(number: int) -> httpx.Response:
+            task_id = random.choice(seeded)
+            return await client.patch(
+                f"/api/tasks/{task_id}",
+                json=task_payload(f"Benchmark {run_id} update", number),
+            )
+
+        async def delete(number: int) -> httpx.Response:
+            return await client.delete(f"/api/tasks/{created[number]}")
+
+        senders = {
+            "create": create,
+            "get": get,
+            "list": get_list,
+            "update": update,
+            "delete": delete,
+        }
+        results = {}
+        for phase in args.phases:
+            requests = args.requests
+            if phase == "delete":
+                requests = min(requests, len(created))
+            results[phase] = await run_phase(
+                senders[phase], requests, args.concurrency, counter
+            )
+        return results
+
+
+def report(results: dict[str, PhaseResult]) -> None:
+    print(
+        f"{'phase':<8}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'trips':>8}"
+    )
+    for phase, result in results.items():
+        trips = "-" if result.round_trips is None else f"{result.round_trips:.2f}"
+        print(
+            f"{phase:<8}{result.requests:>10}{result.errors:>8}{result.rps:>10.1f}"
+            f"{result.p50_ms:>10.2f}{result.p95_ms:>10.2f}{result.p99_ms:>10.2f}"
+            f"{trips:>8}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--url", help="Load a running server instead.")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=PHASES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Compare with saved results.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = await run(args)
+    report(results)
+
+    if args.save:
+        document = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "settings": {
+                "mode": "http" if args.url else "asgi",
+                "tasks": args.tasks,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "page_size": args.page_size,
+            },
+            "phases": {phase: asdict(result) for phase, result in results.items()},
+        }
+        args.save.write_text(json.dumps(document, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
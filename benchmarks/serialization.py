@@ -0,0 +1,102 @@
+"""
+Rows/s of the task list response, before and after the fast path.
+
+``orm`` is the previous path: ORM instances wrapped in ``ApiResponse``,
+validated again by FastAPI against ``response_model`` and encoded with
+``jsonable_encoder`` and ``json.dumps``. ``fast`` is the current one: row
+tuples turned into dicts and encoded once by ``json_response``.
+
+    python -m benchmarks.serialization --rows 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import json_response
+from app.models.task import Task
+from app.schemas.base import ApiResponse
+from app.schemas.pagination import ListPaginationResponse, PaginationResponse
+from app.schemas.task import TaskResponseSchema, TaskStatus
+
+COLUMNS = tuple(TaskResponseSchema.model_fields)
+ResponseModel = ApiResponse[ListPaginationResponse[TaskResponseSchema]]
+
+
+def make_rows(count: int) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    values = {
+        "name": "Deliver parcel",
+        "description": "Pick up the parcel at the depot and deliver it. " * 8,
+        "status": TaskStatus.IN_PROGRESS,
+        "created_at": now,
+        "updated_at": now,
+        "version": 1,
+    }
+    return [
+        tuple(uuid4() if name == "id" else values[name] for name in COLUMNS)
+        for _ in range(count)
+    ]
+
+
+async def encode_orm(rows: list[tuple], field) -> bytes:
+    tasks = [Task(**dict(zip(COLUMNS, row))) for row in rows]
+    content = ResponseModel(
+        data=ListPaginationResponse(
+            items=tasks, pagination=PaginationResponse(limit=len(rows))
+        )
+    )
+    encoded = await serialize_response(
+        field=field, response_content=content, is_coroutine=True
+    )
+    return JSONResponse(encoded).body
+
+
+async def encode_fast(rows: list[tuple]) -> bytes:
+    items = [dict(zip(COLUMNS, row)) for row in rows]
+    content = ApiResponse.model_construct(
+        data=ListPaginationResponse.model_construct(
+            items=items, pagination=PaginationResponse(limit=len(rows))
+        ),
+        meta={},
+        errors=[],
+    )
+    return json_response(content).body
+
+
+async def measure(encode, rows: list[tuple], repeat: int) -> float:
+    await encode(rows)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await encode(rows)
+    return len(rows) * repeat / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    field = create_model_field(
+        name="response", type_=ResponseModel, mode="serialization"
+    )
+    orm_body = await encode_orm(rows, field)
+    fast_body = await encode_fast(rows)
+    assert orm_body == fast_body
+
+    before = await measure(lambda rows: encode_orm(rows, field), rows, args.repeat)
+    after = await measure(encode_fast, rows, args.repeat)
+    print(f"orm   {before:12,.0f} rows/s")
+    print(f"fast  {after:12,.0f} rows/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,4 +12,4 @@ alembic upgrade head
 
 # Start the FastAPI application
 echo "Starting FastAPI application..."
-exec uvicorn app.main:create_production_app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+exec python -m app.cli serve
\ No newline at end of file
@@ -3,6 +3,7 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from app.models.task import Task  # noqa
+from app.models.cache import CacheEntry  # noqa
 from app.config.settings import settings
 from app.config.database import database
 
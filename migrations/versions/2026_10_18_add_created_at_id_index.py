@@ -0,0 +1,40 @@
+"""Add (created_at, id) index for keyset pagination.
+
+Revision ID: 3f1c8a2d9b47
+Revises: 672e9acb9286
+Create Date: 2026-10-18 10:12:31.418207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c8a2d9b47"
+down_revision: Union[str, Sequence[str], None] = "672e9acb9286"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_created_at_id",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
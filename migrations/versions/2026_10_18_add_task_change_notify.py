@@ -0,0 +1,54 @@
+"""Notify task changes on the task_changes channel.
+
+Revision ID: 9a6c2f4e1d38
+Revises: 5b9f13d6e8a2
+Create Date: 2026-10-18 17:52:13.408716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a6c2f4e1d38"
+down_revision: Union[str, Sequence[str], None] = "5b9f13d6e8a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notifications are delivered on commit, and dropped on rollback.
+    op.execute(
+        """
+        CREATE FUNCTION notify_task_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', OLD.id, 'op', TG_OP, 'updated_at', now()
+                )::text);
+            ELSE
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', NEW.id, 'op', TG_OP, 'updated_at', NEW.updated_at
+                )::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_notify_change ON tasks")
+    op.execute("DROP FUNCTION notify_task_change()")
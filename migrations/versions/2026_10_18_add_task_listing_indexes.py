@@ -0,0 +1,62 @@
+"""Add indexes for filtered and sorted task listings.
+
+Revision ID: c47a9e0f2b13
+Revises: 8d2e5b71c0a4
+Create Date: 2026-10-18 15:02:44.170385
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c47a9e0f2b13"
+down_revision: Union[str, Sequence[str], None] = "8d2e5b71c0a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_updated_at_id",
+            "tasks",
+            ["updated_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_status_created_at_id",
+            "tasks",
+            ["status", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_active_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            postgresql_where=sa.text("status IN ('CREATED', 'IN_PROGRESS')"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_name_pattern",
+            "tasks",
+            ["name"],
+            postgresql_ops={"name": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_tasks_name_pattern",
+            "ix_tasks_active_created_at_id",
+            "ix_tasks_status_created_at_id",
+            "ix_tasks_updated_at_id",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
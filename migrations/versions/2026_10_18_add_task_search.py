@@ -0,0 +1,77 @@
+"""Add full-text search vector and trigram index on name.
+
+Revision ID: 5b9f13d6e8a2
+Revises: c47a9e0f2b13
+Create Date: 2026-10-18 16:20:37.905114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b9f13d6e8a2"
+down_revision: Union[str, Sequence[str], None] = "c47a9e0f2b13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once.
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_search_vector",
+            "tasks",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        # Fuzzy name matching is optional: only set up when pg_trgm is available.
+        available = op.get_bind().scalar(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        )
+        if available:
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.create_index(
+                "ix_tasks_name_trgm",
+                "tasks",
+                ["name"],
+                postgresql_using="gin",
+                postgresql_ops={"name": "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_name_trgm",
+            table_name="tasks",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_tasks_search_vector",
+            table_name="tasks",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("tasks", "search_vector")
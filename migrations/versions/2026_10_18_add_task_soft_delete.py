@@ -0,0 +1,212 @@
+"""Soft-delete tasks, keeping indexes to the live ones.
+
+Revision ID: 4c81e7f2b6d9
+Revises: e3b7d5a0c921
+Create Date: 2026-10-18 21:14:52.603118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c81e7f2b6d9"
+down_revision: Union[str, Sequence[str], None] = "e3b7d5a0c921"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = "deleted_at IS NULL"
+ACTIVE = "status IN ('CREATED', 'IN_PROGRESS')"
+
+# name, columns, index options and the predicate before this revision
+INDEXES = [
+    ("ix_tasks_created_at_id", ["created_at", "id"], {}, None),
+    ("ix_tasks_updated_at_id", ["updated_at", "id"], {}, None),
+    ("ix_tasks_status_created_at_id", ["status", "created_at", "id"], {}, None),
+    ("ix_tasks_active_created_at_id", ["created_at", "id"], {}, ACTIVE),
+    (
+        "ix_tasks_name_pattern",
+        ["name"],
+        {"postgresql_ops": {"name": "varchar_pattern_ops"}},
+        None,
+    ),
+    ("ix_tasks_search_vector", ["search_vector"], {"postgresql_using": "gin"}, None),
+    (
+        "ix_tasks_name_trgm",
+        ["name"],
+        {"postgresql_using": "gin", "postgresql_ops": {"name": "gin_trgm_ops"}},
+        None,
+    ),
+]
+
+
+def _rebuild_indexes(live: bool) -> None:
+    """
+    Swap each index for one with (or without) the live predicate.
+
+    The new index is built next to the old one, so queries keep an index
+    while it is built; neither step locks out writes.
+    """
+    existing = {
+        index["name"] for index in sa.inspect(op.get_bind()).get_indexes("tasks")
+    }
+    for name, columns, options, where in INDEXES:
+        if name not in existing:
+            continue
+        if live:
+            where = f"{where} AND {LIVE}" if where else LIVE
+        op.create_index(
+            f"{name}_new",
+            "tasks",
+            columns,
+            postgresql_where=sa.text(where) if where else None,
+            postgresql_concurrently=True,
+            **options,
+        )
+        op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
+        op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A nullable column without a default is added without rewriting the table.
+    op.add_column(
+        "tasks", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    with op.get_context().autocommit_block():
+        _rebuild_indexes(live=True)
+        # Names only have to be unique among live tasks.
+        op.create_index(
+            "ix_tasks_name_unique",
+            "tasks",
+            ["name"],
+            unique=True,
+            postgresql_where=sa.text(LIVE),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_deleted_at",
+            "tasks",
+            ["deleted_at"],
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+    op.drop_constraint("tasks_name_key", "tasks", type_="unique")
+
+    # A soft delete is a DELETE for the change feed and leaves a tombstone;
+    # restoring a task removes it, and a purge is no change at all.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                IF OLD.deleted_at IS NULL THEN
+                    PERFORM pg_notify('task_changes', json_build_object(
+                        'id', OLD.id, 'op', TG_OP, 'updated_at', now()
+                    )::text);
+                END IF;
+            ELSIF TG_OP = 'UPDATE' AND NEW.deleted_at IS NOT NULL THEN
+                IF OLD.deleted_at IS NULL THEN
+                    PERFORM pg_notify('task_changes', json_build_object(
+                        'id', NEW.id, 'op', 'DELETE', 'updated_at', NEW.deleted_at
+                    )::text);
+                END IF;
+            ELSE
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', NEW.id, 'op', TG_OP, 'updated_at', NEW.updated_at
+                )::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_task_tombstone() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                IF OLD.deleted_at IS NULL THEN
+                    INSERT INTO task_tombstones (id, deleted_at)
+                    VALUES (OLD.id, now())
+                    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+                END IF;
+            ELSIF NEW.deleted_at IS NOT DISTINCT FROM OLD.deleted_at THEN
+                RETURN NULL;
+            ELSIF NEW.deleted_at IS NULL THEN
+                DELETE FROM task_tombstones WHERE id = NEW.id;
+            ELSE
+                INSERT INTO task_tombstones (id, deleted_at)
+                VALUES (NEW.id, NEW.deleted_at)
+                ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER tasks_record_tombstone ON tasks")
+    op.execute(
+        """
+        CREATE TRIGGER tasks_record_tombstone
+        AFTER DELETE OR UPDATE OF deleted_at ON tasks
+        FOR EACH ROW EXECUTE FUNCTION record_task_tombstone()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Deleted tasks already have their tombstones; they cannot come back.
+    op.execute("DELETE FROM tasks WHERE deleted_at IS NOT NULL")
+    op.execute("DROP TRIGGER tasks_record_tombstone ON tasks")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_task_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (id, deleted_at)
+            VALUES (OLD.id, now())
+            ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_record_tombstone
+        AFTER DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION record_task_tombstone()
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_task_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', OLD.id, 'op', TG_OP, 'updated_at', now()
+                )::text);
+            ELSE
+                PERFORM pg_notify('task_changes', json_build_object(
+                    'id', NEW.id, 'op', TG_OP, 'updated_at', NEW.updated_at
+                )::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.create_unique_constraint("tasks_name_key", "tasks", ["name"])
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_deleted_at", table_name="tasks", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_tasks_name_unique", table_name="tasks", postgresql_concurrently=True
+        )
+        _rebuild_indexes(live=False)
+    op.drop_column("tasks", "deleted_at")
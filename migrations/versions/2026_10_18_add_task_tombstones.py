@@ -0,0 +1,67 @@
+"""Record deleted tasks in task_tombstones.
+
+Revision ID: e3b7d5a0c921
+Revises: 9a6c2f4e1d38
+Create Date: 2026-10-18 19:06:41.227593
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b7d5a0c921"
+down_revision: Union[str, Sequence[str], None] = "9a6c2f4e1d38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_tombstones",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at_id",
+        "task_tombstones",
+        ["deleted_at", "id"],
+    )
+    # Every delete path, bulk and raw SQL included, leaves a tombstone.
+    op.execute(
+        """
+        CREATE FUNCTION record_task_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (id, deleted_at)
+            VALUES (OLD.id, now())
+            ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_record_tombstone
+        AFTER DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION record_task_tombstone()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER tasks_record_tombstone ON tasks")
+    op.execute("DROP FUNCTION record_task_tombstone()")
+    op.drop_index("ix_task_tombstones_deleted_at_id", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
@@ -0,0 +1,32 @@
+"""Add version column for optimistic concurrency.
+
+Revision ID: 8d2e5b71c0a4
+Revises: 3f1c8a2d9b47
+Create Date: 2026-10-18 13:41:09.552871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e5b71c0a4"
+down_revision: Union[str, Sequence[str], None] = "3f1c8a2d9b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tasks", "version")
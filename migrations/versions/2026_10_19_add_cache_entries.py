@@ -0,0 +1,37 @@
+"""Add cache_entries for caches shared through Postgres.
+
+Revision ID: 7d2e9b4c1a65
+Revises: 4c81e7f2b6d9
+Create Date: 2026-10-19 10:12:37.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2e9b4c1a65"
+down_revision: Union[str, Sequence[str], None] = "4c81e7f2b6d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "cache_entries",
+        sa.Column("key", sa.String(length=512), nullable=False),
+        sa.Column("value", sa.LargeBinary(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_cache_entries_expires_at", "cache_entries", ["expires_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_cache_entries_expires_at", table_name="cache_entries")
+    op.drop_table("cache_entries")
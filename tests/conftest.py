@@ -7,6 +7,8 @@ from fastapi.testclient import TestClient
 import asyncio
 
 
+from app.config.database import database
+from app.config.instrumentation import query_budget as _query_budget
 from app.main import create_app
 import pytest
 from faker import Faker
@@ -15,11 +17,12 @@ from uuid import uuid4
 from datetime import datetime, timezone
 from app.schemas.task import TaskResponseSchema
 from app.providers import (
+    CacheProvider,
     MockSessionProvider,
     TaskRepositoryProvider,
     TaskServiceProvider,
 )
-from dishka.integrations.fastapi import setup_dishka
+from dishka.integrations.fastapi import FastapiProvider, setup_dishka
 
 fake = Faker()
 
@@ -70,7 +73,25 @@ def task_response_instance(task_response_data: dict[str, Any]) -> TaskResponseSc
 @pytest_asyncio.fixture
 async def container():
     container = make_async_container(
-        MockSessionProvider(), TaskRepositoryProvider(), TaskServiceProvider()
+        FastapiProvider(),
+        MockSessionProvider(),
+        CacheProvider(),
+        TaskRepositoryProvider(),
+        TaskServiceProvider(),
     )
     yield container
     await container.close()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    ``with query_budget(2): ...`` fails when the block runs more statements.
+
+    The statements seen are yielded for further assertions.
+    """
+
+    def budget(limit: int):
+        return _query_budget(limit, *database.engines)
+
+    return budget
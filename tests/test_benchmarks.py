@@ -0,0 +1,150 @@
+import argparse
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import Body, FastAPI, HTTPException, status
+
+from benchmarks.load import (
+    PHASES,
+    PhaseResult,
+    compare,
+    percentile,
+    run,
+    run_phase,
+    summarize,
+)
+
+
+def make_result(**overrides) -> PhaseResult:
+    values = {
+        "requests": 100,
+        "errors": 0,
+        "rps": 500.0,
+        "p50_ms": 5.0,
+        "p95_ms": 10.0,
+        "p99_ms": 20.0,
+        "round_trips": 3.0,
+    }
+    return PhaseResult(**{**values, **overrides})
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.99) == 0.0
+
+
+def test_summarize_reports_milliseconds_and_round_trips_per_request():
+    result = summarize([0.001, 0.002, 0.003, 0.004], 1, 2.0, 10)
+
+    assert result == PhaseResult(
+        requests=4,
+        errors=1,
+        rps=2.0,
+        p50_ms=2.0,
+        p95_ms=4.0,
+        p99_ms=4.0,
+        round_trips=2.5,
+    )
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"phases": {"get": {"rps": 500.0, "p95_ms": 10.0, "round_trips": 3.0}}}
+
+    assert compare({"get": make_result(rps=450.0, p95_ms=11.5)}, baseline, 0.2) == []
+    assert compare({"list": make_result(rps=1.0)}, baseline, 0.2) == []
+    assert len(compare({"get": make_result(rps=350.0)}, baseline, 0.2)) == 1
+    assert len(compare({"get": make_result(p95_ms=13.0)}, baseline, 0.2)) == 1
+    assert len(compare({"get": make_result(round_trips=4.0)}, baseline, 0.2)) == 1
+    assert compare({"get": make_result(round_trips=None)}, baseline, 0.2) == []
+
+
+@pytest.mark.asyncio
+async def test_run_phase_sends_each_request_once():
+    sent = []
+
+    async def send(number: int) -> httpx.Response:
+        sent.append(number)
+        return httpx.Response(404 if number == 3 else 200)
+
+    result = await run_phase(send, requests=10, concurrency=4, counter=None)
+
+    assert sorted(sent) == list(range(10))
+    assert result.requests == 10
+    assert result.errors == 1
+    assert result.round_trips is None
+
+
+def memory_api() -> FastAPI:
+    """The task endpoints the benchmark calls, with unique names, in memory."""
+    app = FastAPI(root_path="/api")
+    tasks: dict[str, dict] = {}
+
+    def store(data: dict, task_id: str | None = None) -> dict:
+        if any(
+            task["name"] == data["name"] and key != task_id
+            for key, task in tasks.items()
+        ):
+            raise HTTPException(status.HTTP_409_CONFLICT, "Duplicate entry.")
+        task_id = task_id or str(uuid4())
+        tasks[task_id] = {**data, "id": task_id}
+        return tasks[task_id]
+
+    @app.post("/tasks/bulk")
+    async def bulk_create(items: list[dict] = Body()):
+        results = []
+        for index, data in enumerate(items):
+            try:
+                results.append({"index": index, "id": store(data)["id"]})
+            except HTTPException:
+                results.append({"index": index, "id": None})
+        return {"data": results}
+
+    @app.post("/tasks/", status_code=status.HTTP_201_CREATED)
+    async def create(data: dict = Body()):
+        return {"data": store(data)}
+
+    @app.get("/tasks")
+    async def get_list(limit: int, offset: int = 0):
+        return {"data": {"items": list(tasks.values())[offset : offset + limit]}}
+
+    @app.get("/tasks/{task_id}")
+    async def get(task_id: str):
+        return {"data": tasks[task_id]}
+
+    @app.patch("/tasks/{task_id}")
+    async def update(task_id: str, data: dict = Body()):
+        return {"data": store(data, task_id)}
+
+    @app.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete(task_id: str):
+        del tasks[task_id]
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_repeated_runs_send_no_conflicting_names():
+    app = memory_api()
+    args = argparse.Namespace(
+        url=None, tasks=20, requests=10, concurrency=4, page_size=5, phases=PHASES
+    )
+
+    @asynccontextmanager
+    async def client_factory():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            yield client, None
+
+    for _ in range(2):
+        results = await run(args, client_factory())
+
+        assert list(results) == list(PHASES)
+        assert all(result.errors == 0 for result in results.values())
+        assert results["delete"].requests == 10
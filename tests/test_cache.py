@@ -0,0 +1,293 @@
+import fnmatch
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.cache.memory import MemoryCache
+from app.cache.postgres import PostgresCache
+from app.cache.redis import RedisCache
+from app.schemas.pagination import TotalMode
+from app.schemas.task import TaskListFilterSchema, TaskSortKey
+from app.services.task import TaskService
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for ``redis.asyncio.Redis``."""
+
+    def __init__(self):
+        self.store: dict[str, tuple[float, bytes]] = {}
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("redis is down")
+
+    async def get(self, key):
+        self._check()
+        entry = self.store.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key, value, px):
+        self._check()
+        self.store[key] = (time.monotonic() + px / 1000, value)
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def scan_iter(self, match):
+        for key in list(self.store):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+
+class CountingRepository:
+    def __init__(self, task):
+        self.task = task
+        self.reads = 0
+
+    async def get_by_uuid(self, uuid):
+        self.reads += 1
+        return self.task
+
+    async def update(self, uuid, schema, versions=None):
+        return self.task
+
+    async def delete(self, uuid):
+        return None
+
+    async def get_page(
+        self, limit, offset=0, cursor=None, filters=None, count=False, columns=None
+    ):
+        return [self.task], None, 1 if count else None
+
+    async def count(self, filters=None):
+        self.reads += 1
+        return 1
+
+
+@pytest.fixture
+def task(task_response_data):
+    return SimpleNamespace(**task_response_data)
+
+
+@pytest.mark.asyncio
+class TestMemoryCache:
+    async def test_hit_and_miss_counters(self):
+        cache = MemoryCache(ttl=60, max_entries=10)
+
+        assert await cache.get("a") is None
+        await cache.set("a", b"1")
+        assert await cache.get("a") == b"1"
+
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    async def test_lru_eviction(self):
+        cache = MemoryCache(ttl=60, max_entries=2)
+        await cache.set("a", b"1")
+        await cache.set("b", b"2")
+        await cache.get("a")
+        await cache.set("c", b"3")
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == b"1"
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+
+    async def test_ttl_expiry(self):
+        cache = MemoryCache(ttl=0, max_entries=2)
+        await cache.set("a", b"1")
+
+        assert await cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    async def test_ttl_override(self):
+        cache = MemoryCache(ttl=60, max_entries=2)
+        await cache.set("a", b"1", ttl=0)
+
+        assert await cache.get("a") is None
+
+    async def test_add_only_sets_missing_or_expired_keys(self):
+        cache = MemoryCache(ttl=60, max_entries=2)
+
+        assert await cache.add("a", b"1") is True
+        assert await cache.add("a", b"2") is False
+        assert await cache.get("a") == b"1"
+        await cache.set("b", b"1", ttl=0)
+        assert await cache.add("b", b"2") is True
+
+
+@pytest.mark.asyncio
+class TestRedisCache:
+    async def test_round_trip_and_clear(self):
+        client = FakeRedis()
+        cache = RedisCache(client=client, ttl=60, prefix="test:")
+        await cache.set("a", b"1")
+        await cache.set("b", b"2")
+
+        assert await cache.get("a") == b"1"
+        assert "test:a" in client.store
+
+        await cache.delete("a")
+        assert await cache.get("a") is None
+
+        await cache.clear()
+        assert client.store == {}
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    async def test_errors_are_misses(self):
+        client = FakeRedis()
+        client.fail = True
+        cache = RedisCache(client=client, ttl=60)
+
+        await cache.set("a", b"1")
+        assert await cache.get("a") is None
+        assert cache.stats.misses == 1
+
+
+class RecordingSession:
+    """Records statements; ``scalar`` answers with ``result``."""
+
+    def __init__(self, result=None, fail=False):
+        self.result = result
+        self.fail = fail
+        self.statements = []
+        self.commits = 0
+
+    def _record(self, statement):
+        if self.fail:
+            raise ConnectionError("postgres is down")
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    async def scalar(self, statement):
+        self._record(statement)
+        return self.result
+
+    async def execute(self, statement):
+        self._record(statement)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def postgres_cache(session):
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    return PostgresCache(session_factory=session_factory, ttl=60, prefix="test:")
+
+
+@pytest.mark.asyncio
+class TestPostgresCache:
+    async def test_add_only_takes_missing_or_expired_keys(self):
+        session = RecordingSession(result="test:a")
+
+        assert await postgres_cache(session).add("a", b"1") is True
+
+        insert, prune = session.statements
+        assert "ON CONFLICT (key) DO UPDATE" in insert
+        assert "WHERE cache_entries.expires_at <= now() RETURNING" in insert
+        assert "FOR UPDATE SKIP LOCKED" in prune
+        assert session.commits == 1
+
+        session.result = None
+        assert await postgres_cache(session).add("a", b"1") is False
+
+    async def test_get_skips_expired_entries(self):
+        session = RecordingSession(result=b"1")
+        cache = postgres_cache(session)
+
+        assert await cache.get("a") == b"1"
+        assert "cache_entries.expires_at > now()" in session.statements[0]
+        assert cache.stats.hits == 1
+
+    async def test_errors_are_misses(self):
+        cache = postgres_cache(RecordingSession(fail=True))
+
+        await cache.set("a", b"1")
+        assert await cache.get("a") is None
+        assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+class TestTaskServiceCache:
+    @pytest.mark.parametrize(
+        "cache",
+        [MemoryCache(ttl=60, max_entries=10), RedisCache(client=FakeRedis(), ttl=60)],
+    )
+    async def test_read_through(self, task, cache):
+        repository = CountingRepository(task)
+        service = TaskService(repository=repository, cache=cache)
+
+        first = await service.get_task_by_id(str(task.id))
+        second = await service.get_task_by_id(str(task.id).upper())
+
+        assert first == second
+        assert repository.reads == 1
+
+    async def test_replica_reads_are_not_cached(self, task):
+        primary, replica = CountingRepository(task), CountingRepository(task)
+        primary.session, replica.session = "primary", "replica"
+        cache = MemoryCache(ttl=60, max_entries=10)
+        service = TaskService(repository=primary, reader=replica, cache=cache)
+
+        await service.get_task_by_id(str(task.id))
+        await service.get_task_by_id(str(task.id))
+
+        assert replica.reads == 2
+        assert len(cache) == 0
+
+    async def test_writes_invalidate(self, task):
+        repository = CountingRepository(task)
+        service = TaskService(
+            repository=repository, cache=MemoryCache(ttl=60, max_entries=10)
+        )
+        task_uuid = str(task.id)
+
+        await service.get_task_by_id(task_uuid)
+        await service.update_task(task_uuid=task_uuid, schema=None)
+        await service.get_task_by_id(task_uuid)
+        await service.delete_task(task_uuid=task_uuid)
+        await service.get_task_by_id(task_uuid)
+
+        assert repository.reads == 3
+
+    async def test_without_cache_always_reads(self, task):
+        repository = CountingRepository(task)
+        service = TaskService(repository=repository)
+
+        await service.get_task_by_id(str(task.id))
+        await service.get_task_by_id(str(task.id))
+
+        assert repository.reads == 2
+
+    async def test_cached_total_is_shared_across_sort_orders(self, task):
+        repository = CountingRepository(task)
+        service = TaskService(
+            repository=repository, cache=MemoryCache(ttl=60, max_entries=10)
+        )
+
+        for sort in (TaskSortKey.NAME, TaskSortKey.CREATED_AT_DESC):
+            _, _, total = await service.get_task_list(
+                limit=10,
+                filters=TaskListFilterSchema(status=["Completed"], sort=sort),
+                total_mode=TotalMode.CACHED,
+            )
+            assert total == 1
+        await service.get_task_list(
+            limit=10,
+            filters=TaskListFilterSchema(status=["Created"]),
+            total_mode=TotalMode.CACHED,
+        )
+
+        assert repository.reads == 2
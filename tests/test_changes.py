@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.api.changes import change_events, resume_token, sse_stream
+from app.schemas.pagination import Cursor
+from app.schemas.task import TaskChangeOperation, TaskChangeSchema
+from app.services.changes import ChangeFeed, Subscription, SubscriptionClosed
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def notify(self, payload):
+        self.listeners["task_changes"](self, 1, "task_changes", payload)
+
+    def terminate(self):
+        self.closed = True
+        for callback in self.termination_listeners:
+            callback(self)
+
+
+@pytest.fixture
+def connections():
+    return []
+
+
+@pytest.fixture
+def feed(connections):
+    async def connect(dsn):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    return ChangeFeed("postgresql://test", max_pending=2, connect=connect)
+
+
+def make_change(op=TaskChangeOperation.UPDATE, seconds=0):
+    return TaskChangeSchema(
+        id=uuid4(),
+        op=op,
+        updated_at=datetime(2026, 10, 18, tzinfo=timezone.utc)
+        + timedelta(seconds=seconds),
+    )
+
+
+@pytest.mark.asyncio
+class TestChangeFeed:
+    async def test_notifications_reach_every_subscriber(self, feed, connections):
+        change = make_change()
+        async with feed.subscribe() as first, feed.subscribe() as second:
+            (connection,) = connections
+            connection.notify(change.model_dump_json())
+            connection.notify("not json")
+
+            assert await first.next(timeout=1) == change
+            assert await second.next(timeout=1) == change
+            assert await first.next(timeout=0.01) is None
+        assert feed.subscribers == 0
+
+    async def test_lost_connection_closes_subscriptions(self, feed, connections):
+        async with feed.subscribe() as subscription:
+            connections[0].terminate()
+            with pytest.raises(SubscriptionClosed, match="disconnected"):
+                await subscription.next(timeout=1)
+
+        async with feed.subscribe():
+            assert len(connections) == 2
+
+    async def test_close(self, feed, connections):
+        async with feed.subscribe() as subscription:
+            await feed.close()
+
+            assert connections[0].closed
+            with pytest.raises(SubscriptionClosed, match="shutdown"):
+                await subscription.next()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_closed_after_its_pending_changes():
+    subscription = Subscription(max_pending=2)
+    changes = [make_change(seconds=second) for second in range(3)]
+    for change in changes:
+        subscription.push(change)
+
+    assert await subscription.next() == changes[0]
+    assert await subscription.next() == changes[1]
+    with pytest.raises(SubscriptionClosed) as closed:
+        await subscription.next()
+    assert closed.value.reason == "overflow"
+
+
+def test_resume_token():
+    change = make_change()
+
+    assert resume_token(change.token) == change.token
+    assert resume_token(None) is None
+    list_cursor = Cursor.after("created_at", change.updated_at, change.id).encode()
+    for token in (list_cursor, "garbage"):
+        with pytest.raises(HTTPException) as error:
+            resume_token(token)
+        assert error.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_catch_up_then_live_changes_as_server_sent_events(feed, connections):
+    missed, live = make_change(seconds=1), make_change(seconds=2)
+
+    class Service:
+        async def changes_since(self, token, overlap_seconds):
+            assert token == "since"
+            connections[0].notify(live.model_dump_json())
+            yield missed
+
+    stream = sse_stream(change_events(Service(), feed, "since", heartbeat=0.01))
+    events = [await anext(stream) for _ in range(3)]
+    await stream.aclose()
+
+    assert events[0] == (
+        f"id: {missed.token}\ndata: {missed.model_dump_json()}\n\n".encode()
+    )
+    assert events[1] == f"id: {live.token}\ndata: {live.model_dump_json()}\n\n".encode()
+    assert events[2] == b": keep-alive\n\n"
+    assert feed.subscribers == 0
+
+
+@pytest.mark.asyncio
+async def test_live_changes_read_back_in_the_catch_up_are_dropped(feed, connections):
+    now = datetime.now(timezone.utc)
+    early = TaskChangeSchema(
+        id=uuid4(), op=TaskChangeOperation.UPDATE, updated_at=now - timedelta(hours=1)
+    )
+    recent = TaskChangeSchema(id=uuid4(), op=TaskChangeOperation.UPDATE, updated_at=now)
+    newer = recent.model_copy(update={"updated_at": now + timedelta(seconds=1)})
+
+    class Service:
+        async def changes_since(self, token, overlap_seconds):
+            assert overlap_seconds == 5
+            for change in (recent, newer):
+                connections[0].notify(change.model_dump_json())
+            yield early
+            yield recent
+
+    events = change_events(Service(), feed, "since", heartbeat=0.01, overlap=5)
+    changes = [await anext(events) for _ in range(4)]
+    await events.aclose()
+
+    assert changes == [early, recent, newer, None]
+
+
+@pytest.mark.asyncio
+async def test_closed_subscription_ends_the_stream(feed, connections):
+    stream = sse_stream(change_events(None, feed, None, heartbeat=1))
+    pending = asyncio.create_task(anext(stream))
+    await asyncio.sleep(0.01)
+    connections[0].terminate()
+
+    assert await pending == b'event: closed\ndata: {"reason": "disconnected"}\n\n'
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
@@ -0,0 +1,127 @@
+import asyncio
+import gzip
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.api.compression import (
+    CompressionMiddleware,
+    accepted_encodings,
+    available_encodings,
+)
+
+BODY = "task " * 1000
+
+
+async def large(request):
+    return PlainTextResponse(BODY)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(5):
+            yield BODY.encode()
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+async def events(request):
+    return StreamingResponse(iter([BODY]), media_type="text/event-stream")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/large", large),
+            Route("/small", small),
+            Route("/stream", stream),
+            Route("/events", events),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], minimum_size=500)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+def test_accepted_encodings_skip_refused_ones():
+    assert accepted_encodings("gzip;q=0.5, br;q=0, zstd") == {"gzip", "zstd"}
+
+
+def test_missing_packages_are_skipped(monkeypatch):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+
+    assert available_encodings(["br", "zstd", "gzip", "lzma"]) == ["gzip"]
+
+
+@pytest.mark.asyncio
+class TestCompressionMiddleware:
+    async def test_large_response_is_compressed(self, client):
+        async with client:
+            response = await client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(BODY)
+        assert response.text == BODY
+
+    async def test_small_response_is_sent_as_is(self, client):
+        async with client:
+            response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    async def test_identity_when_not_accepted(self, client):
+        async with client:
+            response = await client.get(
+                "/large", headers={"Accept-Encoding": "identity"}
+            )
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.text == BODY
+
+    async def test_event_stream_is_sent_as_is(self, client):
+        async with client:
+            response = await client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == BODY
+
+    async def test_stream_chunks_are_flushed(self):
+        middleware = CompressionMiddleware(
+            Starlette(routes=[Route("/stream", stream)]), encodings=["gzip"]
+        )
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/stream",
+            "query_string": b"",
+            "headers": [(b"accept-encoding", b"gzip")],
+        }
+        messages = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware(scope, receive, send)
+
+        start, *bodies = messages
+        assert (b"content-encoding", b"gzip") in start["headers"]
+        assert all(message["body"] for message in bodies[:-1])
+        assert len(bodies) > 2
+        body = b"".join(message["body"] for message in bodies)
+        assert gzip.decompress(body) == BODY.encode() * 5
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, Request, status
+
+from app.api.conditional import (
+    http_date,
+    if_match_versions,
+    is_not_modified,
+    list_etag,
+    not_modified,
+    task_etag,
+)
+
+
+def make_request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (key.replace("_", "-").encode(), value.encode())
+                for key, value in headers.items()
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def updated_at() -> datetime:
+    return datetime(2026, 10, 18, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+class TestEtags:
+    def test_task_etag_is_strong_and_tracks_versions(self):
+        task_id = uuid4()
+        etag = task_etag(task_id, 1)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == task_etag(task_id, 1)
+        assert etag != task_etag(task_id, 2)
+        assert etag != task_etag(uuid4(), 1)
+
+    def test_list_etag_depends_on_membership_and_params(self, updated_at: datetime):
+        first, second = (uuid4(), updated_at), (uuid4(), updated_at)
+
+        assert list_etag([first, second], 10) != list_etag([first], 10)
+        assert list_etag([first], 10) != list_etag([first], 20)
+        assert list_etag([first, second], 10) == list_etag(iter([first, second]), 10)
+
+
+class TestIsNotModified:
+    def test_matching_if_none_match(self):
+        etag = '"abc"'
+
+        assert is_not_modified(make_request(if_none_match='"x", "abc"'), etag)
+        assert is_not_modified(make_request(if_none_match='W/"abc"'), etag)
+        assert is_not_modified(make_request(if_none_match="*"), etag)
+        assert not is_not_modified(make_request(if_none_match='"x"'), etag)
+
+    def test_if_none_match_takes_precedence(self, updated_at: datetime):
+        request = make_request(
+            if_none_match='"other"', if_modified_since=http_date(updated_at)
+        )
+
+        assert not is_not_modified(request, '"abc"', updated_at)
+
+    def test_if_modified_since(self, updated_at: datetime):
+        same_second = make_request(if_modified_since=http_date(updated_at))
+        earlier = make_request(
+            if_modified_since=http_date(updated_at - timedelta(seconds=1))
+        )
+
+        assert is_not_modified(same_second, '"abc"', updated_at)
+        assert not is_not_modified(earlier, '"abc"', updated_at)
+        assert not is_not_modified(same_second, '"abc"')
+
+    def test_invalid_if_modified_since(self, updated_at: datetime):
+        request = make_request(if_modified_since="yesterday")
+
+        assert not is_not_modified(request, '"abc"', updated_at)
+
+    def test_not_modified_response(self):
+        response = not_modified({"ETag": '"abc"'})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == '"abc"'
+        assert response.body == b""
+
+
+class TestIfMatchVersions:
+    def test_without_precondition(self):
+        task_uuid = str(uuid4())
+
+        assert if_match_versions(make_request(), task_uuid) is None
+        assert if_match_versions(make_request(if_match="*"), task_uuid) is None
+
+    def test_versions_from_own_tags(self):
+        task_id = uuid4()
+        header = ", ".join(
+            [task_etag(task_id, 3), task_etag(uuid4(), 4), task_etag(task_id, 5)]
+        )
+
+        versions = if_match_versions(make_request(if_match=header), str(task_id))
+
+        assert versions == [3, 5]
+
+    @pytest.mark.parametrize("header", ['"garbage"', "W/{tag}", "{other}"])
+    def test_unmatchable_tags_fail(self, header: str):
+        task_id = uuid4()
+        header = header.format(tag=task_etag(task_id, 1), other=task_etag(uuid4(), 1))
+
+        with pytest.raises(HTTPException) as exc_info:
+            if_match_versions(make_request(if_match=header), str(task_id))
+
+        assert exc_info.value.status_code == status.HTTP_412_PRECONDITION_FAILED
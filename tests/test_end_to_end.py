@@ -77,7 +77,6 @@ class TestTaskCreationIntegration:
 
 
 class TestTaskCreationEdgeCases:
-
     @pytest.mark.asyncio
     async def test_create_task_with_long_values(self, get_async_client: AsyncClient):
         long_name = "A" * 300
@@ -146,8 +145,9 @@ class TestTaskCreationEdgeCases:
 
 @pytest.mark.asyncio
 class TestTaskCreationPerformance:
-
-    async def test_create_multiple_tasks_sequential(self, get_async_client: AsyncClient):
+    async def test_create_multiple_tasks_sequential(
+        self, get_async_client: AsyncClient
+    ):
         tasks_to_create = 10
 
         for i in range(tasks_to_create):
@@ -156,18 +156,19 @@ class TestTaskCreationPerformance:
                 json={
                     "name": f"Task {i}",
                     "description": f"Description for task {i}",
-                    "status": "Created"
-                }
+                    "status": "Created",
+                },
             )
             assert response.status_code == status.HTTP_201_CREATED
 
-    async def test_create_multiple_tasks_concurrent(self, get_async_client: AsyncClient, get_data_for_schema):
+    async def test_create_multiple_tasks_concurrent(
+        self, get_async_client: AsyncClient, get_data_for_schema
+    ):
         tasks_to_create = 10
 
         async def create_task(i):
             response = await get_async_client.post(
-                "/api/tasks/",
-                json=get_data_for_schema
+                "/api/tasks/", json=get_data_for_schema
             )
             assert response.status_code == status.HTTP_201_CREATED
             return response
@@ -178,3 +179,134 @@ class TestTaskCreationPerformance:
 
         assert len(results) == tasks_to_create
         assert all(result.status_code == status.HTTP_201_CREATED for result in results)
+
+
+@pytest.mark.asyncio
+class TestTaskListPagination:
+    async def test_cursor_pages_do_not_overlap(self, get_async_client: AsyncClient):
+        for i in range(5):
+            await get_async_client.post(
+                "/api/tasks/",
+                json={
+                    "name": f"Paged task {i}",
+                    "description": f"Description for paged task {i}",
+                    "status": "Created",
+                },
+            )
+
+        first = await get_async_client.get("/api/tasks", params={"limit": 2})
+        assert first.status_code == status.HTTP_200_OK
+        first_page = first.json()["data"]
+        next_cursor = first_page["pagination"]["next_cursor"]
+        assert next_cursor
+
+        second = await get_async_client.get(
+            "/api/tasks", params={"limit": 2, "cursor": next_cursor}
+        )
+        assert second.status_code == status.HTTP_200_OK
+        second_page = second.json()["data"]
+        assert second_page["pagination"]["offset"] is None
+
+        first_ids = {item["id"] for item in first_page["items"]}
+        second_ids = {item["id"] for item in second_page["items"]}
+        assert not first_ids & second_ids
+
+    async def test_invalid_cursor(self, get_async_client: AsyncClient):
+        response = await get_async_client.get(
+            "/api/tasks", params={"limit": 2, "cursor": "garbage"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_list_with_total_runs_one_query(
+        self, get_async_client: AsyncClient, query_budget
+    ):
+        with query_budget(3) as statements:
+            response = await get_async_client.get(
+                "/api/tasks", params={"limit": 10, "include_total": "exact"}
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+
+
+@pytest.mark.asyncio
+class TestTaskBulkOperations:
+    async def test_bulk_create_reports_conflicts_per_item(
+        self, get_async_client: AsyncClient, get_data_for_schema: dict
+    ):
+        response = await get_async_client.post(
+            "/api/tasks/bulk",
+            json=[get_data_for_schema, get_data_for_schema],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()["data"]
+        assert [result["status"] for result in results] == ["created", "conflict"]
+        assert results[0]["data"]["name"] == get_data_for_schema["name"]
+
+    async def test_bulk_update_and_delete(
+        self, get_async_client: AsyncClient, get_data_for_schema: dict
+    ):
+        created = await get_async_client.post(
+            "/api/tasks/bulk", json=[get_data_for_schema]
+        )
+        task_id = created.json()["data"][0]["id"]
+        missing_id = str(uuid.uuid4())
+
+        updated = await get_async_client.patch(
+            "/api/tasks/bulk",
+            json=[
+                {**get_data_for_schema, "id": task_id, "status": "Completed"},
+                {**get_data_for_schema, "id": missing_id, "name": "Missing task"},
+            ],
+        )
+        assert [result["status"] for result in updated.json()["data"]] == [
+            "updated",
+            "not_found",
+        ]
+
+        deleted = await get_async_client.request(
+            "DELETE", "/api/tasks/bulk", json=[task_id, missing_id]
+        )
+        assert [result["status"] for result in deleted.json()["data"]] == [
+            "deleted",
+            "not_found",
+        ]
+
+    async def test_bulk_create_rejects_empty_batch(self, get_async_client: AsyncClient):
+        response = await get_async_client.post("/api/tasks/bulk", json=[])
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+class TestTaskConditionalRequests:
+    async def test_get_returns_304_for_current_etag(
+        self, get_async_client: AsyncClient, get_data_for_schema: dict
+    ):
+        created = await get_async_client.post("/api/tasks/", json=get_data_for_schema)
+        task_id = created.json()["data"]["id"]
+
+        first = await get_async_client.get(f"/api/tasks/{task_id}")
+        second = await get_async_client.get(
+            f"/api/tasks/{task_id}", headers={"If-None-Match": first.headers["ETag"]}
+        )
+
+        assert second.status_code == status.HTTP_304_NOT_MODIFIED
+        assert second.content == b""
+
+    async def test_update_with_stale_if_match_fails(
+        self, get_async_client: AsyncClient, get_data_for_schema: dict
+    ):
+        created = await get_async_client.post("/api/tasks/", json=get_data_for_schema)
+        task_id = created.json()["data"]["id"]
+
+        response = await get_async_client.patch(
+            f"/api/tasks/{task_id}",
+            json=get_data_for_schema,
+            headers={"If-Match": f'"{task_id}.999"'},
+        )
+
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
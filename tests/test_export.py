@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.models.task import StatusType
+from app.schemas.transfer import FileFormat
+from app.services.export import encode_rows
+
+
+def make_row() -> dict:
+    return {
+        "id": uuid4(),
+        "name": "Export task",
+        "description": "Line one, with a comma\nand a newline",
+        "status": StatusType.IN_PROGRESS,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+async def chunked(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(export_format: FileFormat, *chunks) -> list[bytes]:
+    return [part async for part in encode_rows(chunked(*chunks), export_format)]
+
+
+@pytest.mark.asyncio
+class TestEncodeRows:
+    async def test_ndjson_one_line_per_row(self):
+        rows = [make_row(), make_row()]
+
+        parts = await collect(FileFormat.NDJSON, rows, [])
+
+        assert len(parts) == 1
+        lines = parts[0].decode().splitlines()
+        assert len(lines) == 2
+        decoded = json.loads(lines[0])
+        assert decoded["id"] == str(rows[0]["id"])
+        assert decoded["status"] == "In progress"
+
+    async def test_csv_header_written_once(self):
+        first, second = make_row(), make_row()
+
+        parts = await collect(FileFormat.CSV, [first], [second])
+
+        records = list(csv.reader(io.StringIO(b"".join(parts).decode())))
+        assert records[0] == list(first.keys())
+        assert len(records) == 3
+        assert records[2][0] == str(second["id"])
+        assert records[1][2] == first["description"]
+
+    async def test_empty_table(self):
+        assert await collect(FileFormat.CSV) == []
+
+
+def test_media_types():
+    assert FileFormat.NDJSON.media_type == "application/x-ndjson"
+    assert FileFormat.CSV.media_type == "text/csv"
@@ -0,0 +1,158 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import Body, FastAPI, HTTPException, status
+
+from app.api.idempotency import (
+    IdempotencyError,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    StoredResponse,
+)
+from app.cache.memory import MemoryCache
+
+
+class StoreProvider(Provider):
+    def __init__(self, store: IdempotencyStore):
+        super().__init__()
+        self.store = store
+
+    @provide(scope=Scope.APP)
+    def provide_store(self) -> IdempotencyStore:
+        return self.store
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(MemoryCache(ttl=60, max_entries=100), ttl=60)
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest_asyncio.fixture
+async def client(store, calls):
+    app = FastAPI()
+    release = asyncio.Event()
+    release.set()
+    app.state.release = release
+
+    @app.post("/tasks/", status_code=status.HTTP_201_CREATED)
+    async def create(data: dict = Body()):
+        calls.append(data)
+        await app.state.release.wait()
+        if data.get("fail") and len(calls) == 1:
+            raise HTTPException(status.HTTP_409_CONFLICT, "Duplicate entry.")
+        return {"number": len(calls), **data}
+
+    app.add_middleware(IdempotencyMiddleware, max_body_size=1024)
+    container = make_async_container(StoreProvider(store))
+    setup_dishka(container, app)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        client.app = app
+        yield client
+    await container.close()
+
+
+def post(client, data, key="key-1", params=None):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post("/tasks/", json=data, headers=headers, params=params)
+
+
+@pytest.mark.asyncio
+class TestIdempotencyMiddleware:
+    async def test_retry_replays_the_stored_response(self, client, calls):
+        first = await post(client, {"name": "a"})
+        second = await post(client, {"name": "a"})
+
+        assert len(calls) == 1
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert first.content == second.content
+        assert "idempotent-replayed" not in first.headers
+        assert second.headers["idempotent-replayed"] == "true"
+
+    async def test_reused_key_with_another_body_is_rejected(self, client, calls):
+        await post(client, {"name": "a"})
+        response = await post(client, {"name": "b"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert len(calls) == 1
+
+    async def test_reused_key_with_another_query_is_rejected(self, client, calls):
+        await post(client, {"name": "a"}, params={"on_conflict": "skip"})
+        response = await post(client, {"name": "a"}, params={"on_conflict": "fail"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert len(calls) == 1
+
+    async def test_oversized_body_is_refused(self, client, calls):
+        response = await post(client, {"name": "a" * 2000})
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert calls == []
+
+    async def test_concurrent_duplicates_are_coalesced(self, client, calls):
+        client.app.state.release.clear()
+        requests = [asyncio.create_task(post(client, {"name": "a"})) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        client.app.state.release.set()
+        responses = await asyncio.gather(*requests)
+
+        assert len(calls) == 1
+        assert {response.content for response in responses} == {responses[0].content}
+        assert sum("idempotent-replayed" in r.headers for r in responses) == 2
+
+    async def test_errors_are_not_stored(self, client, calls):
+        first = await post(client, {"name": "a", "fail": True})
+        second = await post(client, {"name": "a", "fail": True})
+
+        assert first.status_code == status.HTTP_409_CONFLICT
+        assert second.status_code == status.HTTP_201_CREATED
+        assert len(calls) == 2
+
+    async def test_requests_without_key_always_run(self, client, calls):
+        await post(client, {"name": "a"}, key=None)
+        await post(client, {"name": "a"}, key=None)
+
+        assert len(calls) == 2
+
+    async def test_overlong_key_is_rejected(self, client, calls):
+        response = await post(client, {"name": "a"}, key="k" * 256)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert calls == []
+
+
+@pytest.mark.asyncio
+class TestIdempotencyStore:
+    async def test_other_worker_waits_then_replays(self):
+        cache = MemoryCache(ttl=60, max_entries=100)
+        first = IdempotencyStore(cache, ttl=60)
+        second = IdempotencyStore(cache, ttl=60, poll_interval=0.01)
+        response = StoredResponse("print", 201, [(b"x", b"1")], b"{}")
+
+        assert await first.begin("key", "print") is None
+        waiting = asyncio.create_task(second.begin("key", "print"))
+        await asyncio.sleep(0.03)
+        await first.finish("key", response)
+
+        assert await waiting == response
+
+    async def test_other_worker_gives_up_with_conflict(self):
+        cache = MemoryCache(ttl=60, max_entries=100)
+        first = IdempotencyStore(cache, ttl=60)
+        second = IdempotencyStore(cache, ttl=60, wait_seconds=0.05, poll_interval=0.01)
+
+        assert await first.begin("key", "print") is None
+        with pytest.raises(IdempotencyError) as error:
+            await second.begin("key", "print")
+
+        assert error.value.status_code == status.HTTP_409_CONFLICT
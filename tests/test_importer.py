@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+
+from app.schemas.task import TaskStatus
+from app.schemas.transfer import FileFormat
+from app.services.importer import TaskFileReader
+
+
+def csv_file(*rows: str) -> io.BytesIO:
+    return io.BytesIO(("name,description,status\n" + "".join(rows)).encode())
+
+
+async def read_all(reader: TaskFileReader) -> list:
+    return [chunk async for chunk in reader.chunks()]
+
+
+@pytest.mark.asyncio
+class TestTaskFileReader:
+    async def test_csv_chunks_and_row_numbers(self):
+        file = csv_file(
+            *(f"Task number {i},Description number {i},Created\n" for i in range(5))
+        )
+        reader = TaskFileReader(file=file, file_format=FileFormat.CSV, chunk_size=2)
+
+        chunks = await read_all(reader)
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert [row for chunk in chunks for row, _ in chunk] == [1, 2, 3, 4, 5]
+        assert chunks[0][0][1].status is TaskStatus.CREATED
+        assert reader.received == 5
+        assert reader.invalid == 0
+
+    async def test_csv_quoted_multiline_description(self):
+        file = csv_file('Multiline task,"First line\nsecond line",Completed\n')
+        reader = TaskFileReader(file=file, file_format=FileFormat.CSV, chunk_size=10)
+
+        [[(row, schema)]] = await read_all(reader)
+
+        assert row == 1
+        assert schema.description == "First line\nsecond line"
+
+    async def test_invalid_rows_are_reported(self):
+        file = csv_file(
+            "Valid task,Valid description,Created\n",
+            "bad,Valid description,Created\n",
+            "Other task,Valid description,Unknown\n",
+        )
+        reader = TaskFileReader(file=file, file_format=FileFormat.CSV, chunk_size=10)
+
+        [chunk] = await read_all(reader)
+
+        assert [row for row, _ in chunk] == [1]
+        assert reader.invalid == 2
+        assert [error.row for error in reader.errors] == [2, 3]
+        assert reader.errors[0].name == "bad"
+        assert "name" in reader.errors[0].error
+
+    async def test_ndjson_skips_blank_and_reports_malformed_lines(self):
+        record = {
+            "name": "Json task",
+            "description": "Json description",
+            "status": "In progress",
+        }
+        file = io.BytesIO(
+            (json.dumps(record) + "\n\n{broken\n" + json.dumps(record) + "\n").encode()
+        )
+        reader = TaskFileReader(file=file, file_format=FileFormat.NDJSON, chunk_size=10)
+
+        [chunk] = await read_all(reader)
+
+        assert [row for row, _ in chunk] == [1, 3]
+        assert reader.received == 3
+        assert reader.errors[0].row == 2
+        assert reader.errors[0].error.startswith("Malformed record")
@@ -0,0 +1,228 @@
+import os
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.api import metrics
+from app.api.metrics import Histogram, TimingMiddleware, render_metrics
+from app.api.responses import json_response
+from app.config import instrumentation
+from app.config.instrumentation import (
+    QueryBudgetExceeded,
+    RequestTimings,
+    check_request_queries,
+    current_timings,
+    instrument_engine,
+    query_budget,
+    record_pool_wait,
+    track_request,
+    traced,
+)
+from app.cache.memory import MemoryCache
+from app.schemas.base import ApiResponse
+from app.services.single_flight import SingleFlight
+
+
+class TestHistogram:
+    def test_render_is_cumulative_per_series(self):
+        histogram = Histogram("latency_seconds", "Latency.", (0.1, 1.0), ("route",))
+        for seconds in (0.05, 0.5, 5):
+            histogram.observe(seconds, "/tasks")
+        histogram.observe(0.05, '/a"b')
+
+        lines = histogram.render()
+
+        assert 'latency_seconds_bucket{route="/tasks",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/tasks",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{route="/tasks",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{route="/tasks"} 3' in lines
+        assert 'latency_seconds_sum{route="/tasks"} 5.55' in lines
+        assert 'latency_seconds_count{route="/a\\"b"} 1' in lines
+
+
+def test_statements_are_timed_and_counted(engine):
+    with engine.connect() as connection, track_request() as timings:
+        connection.execute(text("SELECT 1"))
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing"))
+        connection.execute(text("SELECT 2"))
+
+        assert timings.queries == 3
+        assert timings.db_seconds > 0
+        assert connection.info["query_start"] == []
+    assert current_timings() is None
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(SimpleNamespace(sync_engine=engine))
+    return engine
+
+
+def test_slow_queries_are_logged_with_parameters(engine, monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation.settings, "db_slow_query_ms", 0.000001)
+    monkeypatch.setattr(instrumentation.settings, "db_explain_slow_query_ms", 0.000001)
+
+    with engine.connect() as connection:
+        result = connection.execute(text("SELECT :value"), {"value": 7})
+
+        assert result.scalar() == 7
+    slow = [r for r in caplog.records if r.name == "app.slow_queries"]
+    assert len(slow) == 1
+    assert "SELECT ?" in slow[0].getMessage()
+    assert "Parameters: (7,)" in slow[0].getMessage()
+    # SQLite has no EXPLAIN ANALYZE: the failure is logged, the query kept.
+    assert "Could not explain slow query" in caplog.text
+
+
+def test_request_over_budget_or_repeating_a_statement_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(instrumentation.settings, "db_query_budget", 3)
+    monkeypatch.setattr(instrumentation.settings, "db_repeated_query_threshold", 3)
+    timings = RequestTimings(queries=4)
+    timings.statements.update({"SELECT task": 3, "SELECT other": 1})
+
+    check_request_queries("GET /tasks", timings)
+
+    assert "GET /tasks ran 4 statements, over the budget of 3" in caplog.text
+    assert "ran the same statement 3 times, likely N+1: SELECT task" in caplog.text
+    assert "SELECT other" not in caplog.text
+
+
+def test_query_budget(engine):
+    engines = [SimpleNamespace(sync_engine=engine)]
+    with engine.connect() as connection:
+        with query_budget(2, *engines) as statements:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        assert statements == ["SELECT 1", "SELECT 2"]
+
+        with pytest.raises(QueryBudgetExceeded, match="3 statements"):
+            with query_budget(2, *engines):
+                for _ in range(3):
+                    connection.execute(text("SELECT 1"))
+
+        connection.execute(text("SELECT 3"))
+    assert statements == ["SELECT 1", "SELECT 2"]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        record_pool_wait(0.002)
+        return json_response(ApiResponse(data={"id": item_id}))
+
+    app.add_middleware(TimingMiddleware)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_timing_middleware_sends_server_timing_and_records_route():
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items/42")
+        await client.get("/unknown")
+
+    assert response.status_code == status.HTTP_200_OK
+    server_timing = response.headers["server-timing"]
+    assert 'db;dur=0.00;desc="0 queries"' in server_timing
+    assert "pool;dur=2.00" in server_timing
+    assert "serialize;dur=" in server_timing
+    assert ("GET", "/items/{item_id}", "200") in metrics.REQUEST_SECONDS._series
+    assert ("GET", "unmatched", "404") in metrics.REQUEST_SECONDS._series
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(get_async_client):
+    await get_async_client.get("/system/pool")
+
+    response = await get_async_client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'route="/system/pool"' in response.text
+    assert 'db_pool_checkout_seconds_bucket{engine="primary",pid="' in response.text
+    assert "cache_hits_total" in response.text
+    assert "# TYPE single_flight_shared_total counter" in response.text
+
+
+@pytest.mark.asyncio
+async def test_traced_wraps_public_coroutines_in_spans(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(trace, "get_tracer", provider.get_tracer)
+    monkeypatch.setattr(instrumentation.settings, "otel_enabled", True)
+
+    @traced
+    class Repository:
+        async def get(self):
+            current_timings().queries += 2
+            return "task"
+
+        async def _hidden(self):
+            return None
+
+    class TaskRepository(Repository):
+        pass
+
+    with track_request():
+        assert await TaskRepository().get() == "task"
+        await TaskRepository()._hidden()
+
+    (span,) = exporter.get_finished_spans()
+    assert span.name == "TaskRepository.get"
+    assert span.attributes["db.queries"] == 2
+
+
+def pool(checked_out):
+    return {
+        "size": 5,
+        "checked_out": checked_out,
+        "overflow": 0,
+        "timeouts": 0,
+        "checkouts": checked_out,
+        "wait_seconds_total": 0.0,
+        "wait_seconds_buckets": {"0.001": checked_out, "+Inf": checked_out},
+    }
+
+
+def test_metrics_are_labelled_by_process_and_engine(monkeypatch):
+    monkeypatch.setattr(
+        metrics,
+        "database",
+        SimpleNamespace(
+            pool_statuses=lambda: {"primary": pool(2), "replica0": pool(1)}
+        ),
+    )
+    single_flight = SingleFlight()
+    single_flight.stats["get_task"].calls = 3
+
+    lines = render_metrics(
+        MemoryCache(ttl=30, max_entries=10), single_flight
+    ).splitlines()
+
+    pid = os.getpid()
+    assert f'db_pool_checked_out{{engine="primary",pid="{pid}"}} 2' in lines
+    assert f'db_pool_checked_out{{engine="replica0",pid="{pid}"}} 1' in lines
+    assert (
+        f'db_pool_checkout_seconds_bucket{{engine="replica0",pid="{pid}",le="+Inf"}} 1'
+        in lines
+    )
+    assert f'cache_hits_total{{pid="{pid}"}} 0' in lines
+    assert f'single_flight_calls_total{{method="get_task",pid="{pid}"}} 3' in lines
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.pagination import Cursor, PaginationResponse
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = Cursor.after("created_at", datetime.now(timezone.utc), uuid4())
+
+        assert Cursor.decode(cursor.encode()) == cursor
+
+    def test_after_serializes_datetimes(self):
+        created_at = datetime.now(timezone.utc)
+        cursor = Cursor.after("created_at", created_at, uuid4())
+
+        assert datetime.fromisoformat(cursor.value) == created_at
+
+    def test_after_keeps_strings(self):
+        cursor = Cursor.after("name", "2026-01-01", uuid4())
+
+        assert Cursor.decode(cursor.encode()).value == "2026-01-01"
+
+    def test_token_is_url_safe(self):
+        token = Cursor.after("created_at", datetime.now(timezone.utc), uuid4()).encode()
+
+        assert all(char not in token for char in "+/=")
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", "e30", "!!!"])
+    def test_invalid_token(self, token: str):
+        with pytest.raises(ValueError):
+            Cursor.decode(token)
+
+
+class TestPaginationResponse:
+    def test_offset_mode_defaults(self):
+        pagination = PaginationResponse(offset=10, limit=5)
+
+        assert pagination.next_cursor is None
+
+    def test_cursor_mode_without_offset(self):
+        pagination = PaginationResponse(limit=5, next_cursor="abc")
+
+        assert pagination.offset is None
+        assert pagination.next_cursor == "abc"
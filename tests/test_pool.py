@@ -0,0 +1,76 @@
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import status
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.util import greenlet_spawn
+
+from app.config.database import engine_options
+from app.config.pool import InstrumentedPool, PoolStats
+from app.config.settings import Settings
+
+
+class TestPoolStats:
+    def test_histogram_is_cumulative(self):
+        stats = PoolStats()
+        for seconds in (0.0005, 0.003, 0.003, 10):
+            stats.observe(seconds)
+
+        histogram = stats.histogram()
+
+        assert histogram["0.001"] == 1
+        assert histogram["0.005"] == 3
+        assert histogram["5.0"] == 3
+        assert histogram["+Inf"] == 4
+        assert stats.max_wait_seconds == 10
+
+
+@pytest.mark.asyncio
+class TestInstrumentedPool:
+    async def test_checkouts_and_timeouts_are_counted(self):
+        pool = InstrumentedPool(MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+
+        def checkout_twice():
+            connection = pool.connect()
+            with pytest.raises(PoolTimeoutError):
+                pool.connect()
+            connection.close()
+
+        await greenlet_spawn(checkout_twice)
+
+        assert pool.stats.checkouts == 1
+        assert pool.stats.timeouts == 1
+        assert pool.checkedout() == 0
+
+
+class TestEngineOptions:
+    def test_settings_are_passed_to_the_pool(self):
+        config = Settings(DB_POOL_SIZE=20, DB_MAX_OVERFLOW=0, DB_POOL_RECYCLE=600)
+
+        options = engine_options(config)
+
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 0
+        assert options["pool_recycle"] == 600
+        assert options["pool_pre_ping"] is False
+        assert options["echo"] is False
+        assert options["connect_args"] == {"statement_cache_size": 100}
+
+    def test_pgbouncer_disables_statement_caches(self):
+        options = engine_options(Settings(DB_PGBOUNCER=True))
+
+        connect_args = options["connect_args"]
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        name = connect_args["prepared_statement_name_func"]
+        assert name() != name()
+
+
+@pytest.mark.asyncio
+async def test_pool_status_endpoint(get_async_client):
+    response = await get_async_client.get("/system/pool")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()["data"]
+    assert data["checked_out"] == 0
+    assert "+Inf" in data["wait_seconds_buckets"]
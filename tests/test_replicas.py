@@ -0,0 +1,106 @@
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.api.consistency import (
+    PRIMARY_COOKIE,
+    ReadYourWritesMiddleware,
+    reads_from_primary,
+)
+from app.config.database import Database
+from app.services.task import TaskService
+
+URL = "postgresql+asyncpg://postgres:postgres@{}:5432/task_manager"
+
+
+class RecordingRepository:
+    def __init__(self, name, task, log):
+        self.name = name
+        self.task = task
+        self.log = log
+
+    async def get_by_uuid(self, uuid):
+        self.log.append(("get", self.name))
+        return self.task
+
+    async def delete(self, uuid):
+        self.log.append(("delete", self.name))
+
+
+def make_database(balancing):
+    return Database(
+        url=URL.format("primary"),
+        replica_urls=[URL.format("replica-1"), URL.format("replica-2")],
+        balancing=balancing,
+    )
+
+
+class TestReplicaBalancing:
+    def test_round_robin(self):
+        database = make_database("round_robin")
+
+        assert [database._pick_replica() for _ in range(4)] == [0, 1, 0, 1]
+
+    def test_least_connections(self, monkeypatch):
+        database = make_database("least_connections")
+        busy, idle = database._replica_engines
+        monkeypatch.setattr(busy.pool, "checkedout", lambda: 3)
+        monkeypatch.setattr(idle.pool, "checkedout", lambda: 1)
+
+        assert database._pick_replica() == 1
+
+    def test_without_replicas(self):
+        database = Database(url=URL.format("primary"))
+
+        assert not database.has_replicas
+
+
+@pytest.mark.asyncio
+class TestReadYourWrites:
+    @pytest.fixture
+    def client(self):
+        async def endpoint(request: Request):
+            return JSONResponse({"primary": reads_from_primary(request)})
+
+        app = Starlette(
+            routes=[Route("/", endpoint, methods=["GET", "POST"])],
+        )
+        app.add_middleware(ReadYourWritesMiddleware, window=5)
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        )
+
+    async def test_write_pins_reads_to_primary(self, client):
+        async with client:
+            assert (await client.get("/")).json() == {"primary": False}
+            response = await client.post("/")
+            assert PRIMARY_COOKIE in response.cookies
+            assert (await client.get("/")).json() == {"primary": True}
+
+    async def test_expired_cookie_reads_from_replica(self, client):
+        client.cookies.set(PRIMARY_COOKIE, str(time.time() - 1))
+        async with client:
+            assert (await client.get("/")).json() == {"primary": False}
+
+
+@pytest.mark.asyncio
+async def test_service_reads_from_primary_after_writing(task_response_data):
+    log = []
+    task = SimpleNamespace(**task_response_data)
+    service = TaskService(
+        repository=RecordingRepository("primary", task, log),
+        reader=RecordingRepository("replica", task, log),
+    )
+    task_uuid = str(task.id)
+
+    await service.get_task_by_id(task_uuid)
+    await service.delete_task(task_uuid)
+    await service.get_task_by_id(task_uuid)
+
+    assert log == [("get", "replica"), ("delete", "primary"), ("get", "primary")]
@@ -0,0 +1,259 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.dialects import postgresql
+
+from app.repositories.task import TaskRepository
+from app.schemas.pagination import Cursor
+from app.schemas.task import (
+    TaskListFilterSchema,
+    TaskListQuerySchema,
+    TaskRequestSchema,
+    TaskSortKey,
+)
+
+
+class CapturingSession:
+    """Records statements instead of sending them to the database."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def scalars(self, statement):
+        self.statements.append(statement)
+        result = MagicMock()
+        result.all.return_value = []
+        return result
+
+    execute = scalars
+
+    async def scalar(self, statement):
+        self.statements.append(statement)
+        return 0
+
+
+def render(statement) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+@pytest.fixture
+def session() -> CapturingSession:
+    return CapturingSession()
+
+
+@pytest.fixture
+def repository(session: CapturingSession) -> TaskRepository:
+    return TaskRepository(session=session)
+
+
+@pytest.mark.asyncio
+class TestGetPage:
+    async def test_default_order_and_offset(self, repository, session):
+        await repository.get_page(limit=10, offset=20)
+
+        sql = render(session.statements[0])
+        assert "ORDER BY tasks.created_at, tasks.id" in sql
+        assert "LIMIT 11 OFFSET 20" in sql
+
+    async def test_filters_are_sargable(self, repository, session):
+        filters = TaskListFilterSchema(
+            status=["Created", "In progress"],
+            created_after=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            updated_before=datetime(2026, 2, 1, tzinfo=timezone.utc),
+            name_prefix="50%_off",
+        )
+
+        await repository.get_page(limit=10, filters=filters)
+
+        sql = render(session.statements[0])
+        assert "tasks.status IN ('CREATED', 'IN_PROGRESS')" in sql
+        assert "tasks.created_at >= '2026-01-01 00:00:00+00:00'" in sql
+        assert "tasks.updated_at < '2026-02-01 00:00:00+00:00'" in sql
+        assert "tasks.name LIKE '50/%%/_off%%' ESCAPE '/'" in sql
+
+    async def test_descending_keyset(self, repository, session):
+        filters = TaskListFilterSchema(sort=TaskSortKey.UPDATED_AT_DESC)
+        cursor = Cursor.after("updated_at", datetime.now(timezone.utc), uuid4())
+
+        await repository.get_page(limit=10, cursor=cursor.encode(), filters=filters)
+
+        sql = render(session.statements[0])
+        assert "(tasks.updated_at, tasks.id) <" in sql
+        assert "ORDER BY tasks.updated_at DESC, tasks.id DESC" in sql
+        assert "OFFSET" not in sql
+
+    async def test_columns_select_plain_rows(self, repository, session):
+        await repository.get_page(limit=10, columns=("id", "name", "created_at"))
+
+        sql = render(session.statements[0])
+        assert sql.startswith("SELECT tasks.id, tasks.name, tasks.created_at \nFROM")
+
+    async def test_exact_total_uses_window_function(self, repository, session):
+        _, _, total = await repository.get_page(limit=10, count=True)
+
+        sql = render(session.statements[0])
+        assert "count(*) OVER () AS total" in sql
+        assert total == 0
+        assert len(session.statements) == 1
+
+    async def test_exact_total_with_cursor_counts_all_matches(
+        self, repository, session
+    ):
+        filters = TaskListFilterSchema(status=["Completed"])
+        cursor = Cursor.after("created_at", datetime.now(timezone.utc), uuid4())
+
+        await repository.get_page(
+            limit=10, cursor=cursor.encode(), filters=filters, count=True
+        )
+
+        sql = render(session.statements[0])
+        assert "OVER ()" not in sql
+        assert (
+            "(SELECT count(*) AS count_1 \nFROM tasks \n"
+            "WHERE tasks.deleted_at IS NULL AND tasks.status IN ('COMPLETED')) AS total"
+        ) in sql
+        assert render(session.statements[1]).startswith("SELECT count(*)")
+
+    async def test_cursor_from_other_sort_is_rejected(self, repository, session):
+        filters = TaskListFilterSchema(sort=TaskSortKey.NAME)
+        cursor = Cursor.after("created_at", datetime.now(timezone.utc), uuid4())
+
+        with pytest.raises(HTTPException) as exc_info:
+            await repository.get_page(limit=10, cursor=cursor.encode(), filters=filters)
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+        assert session.statements == []
+
+
+@pytest.mark.asyncio
+class TestCreate:
+    async def test_single_insert_returning(self, repository, session):
+        schema = TaskRequestSchema(
+            name="Ship parcel", description="Deliver to the depot", status="Created"
+        )
+
+        await repository.create(schema=schema)
+
+        sql = render(session.statements[0])
+        assert sql.startswith("INSERT INTO tasks (name, description, status, id)")
+        assert " RETURNING " in sql
+        assert len(session.statements) == 1
+
+
+class TestTaskListQuerySchema:
+    def test_filters_exclude_paging_fields(self):
+        query = TaskListQuerySchema(limit=5, cursor="abc", status=["Completed"])
+
+        filters = query.filters
+
+        assert isinstance(filters, TaskListFilterSchema)
+        assert filters.status == ["Completed"]
+        assert not hasattr(filters, "limit")
+
+    def test_sort_key_parts(self):
+        assert TaskSortKey.NAME_DESC.column == "name"
+        assert TaskSortKey.NAME_DESC.descending
+        assert not TaskSortKey.CREATED_AT.descending
+
+
+@pytest.mark.asyncio
+class TestSearch:
+    async def execute(self, repository, session, **kwargs):
+        captured = []
+
+        async def execute(statement):
+            captured.append(statement)
+            result = MagicMock()
+            result.all.return_value = []
+            return result
+
+        session.execute = execute
+        await repository.search(limit=10, **kwargs)
+        return render(captured[0])
+
+    async def test_full_text_uses_search_vector(self, repository, session):
+        sql = await self.execute(repository, session, query="parcel delivery")
+
+        assert "tasks.search_vector @@ websearch_to_tsquery('english'::regconfig" in sql
+        assert "ORDER BY ts_rank_cd(" in sql
+        assert "LIMIT 11" in sql
+
+    async def test_fuzzy_uses_trigram_similarity(self, repository, session):
+        sql = await self.execute(repository, session, query="parsel", fuzzy=True)
+
+        assert "tasks.name % 'parsel'" in sql.replace("%%", "%")
+        assert "ORDER BY similarity(tasks.name, 'parsel') DESC" in sql
+
+    async def test_keyset_on_score(self, repository, session):
+        cursor = Cursor(sort="rank", value="0.25", id=uuid4()).encode()
+
+        sql = await self.execute(repository, session, query="parcel", cursor=cursor)
+
+        assert ", tasks.id) < (0.25, " in sql
+
+    async def test_cursor_from_other_mode_is_rejected(self, repository, session):
+        cursor = Cursor(sort="rank", value="0.25", id=uuid4()).encode()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await repository.search(query="parcel", limit=10, cursor=cursor, fuzzy=True)
+
+        assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_tombstones_are_read_in_keyset_order(repository, session):
+    after = Cursor.after(
+        "updated_at", datetime(2026, 1, 1, tzinfo=timezone.utc), uuid4()
+    )
+
+    deleted, more = await repository.get_tombstones(
+        limit=50, after=after, before=datetime(2026, 2, 1, tzinfo=timezone.utc)
+    )
+
+    sql = render(session.statements[0])
+    assert "(task_tombstones.deleted_at, task_tombstones.id) > (" in sql
+    assert "task_tombstones.deleted_at < '2026-02-01 00:00:00+00:00'" in sql
+    assert "ORDER BY task_tombstones.deleted_at, task_tombstones.id" in sql
+    assert "LIMIT 51" in sql
+    assert (deleted, more) == ([], False)
+
+
+@pytest.mark.asyncio
+class TestSoftDelete:
+    async def test_delete_marks_live_row(self, repository, session):
+        await repository.delete(uuid=str(uuid4()))
+
+        sql = render(session.statements[0])
+        assert sql.startswith("UPDATE tasks SET deleted_at=now()")
+        assert sql.endswith("AND tasks.deleted_at IS NULL")
+
+    async def test_lists_skip_deleted_rows(self, repository, session):
+        await repository.get_page(limit=10)
+
+        assert "WHERE tasks.deleted_at IS NULL" in render(session.statements[0])
+
+    async def test_purge_takes_oldest_unlocked_batch(self, repository, session):
+        await repository.purge_deleted(
+            deleted_before=datetime(2026, 10, 11, tzinfo=timezone.utc), limit=500
+        )
+
+        sql = render(session.statements[0])
+        assert sql.startswith("DELETE FROM tasks WHERE tasks.id IN (SELECT tasks.id")
+        assert "tasks.deleted_at < '2026-10-11 00:00:00+00:00'" in sql
+        assert "ORDER BY tasks.deleted_at \n LIMIT 500 FOR UPDATE SKIP LOCKED" in sql
+
+    async def test_name_stays_unique_through_partial_index(self, repository):
+        assert [column.name for column in repository._unique_columns()] == ["name"]
@@ -0,0 +1,145 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations.fastapi import setup_dishka
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses import json_response, prefetched, stream_list
+from app.api.router import router
+from app.config.settings import settings
+from app.repositories.task import TaskRepository
+from app.schemas.base import ApiResponse
+from app.schemas.pagination import ListPaginationResponse, PaginationResponse
+from app.schemas.task import TaskResponseSchema
+from app.services.task import TaskService
+
+
+def make_row() -> dict:
+    return {
+        "name": "Deliver parcel",
+        "description": "Pick up the parcel at the depot.",
+        "status": "Completed",
+        "id": uuid4(),
+        "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "updated_at": None,
+        "version": 3,
+    }
+
+
+def test_trusted_rows_encode_like_validated_models():
+    row = make_row()
+    pagination = PaginationResponse(limit=10, next_cursor="abc")
+    validated = ApiResponse(
+        data=ListPaginationResponse(
+            items=[TaskResponseSchema(**row)], pagination=pagination
+        )
+    )
+    trusted = ApiResponse.model_construct(
+        data=ListPaginationResponse.model_construct(items=[row], pagination=pagination),
+        meta={},
+        errors=[],
+    )
+
+    response = json_response(trusted, headers={"ETag": '"1"'})
+
+    assert response.body == JSONResponse(jsonable_encoder(validated)).body
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["etag"] == '"1"'
+
+
+@pytest.mark.asyncio
+async def test_streamed_list_matches_buffered_response():
+    rows = [make_row() for _ in range(5)]
+    pagination = PaginationResponse(limit=10)
+
+    async def chunks():
+        yield rows[:2]
+        yield []
+        yield rows[2:]
+        pagination.next_cursor = "next"
+
+    streamed = b"".join(
+        [part async for part in stream_list(chunks(), TaskResponseSchema, pagination)]
+    )
+    buffered = json_response(
+        ApiResponse.model_construct(
+            data=ListPaginationResponse.model_construct(
+                items=rows, pagination=pagination
+            ),
+            meta={},
+            errors=[],
+        )
+    )
+
+    assert streamed == buffered.body
+    assert b'"next_cursor":"next"' in streamed
+
+
+@pytest.mark.asyncio
+async def test_prefetched_keeps_every_item():
+    async def numbers():
+        for number in range(3):
+            yield number
+
+    async def nothing():
+        return
+        yield
+
+    assert [number async for number in await prefetched(numbers())] == [0, 1, 2]
+    assert [number async for number in await prefetched(nothing())] == []
+
+
+class ServiceProvider(Provider):
+    @provide(scope=Scope.REQUEST)
+    def provide_service(self) -> TaskService:
+        return TaskService(repository=TaskRepository(session=None))
+
+
+class StreamingServiceProvider(Provider):
+    @provide(scope=Scope.REQUEST)
+    def provide_service(self) -> TaskService:
+        class Service:
+            async def stream_task_list(self, **kwargs):
+                yield [make_row()]
+
+        return Service()
+
+
+async def get_tasks(provider: Provider, **params) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(router)
+    container = make_async_container(provider)
+    setup_dishka(container, app)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get("/tasks", params=params)
+    await container.close()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_streamed_list_with_invalid_cursor_is_rejected():
+    response = await get_tasks(
+        ServiceProvider(), limit=settings.list_stream_min_limit, cursor="garbage"
+    )
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor."}
+
+
+@pytest.mark.asyncio
+async def test_streamed_list_is_not_cached():
+    response = await get_tasks(
+        StreamingServiceProvider(), limit=settings.list_stream_min_limit
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["items"]) == 1
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
@@ -0,0 +1,100 @@
+import pytest
+from pydantic import ValidationError
+
+from app.config.database import engine_options
+from app.config.server import server_options
+from app.config.settings import Settings
+
+
+class TestServerOptions:
+    def test_development_runs_one_reloading_process(self):
+        options = server_options(Settings(SERVER_MODE="development", WEB_WORKERS=8))
+
+        assert options["reload"] is True
+        assert "workers" not in options
+        assert Settings(SERVER_MODE="development", WEB_WORKERS=8).workers == 1
+
+    def test_production_runs_tuned_workers(self):
+        config = Settings(
+            SERVER_MODE="production",
+            WEB_WORKERS=4,
+            WEB_KEEP_ALIVE_SECONDS=15,
+            WEB_BACKLOG=4096,
+            WEB_GRACEFUL_SHUTDOWN_SECONDS=20,
+            APP_PORT="9000",
+        )
+
+        options = server_options(config)
+
+        assert options["factory"] is True
+        assert options["port"] == 9000
+        assert options["workers"] == 4
+        assert options["loop"] == "uvloop"
+        assert options["http"] == "httptools"
+        assert options["timeout_keep_alive"] == 15
+        assert options["backlog"] == 4096
+        assert options["timeout_graceful_shutdown"] == 20
+        assert "reload" not in options
+
+    def test_memory_cache_is_refused_with_several_workers(self):
+        config = Settings(
+            SERVER_MODE="production", WEB_WORKERS=4, CACHE_BACKEND="memory"
+        )
+
+        with pytest.raises(ValueError, match="CACHE_BACKEND=memory"):
+            server_options(config)
+
+    def test_cache_defaults_to_memory_only_for_one_worker(self):
+        assert Settings(SERVER_MODE="development").cache == "memory"
+        assert Settings(SERVER_MODE="production", WEB_WORKERS=4).cache == "none"
+        assert (
+            Settings(
+                SERVER_MODE="production", WEB_WORKERS=4, CACHE_BACKEND="redis"
+            ).cache
+            == "redis"
+        )
+
+    def test_production_defaults_to_one_worker_per_cpu(self):
+        assert Settings(SERVER_MODE="production").workers >= 1
+
+
+class TestConnectionBudget:
+    def test_pools_share_the_budget_between_workers(self):
+        config = Settings(
+            SERVER_MODE="production",
+            WEB_WORKERS=4,
+            DB_MAX_CONNECTIONS=40,
+            DB_POOL_SIZE=5,
+            DB_MAX_OVERFLOW=10,
+        )
+
+        options = engine_options(config)
+
+        assert options["pool_size"] == 5
+        assert options["max_overflow"] == 4
+        # Each worker also holds the change feed's LISTEN connection.
+        per_worker = options["pool_size"] + options["max_overflow"] + 1
+        assert config.workers * per_worker <= 40
+
+    def test_small_budget_shrinks_the_pool(self):
+        config = Settings(
+            SERVER_MODE="production",
+            WEB_WORKERS=8,
+            DB_MAX_CONNECTIONS=20,
+            DB_POOL_SIZE=5,
+        )
+
+        options = engine_options(config)
+
+        assert options["pool_size"] == 1
+        assert options["max_overflow"] == 0
+
+    def test_budget_below_one_connection_per_worker_is_refused(self):
+        with pytest.raises(ValidationError, match="DB_MAX_CONNECTIONS=12"):
+            Settings(SERVER_MODE="production", WEB_WORKERS=8, DB_MAX_CONNECTIONS=12)
+
+    def test_no_budget_keeps_the_configured_pool(self):
+        options = engine_options(Settings(DB_POOL_SIZE=5, DB_MAX_OVERFLOW=10))
+
+        assert options["pool_size"] == 5
+        assert options["max_overflow"] == 10
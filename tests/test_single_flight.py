@@ -0,0 +1,186 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+from app.services.task import TaskService
+
+
+class SlowRepository:
+    def __init__(self, task, session=None):
+        self.task = task
+        self.session = session
+        self.reads = 0
+        self.release = asyncio.Event()
+
+    async def get_by_uuid(self, uuid):
+        self.reads += 1
+        await self.release.wait()
+        return self.task
+
+    async def get_page(
+        self, limit, offset=0, cursor=None, filters=None, count=False, columns=None
+    ):
+        self.reads += 1
+        await self.release.wait()
+        return [{"id": self.task.id}], None, None
+
+
+@pytest.fixture
+def task(task_response_data):
+    return SimpleNamespace(**task_response_data)
+
+
+async def settle(*tasks):
+    await asyncio.sleep(0.01)
+    return tasks
+
+
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        group, release, runs = SingleFlight(), asyncio.Event(), []
+
+        async def load():
+            runs.append(1)
+            await release.wait()
+            return object()
+
+        calls = [asyncio.create_task(group.do("load", 1, load)) for _ in range(5)]
+        other = asyncio.create_task(group.do("load", 2, load))
+        await settle()
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        assert len(runs) == 2
+        assert all(result is results[0] for result in results)
+        assert await other is not results[0]
+        stats = group.stats["load"]
+        assert (stats.calls, stats.executions, stats.shared) == (6, 2, 4)
+
+    async def test_exceptions_are_shared(self):
+        group, release = SingleFlight(), asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise LookupError("missing")
+
+        calls = [asyncio.create_task(group.do("fail", 1, fail)) for _ in range(3)]
+        await settle()
+        release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+        assert group.stats["fail"].executions == 1
+
+    async def test_waiting_call_runs_again_when_the_running_one_is_cancelled(self):
+        group, release, runs = SingleFlight(), asyncio.Event(), []
+
+        async def load():
+            runs.append(1)
+            await release.wait()
+            return len(runs)
+
+        leader = asyncio.create_task(group.do("load", 1, load))
+        await settle()
+        follower = asyncio.create_task(group.do("load", 1, load))
+        await settle()
+        leader.cancel()
+        await settle()
+        release.set()
+
+        assert await follower == 2
+        assert leader.cancelled()
+
+    async def test_finished_calls_are_not_cached(self):
+        group, runs = SingleFlight(), []
+
+        async def load():
+            runs.append(1)
+
+        await group.do("load", 1, load)
+        await group.do("load", 1, load)
+
+        assert len(runs) == 2
+
+
+@pytest.mark.asyncio
+class TestTaskServiceSingleFlight:
+    async def test_concurrent_gets_run_one_query(self, task):
+        repository = SlowRepository(task)
+        group = SingleFlight()
+        services = [
+            TaskService(repository=repository, single_flight=group) for _ in range(10)
+        ]
+
+        calls = [
+            asyncio.create_task(service.get_task_by_id(str(task.id)))
+            for service in services
+        ]
+        await settle()
+        repository.release.set()
+        results = await asyncio.gather(*calls)
+
+        assert repository.reads == 1
+        assert {result.id for result in results} == {task.id}
+        assert group.stats["get_task_by_id"].shared == 9
+
+    async def test_lists_are_keyed_by_arguments(self, task):
+        repository = SlowRepository(task)
+        group = SingleFlight()
+
+        def get_list(offset):
+            service = TaskService(repository=repository, single_flight=group)
+            return asyncio.create_task(service.get_task_list(limit=10, offset=offset))
+
+        calls = [get_list(0), get_list(0), get_list(10)]
+        await settle()
+        repository.release.set()
+        await asyncio.gather(*calls)
+
+        assert repository.reads == 2
+
+    async def test_replica_reads_are_not_shared_with_primary_readers(self, task):
+        primary = SlowRepository(task, session="primary")
+        replica = SlowRepository(task, session="replica")
+        pinned_reader = SlowRepository(task, session="primary")
+        replica.release = pinned_reader.release = primary.release
+        group = SingleFlight()
+        on_replica = TaskService(
+            repository=primary, reader=replica, single_flight=group
+        )
+        pinned = TaskService(
+            repository=primary,
+            reader=pinned_reader,
+            single_flight=group,
+        )
+
+        calls = [
+            asyncio.create_task(on_replica.get_task_by_id(str(task.id))),
+            asyncio.create_task(pinned.get_task_by_id(str(task.id))),
+        ]
+        await settle()
+        primary.release.set()
+        await asyncio.gather(*calls)
+
+        assert group.stats["get_task_by_id"].executions == 2
+
+    async def test_clients_that_just_wrote_do_not_join_reads_in_flight(self, task):
+        repository = SlowRepository(task)
+        group = SingleFlight()
+        before_write = TaskService(repository=repository, single_flight=group)
+        after_write = TaskService(
+            repository=repository, single_flight=group, read_your_writes=True
+        )
+
+        calls = [
+            asyncio.create_task(before_write.get_task_by_id(str(task.id))),
+            asyncio.create_task(after_write.get_task_by_id(str(task.id))),
+        ]
+        await settle()
+        repository.release.set()
+        await asyncio.gather(*calls)
+
+        assert repository.reads == 2
+        assert group.stats["get_task_by_id"].shared == 0
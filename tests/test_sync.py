@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.schemas.pagination import Cursor
+from app.schemas.task import TaskChangeOperation
+from app.services.task import TaskService
+
+START = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+class MemoryReader:
+    """Tasks and tombstones kept in lists, paged like the repository."""
+
+    def __init__(self, tasks, tombstones):
+        self.tasks = tasks
+        self.tombstones = tombstones
+        self.calls = []
+
+    @staticmethod
+    def _after(rows, column, after, before):
+        if after is not None:
+            position = (datetime.fromisoformat(after.value), after.id)
+            rows = [row for row in rows if (row[column], row["id"]) > position]
+        if before is not None:
+            rows = [row for row in rows if row[column] < before]
+        return sorted(rows, key=lambda row: (row[column], row["id"]))
+
+    async def get_page(self, limit, cursor, filters, columns):
+        self.calls.append(("tasks", filters.updated_before))
+        after = Cursor.decode(cursor) if cursor else None
+        rows = self._after(self.tasks, "updated_at", after, filters.updated_before)
+        if len(rows) <= limit:
+            return rows, None, None
+        last = rows[limit - 1]
+        return (
+            rows[:limit],
+            Cursor.after("updated_at", last["updated_at"], last["id"]).encode(),
+            None,
+        )
+
+    async def get_tombstones(self, limit, after, before):
+        self.calls.append(("tombstones", before))
+        rows = self._after(self.tombstones, "deleted_at", after, before)
+        return rows[:limit], len(rows) > limit
+
+
+def task(seconds, version=1):
+    return {
+        "id": uuid4(),
+        "updated_at": START + timedelta(seconds=seconds),
+        "version": version,
+    }
+
+
+def tombstone(seconds):
+    return {"id": uuid4(), "deleted_at": START + timedelta(seconds=seconds)}
+
+
+@pytest.fixture
+def reader():
+    return MemoryReader(
+        tasks=[task(1), task(3, version=2), task(5), task(6, version=4)],
+        tombstones=[tombstone(2), tombstone(4), tombstone(7)],
+    )
+
+
+@pytest.fixture
+def service(reader):
+    return TaskService(repository=SimpleNamespace(), reader=reader)
+
+
+def token(seconds):
+    return Cursor.after(
+        "updated_at", START + timedelta(seconds=seconds), uuid4()
+    ).encode()
+
+
+@pytest.mark.asyncio
+class TestSyncTasks:
+    async def test_paging_returns_every_change_once_in_order(self, service, reader):
+        since, seen, has_more = token(0), [], True
+        while has_more:
+            items, deleted, since, has_more = await service.sync_tasks(
+                since=since, limit=2
+            )
+            assert len(items) + len(deleted) <= 2
+            seen += [row["updated_at"] for row in items]
+            seen += [row["deleted_at"] for row in deleted]
+
+        assert seen == sorted(seen)
+        assert len(seen) == 7
+
+    async def test_nothing_changed_keeps_the_token(self, service):
+        since = token(60)
+
+        assert await service.sync_tasks(since=since, limit=10) == ([], [], since, False)
+
+    async def test_full_sync_skips_tombstones(self, service, reader):
+        items, deleted, since, has_more = await service.sync_tasks(since=None, limit=10)
+
+        assert len(items) == 4
+        assert deleted == []
+        assert Cursor.decode(since).id == reader.tasks[-1]["id"]
+        assert not has_more
+        assert [kind for kind, _ in reader.calls] == ["tasks"]
+
+    async def test_recent_changes_wait_for_the_next_sync(self, service, reader):
+        reader.tasks.append({**task(0), "updated_at": datetime.now(timezone.utc)})
+
+        items, _, _, _ = await service.sync_tasks(
+            since=token(0), limit=10, settle_seconds=5
+        )
+
+        assert len(items) == 4
+        assert all(before is not None for _, before in reader.calls)
+
+
+@pytest.mark.asyncio
+async def test_changes_since_include_deletions(service):
+    changes = [change async for change in service.changes_since(token(0), chunk_size=3)]
+
+    assert [change.op for change in changes] == [
+        TaskChangeOperation.INSERT,
+        TaskChangeOperation.DELETE,
+        TaskChangeOperation.UPDATE,
+        TaskChangeOperation.DELETE,
+        TaskChangeOperation.INSERT,
+        TaskChangeOperation.UPDATE,
+        TaskChangeOperation.DELETE,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_changes_since_replay_the_overlap(service, reader):
+    since = Cursor.after("updated_at", START + timedelta(seconds=5), uuid4()).encode()
+    # Committed by a transaction that started before the token was handed out.
+    late = task(4.5)
+    reader.tasks.append(late)
+
+    changes = [
+        change async for change in service.changes_since(since, overlap_seconds=1)
+    ]
+
+    assert [change.updated_at for change in changes] == [
+        START + timedelta(seconds=seconds) for seconds in (4, 4.5, 5, 6, 7)
+    ]
+    assert late["id"] in {change.id for change in changes}
@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.repositories.unit_of_work import UnitOfWork
+from app.services.task import TaskService
+
+
+class FakeSession:
+    def __init__(self):
+        self.active = False
+        self.commits = 0
+        self.closed = 0
+
+    def in_transaction(self):
+        return self.active
+
+    async def commit(self):
+        self.commits += 1
+        self.active = False
+
+    async def close(self):
+        self.closed += 1
+        self.active = False
+
+
+class FakeRepository:
+    def __init__(self, task, session):
+        self.task = task
+        self.session = session
+
+    async def get_by_uuid(self, uuid):
+        self.session.active = True
+        return self.task
+
+    async def create(self, schema):
+        self.session.active = True
+        return self.task
+
+    async def delete(self, uuid):
+        self.session.active = True
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    async def purge_deleted(self, deleted_before, limit):
+        self.session.active = True
+        purged, self.task.deleted = (
+            min(limit, self.task.deleted),
+            max(self.task.deleted - limit, 0),
+        )
+        return purged
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+@pytest.fixture
+def service(task_response_data, session):
+    task = SimpleNamespace(**task_response_data)
+    return TaskService(
+        repository=FakeRepository(task, session),
+        unit_of_work=UnitOfWork(session=session),
+    )
+
+
+@pytest.mark.asyncio
+class TestUnitOfWork:
+    async def test_reads_never_commit(self, service, session, task_response_data):
+        await service.get_task_by_id(str(task_response_data["id"]))
+
+        assert session.commits == 0
+        assert session.closed == 1
+
+    async def test_write_commits_once(self, service, session):
+        await service.create_task(schema=None)
+
+        assert session.commits == 1
+        assert session.closed == 1
+
+    async def test_failed_write_is_released_without_commit(self, service, session):
+        with pytest.raises(HTTPException):
+            await service.delete_task(task_uuid="missing")
+
+        assert session.commits == 0
+        assert session.closed == 1
+
+    async def test_separate_read_session_is_released(self, session):
+        read_session = FakeSession()
+
+        await UnitOfWork(session=session, read_session=read_session).release()
+
+        assert (session.closed, read_session.closed) == (1, 1)
+
+    async def test_commit_without_transaction_is_a_no_op(self, session):
+        await UnitOfWork(session=session).commit()
+
+        assert session.commits == 0
+
+    async def test_purge_commits_each_batch(self, service, session):
+        service.repository.task.deleted = 5
+
+        purged = await service.purge_deleted_tasks(retention_seconds=60, batch_size=2)
+
+        assert purged == 5
+        assert session.commits == 3
+        assert session.closed == 3
+
+    async def test_purge_stops_after_max_batches(self, service, session):
+        service.repository.task.deleted = 5
+
+        purged = await service.purge_deleted_tasks(
+            retention_seconds=60, batch_size=2, max_batches=1
+        )
+
+        assert purged == 2
+        assert session.commits == 1